@@ -13,7 +13,7 @@ from app.config import settings
 from app.database import Base
 
 # Import all models so they are registered on Base.metadata
-from app.models import user, catalog, audit, social, glossary, governance, webhooks  # noqa
+from app.models import user, catalog, audit, social, glossary, governance, webhooks, search  # noqa
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url)
@@ -0,0 +1,91 @@
+"""catalog hierarchy and soft-delete indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+# (parent, name) uniqueness. Also the FK indexes: each leads with the parent
+# column, so it serves ingest's (parent, name) lookups, include_deleted
+# browsing and ON DELETE CASCADE.
+UNIQUE = [
+    ("uq_schemas_connection_name", "schemas", ["connection_id", "name"]),
+    ("uq_tables_schema_name", "tables", ["schema_id", "name"]),
+    ("uq_columns_table_name", "columns", ["table_id", "name"]),
+]
+
+# Live-row browse indexes (keyset order: sort key, then id)
+BROWSE = [
+    ("ix_db_connections_live_name", "db_connections", ["name", "id"], LIVE),
+    ("ix_schemas_live_connection_name", "schemas", ["connection_id", "name", "id"], LIVE),
+    ("ix_tables_live_schema_name", "tables", ["schema_id", "name", "id"], LIVE),
+    ("ix_columns_live_table_name", "columns", ["table_id", "name", "id"], LIVE),
+    ("ix_queries_live_updated", "queries", ["updated_at", "id"], LIVE),
+    ("ix_articles_live_updated", "articles", ["updated_at", "id"], LIVE),
+    ("ix_glossary_terms_live_name", "glossary_terms", ["name", "id"], LIVE),
+    ("ix_audit_created", "audit_log", ["created_at", "id"], None),
+]
+
+
+def _check_no_duplicates() -> None:
+    """Refuse to start if a unique index would fail halfway through its build.
+
+    Ingest used to insert a column twice when a payload repeated its name, so
+    older catalogs may hold such pairs. A failed concurrent build leaves an
+    INVALID index behind; checking first leaves nothing to clean up.
+    """
+    if op.get_context().as_sql:
+        return
+    bind = op.get_bind()
+    found = []
+    for _, table, columns in UNIQUE:
+        keys = ", ".join(columns)
+        dupes = bind.execute(sa.text(
+            f"SELECT count(*) FROM (SELECT 1 FROM {table} GROUP BY {keys} HAVING count(*) > 1) d"
+        )).scalar()
+        if dupes:
+            found.append(
+                f"  {table}: {dupes} duplicated ({keys}); list them with\n"
+                f"    SELECT {keys}, array_agg(id) FROM {table} GROUP BY {keys} HAVING count(*) > 1;"
+            )
+    if found:
+        raise RuntimeError(
+            "Cannot add the (parent, name) unique constraints: duplicate rows exist.\n"
+            + "\n".join(found)
+            + "\nMerge or delete the extra rows (soft-deleted ones count too), then run the migration again."
+        )
+
+
+def upgrade() -> None:
+    _check_no_duplicates()
+    # Built CONCURRENTLY, outside a transaction, so writes to the catalog keep
+    # flowing while the largest tables are indexed. If the build is
+    # interrupted, Postgres leaves an INVALID index behind; drop it before
+    # running the migration again.
+    with op.get_context().autocommit_block():
+        for name, table, columns in UNIQUE:
+            op.create_index(name, table, columns, unique=True, postgresql_concurrently=True)
+        for name, table, columns, where in BROWSE:
+            op.create_index(name, table, columns, postgresql_where=where, postgresql_concurrently=True)
+    # Promoting a finished index to a constraint only takes a brief lock
+    for name, table, _ in UNIQUE:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(UNIQUE):
+        op.drop_constraint(name, table, type_="unique")    # drops its index too
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(BROWSE):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
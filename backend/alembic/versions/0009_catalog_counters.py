@@ -0,0 +1,61 @@
+"""catalog_counters table with materialized live-row counts
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the counter definitions as of this revision. Do not edit it:
+# a migration must keep doing what it did when it first ran. The live
+# definition, used by POST /admin/counters/rebuild, is _REBUILD_SQL in
+# app/services/counters.py; later counter changes belong there plus a new
+# migration (or a rebuild) to backfill them.
+BACKFILL_SQL = """
+INSERT INTO catalog_counters (entity_type, entity_id, name, value)
+SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'databases', count(*) FROM db_connections WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'schemas', count(*) FROM schemas WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'tables', count(*) FROM tables WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'columns', count(*) FROM columns WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'queries', count(*) FROM queries WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'articles', count(*) FROM articles WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'glossary_terms', count(*) FROM glossary_terms WHERE deleted_at IS NULL
+UNION ALL SELECT 'database', s.connection_id, 'schemas', count(*)
+    FROM schemas s WHERE s.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'database', s.connection_id, 'tables', count(*)
+    FROM tables t JOIN schemas s ON s.id = t.schema_id WHERE t.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'database', s.connection_id, 'columns', count(*)
+    FROM columns c JOIN tables t ON t.id = c.table_id JOIN schemas s ON s.id = t.schema_id
+    WHERE c.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'schema', t.schema_id, 'tables', count(*)
+    FROM tables t WHERE t.deleted_at IS NULL GROUP BY t.schema_id
+UNION ALL SELECT 'schema', t.schema_id, 'columns', count(*)
+    FROM columns c JOIN tables t ON t.id = c.table_id WHERE c.deleted_at IS NULL GROUP BY t.schema_id
+UNION ALL SELECT 'table', c.table_id, 'columns', count(*)
+    FROM columns c WHERE c.deleted_at IS NULL GROUP BY c.table_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_counters",
+        sa.Column("entity_type", sa.String(20), primary_key=True),
+        sa.Column("entity_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(30), primary_key=True),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    # Backfill from the current rows; the app keeps them up to date from here on
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_counters")
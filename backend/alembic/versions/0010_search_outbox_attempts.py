@@ -0,0 +1,25 @@
+"""search_outbox attempts and last_error, so failing rows are set aside
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("search_outbox", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("search_outbox", sa.Column("last_error", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("search_outbox", "last_error")
+    op.drop_column("search_outbox", "attempts")
@@ -1,5 +1,5 @@
+import hashlib
 import uuid
-from datetime import datetime, timezone
 
 from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -7,43 +7,38 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt import decode_and_validate_token
+from app.auth.jwt import decode_access_token
+from app.auth.revocation import must_confirm, revoked_key
+from app.cache import (
+    cache_user_delete, cache_user_get, cache_user_peek, cache_user_remember, cache_user_set,
+    get_or_load, invalidate, user_key,
+)
 from app.config import settings
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models.user import User
-from app.redis_client import cache_user_get, cache_user_set
+from app.redis_client import pipelined
+from app.services.last_login import record_login
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+SSO_SESSION_TTL = 300   # seconds a header fingerprint maps to a user without a database round trip
 
-async def _resolve_user_from_token(
-    credentials: HTTPAuthorizationCredentials,
-    db: AsyncSession,
-) -> User:
-    exc = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
-    try:
-        payload = await decode_and_validate_token(credentials.credentials)
-        user_id: str = payload.get("sub")
-        if not user_id:
-            raise exc
-    except JWTError:
-        raise exc
 
-    # Check Redis cache first
-    cached = await cache_user_get(user_id)
-    if cached:
-        user = User(
-            id=uuid.UUID(cached["id"]),
-            email=cached["email"],
-            name=cached["name"],
-            role=cached["role"],
-        )
-        return user
+def _user_from_record(cached: dict) -> User:
+    return User(
+        id=uuid.UUID(cached["id"]),
+        email=cached["email"],
+        name=cached["name"],
+        role=cached["role"],
+    )
+
 
+async def _fetch_user(user_id: str, db: AsyncSession) -> User | None:
+    """The user from PostgreSQL, refilling the cache."""
     result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
     user = result.scalar_one_or_none()
     if user is None:
-        raise exc
+        return None
 
     # Cache for 5 minutes
     await cache_user_set(user_id, {
@@ -55,6 +50,51 @@ async def _resolve_user_from_token(
     return user
 
 
+async def _load_user(user_id: str, db: AsyncSession) -> User | None:
+    """The user from the worker-local LRU, then Redis, then PostgreSQL."""
+    cached = await cache_user_get(user_id)
+    return _user_from_record(cached) if cached else await _fetch_user(user_id, db)
+
+
+async def _resolve_user_from_token(
+    credentials: HTTPAuthorizationCredentials,
+    db: AsyncSession,
+) -> User:
+    exc = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    try:
+        payload = decode_access_token(credentials.credentials)
+    except JWTError:
+        raise exc
+    user_id: str = payload.get("sub")
+    if not user_id:
+        raise exc
+
+    # Whatever the worker can't answer locally (a Bloom hit on the jti, a user
+    # not in the LRU) is asked of Redis in a single round trip
+    jti = payload.get("jti")
+    confirm = bool(jti) and must_confirm(jti)
+    cached = cache_user_peek(user_id)
+    commands = []
+    if confirm:
+        commands.append(("EXISTS", revoked_key(jti)))
+    if cached is None:
+        commands.append(("GET", user_key(user_id)))
+    if commands:
+        results = await pipelined(*commands)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        if confirm and results.pop(0):
+            raise exc
+        if cached is None:
+            cached = cache_user_remember(user_id, results[0])
+
+    user = _user_from_record(cached) if cached else await _fetch_user(user_id, db)
+    if user is None:
+        raise exc
+    return user
+
+
 def resolve_sso_role(groups_header: str | None) -> str | None:
     """Map semicolon-delimited Shibboleth groups header to application role."""
     if not groups_header:
@@ -69,10 +109,50 @@ def resolve_sso_role(groups_header: str | None) -> str | None:
     return "viewer"
 
 
+def _sso_fingerprint(email: str, groups_header: str | None) -> str:
+    """Identifies everything SSO headers decide about a user: who they are and their role."""
+    return hashlib.sha256(f"{email}\n{groups_header or ''}".encode()).hexdigest()[:32]
+
+
+async def _sso_login(email: str, display_name: str, group_role: str | None) -> str:
+    """Find or create the SSO user and apply the groups' role; returns the user id.
+
+    Runs on its own session: it is shared by concurrent requests with the same
+    headers and only writes when the user is new or their role changed.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            user = User(
+                id=uuid.uuid4(),
+                email=email,
+                name=display_name,
+                role=group_role or settings.sso_default_role,
+                oauth_provider="shibboleth",
+                oauth_sub=email,
+            )
+            db.add(user)
+            await db.commit()
+        elif group_role is not None and user.role != group_role:
+            user.role = group_role
+            await db.commit()
+            await cache_user_delete(str(user.id))
+        return str(user.id)
+
+
 async def _resolve_user_from_sso_headers(
     request: Request,
     db: AsyncSession,
 ) -> User:
+    """Resolve the user from Shibboleth headers, read-only on the hot path.
+
+    The user id is cached per header fingerprint for ``SSO_SESSION_TTL``, so a
+    known user costs no database round trip. A change of groups is a new
+    fingerprint and is applied at once. ``last_login`` is written in throttled
+    background batches (``app/services/last_login.py``).
+    """
     exc = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="SSO headers missing")
     email = request.headers.get(settings.sso_header_email)
     if not email:
@@ -82,27 +162,20 @@ async def _resolve_user_from_sso_headers(
     groups_header = request.headers.get(settings.sso_header_groups)
     group_role = resolve_sso_role(groups_header)
 
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    key = f"sso:{_sso_fingerprint(email, groups_header)}"
 
-    if user is None:
-        user = User(
-            id=uuid.uuid4(),
-            email=email,
-            name=display_name,
-            role=group_role or settings.sso_default_role,
-            oauth_provider="shibboleth",
-            oauth_sub=email,
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-    else:
-        if group_role is not None:
-            user.role = group_role
+    async def resolve() -> User | None:
+        user_id = await get_or_load(key, lambda: _sso_login(email, display_name, group_role), ttl=SSO_SESSION_TTL)
+        return await _load_user(user_id, db)
 
-    user.last_login = datetime.now(timezone.utc)
-    await db.commit()
+    user = await resolve()
+    if user is None:
+        # The user was deleted since the fingerprint was cached; sign them up again
+        await invalidate(key)
+        user = await resolve()
+    if user is None:
+        raise exc
+    record_login(user.id)
     return user
 
 
@@ -5,7 +5,7 @@ from typing import Any
 from jose import JWTError, jwt
 
 from app.config import settings
-from app.redis_client import is_token_blacklisted
+from app.auth.revocation import is_token_revoked
 
 
 def create_access_token(data: dict[str, Any]) -> str:
@@ -23,6 +23,6 @@ def decode_access_token(token: str) -> dict[str, Any]:
 async def decode_and_validate_token(token: str) -> dict[str, Any]:
     payload = decode_access_token(token)
     jti = payload.get("jti")
-    if jti and await is_token_blacklisted(jti):
+    if jti and await is_token_revoked(jti):
         raise JWTError("Token has been revoked")
     return payload
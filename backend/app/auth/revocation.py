@@ -0,0 +1,117 @@
+"""Revoked JWT ids: authoritative in Redis, mirrored in a per-worker Bloom filter.
+
+A revoked ``jti`` is stored as ``bl:{jti}`` (expiring with the token) and in
+the ``bl:index`` sorted set (scored by expiry), then published on
+``auth:revoked``. Each worker loads the index into a local Bloom filter at
+startup and adds every published ``jti``, so almost every request clears the
+revocation check without a Redis round trip. Only a Bloom hit (revoked, or a
+rare false positive) is confirmed against Redis. So is every check while the
+filter is out of sync, i.e. before the first load or after the listener loses
+its connection. The filter is rebuilt from the index every few minutes, which
+drops expired tokens, since a Bloom filter cannot delete.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "auth:revoked"
+REVOCATION_INDEX = "bl:index"
+BLOOM_CAPACITY = 100_000           # revocations the filter holds at FALSE_POSITIVE_RATE
+FALSE_POSITIVE_RATE = 0.001
+REBUILD_INTERVAL = 300             # seconds between rebuilds from the index
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, with double hashing on one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+_filter = BloomFilter(BLOOM_CAPACITY, FALSE_POSITIVE_RATE)
+_synced = False    # True while _filter is known to hold every live revocation
+
+
+def revoked_key(jti: str) -> str:
+    return f"bl:{jti}"
+
+
+def must_confirm(jti: str) -> bool:
+    """False when the local filter alone proves ``jti`` is not revoked."""
+    return not _synced or jti in _filter
+
+
+async def revoke_token(jti: str, ttl: int) -> None:
+    """Reject ``jti`` on every worker for the next ``ttl`` seconds."""
+    _filter.add(jti)
+    r = await get_redis()
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.set(revoked_key(jti), "1", ex=ttl)
+        pipe.zadd(REVOCATION_INDEX, {jti: time.time() + ttl})
+        pipe.publish(REVOCATION_CHANNEL, jti)
+        await pipe.execute()
+
+
+async def is_token_revoked(jti: str) -> bool:
+    if not must_confirm(jti):
+        return False
+    r = await get_redis()
+    return await r.exists(revoked_key(jti)) > 0
+
+
+async def _rebuild() -> None:
+    """Swap in a filter built from the live part of the index."""
+    global _filter, _synced
+    r = await get_redis()
+    await r.zremrangebyscore(REVOCATION_INDEX, "-inf", time.time())
+    fresh = BloomFilter(BLOOM_CAPACITY, FALSE_POSITIVE_RATE)
+    async for jti, _ in r.zscan_iter(REVOCATION_INDEX, count=1000):
+        fresh.add(jti)
+    _filter, _synced = fresh, True
+
+
+async def run_revocation_listener() -> None:
+    """Keep this worker's filter in sync; started once per worker from the app lifespan."""
+    global _synced
+    while True:
+        try:
+            r = await get_redis()
+            async with r.pubsub() as pubsub:
+                # Subscribe before loading, so nothing revoked during the load is missed
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                await _rebuild()
+                rebuild_at = time.monotonic() + REBUILD_INTERVAL
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        _filter.add(message["data"])
+                    if time.monotonic() >= rebuild_at:
+                        await _rebuild()
+                        rebuild_at = time.monotonic() + REBUILD_INTERVAL
+        except asyncio.CancelledError:
+            _synced = False
+            raise
+        except Exception:
+            _synced = False
+            logger.warning("Token revocation listener disconnected; retrying", exc_info=True)
+            await asyncio.sleep(1)
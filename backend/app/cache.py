@@ -0,0 +1,311 @@
+"""Two-tier response cache: a bounded in-process LRU in front of Redis.
+
+A read checks the worker's local LRU first, then Redis, and only then calls
+the loader. Concurrent misses for the same key share one load per worker, and
+a short Redis lock keeps the other workers from recomputing it in parallel.
+Entries may outlive their TTL by ``stale_ttl`` seconds, during which they are
+served as-is while one background refresh replaces them. Invalidations are
+broadcast over Redis pub/sub so every worker drops its local copy.
+
+Authenticated user records get their own, larger LRU with the same two tiers
+and the same invalidation channel (see ``cache_user_get``).
+"""
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCAL_MAX_ENTRIES = 2048
+USER_LOCAL_MAX_ENTRIES = 10_000
+USER_LOCAL_TTL = 30          # seconds a worker serves a user record without asking Redis
+USER_TTL = 300
+VERSION_LOCAL_TTL = 30       # how long a worker trusts its copy of a namespace version without pub/sub
+LOCK_TTL_MS = 10_000         # cross-worker load lock; bounds how long a crashed loader blocks others
+LOCK_WAIT = 1.0              # seconds to wait for another worker's load before computing it ourselves
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class LocalCache:
+    """Size-bounded LRU of decoded values. Callers must not mutate what they get back."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, _Entry] = OrderedDict()
+
+    def get(self, key: str) -> _Entry | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: _Entry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_local = LocalCache(LOCAL_MAX_ENTRIES)
+_users = LocalCache(USER_LOCAL_MAX_ENTRIES)
+_inflight: dict[tuple[str, bool], asyncio.Task] = {}   # (key, is_refresh) -> running load
+
+
+# ─── Redis tier ──────────────────────────────────────────────────────────────
+
+async def _redis_get(key: str) -> _Entry | None:
+    r = await get_redis()
+    raw = await r.get(key)
+    if raw is None:
+        return None
+    envelope = json.loads(raw)
+    return _Entry(envelope["v"], envelope["f"], envelope["s"])
+
+
+async def _store(key: str, value: Any, ttl: int, stale_ttl: int) -> None:
+    now = time.time()
+    entry = _Entry(value, now + ttl, now + ttl + stale_ttl)
+    r = await get_redis()
+    await r.set(key, json.dumps({"v": value, "f": entry.fresh_until, "s": entry.stale_until}, default=str), ex=ttl + stale_ttl)
+    _local.set(key, entry)
+
+
+# ─── Loading ─────────────────────────────────────────────────────────────────
+
+async def _load(key: str, loader: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int, *, refresh: bool) -> Any:
+    r = await get_redis()
+    lock_key = f"lock:{key}"
+    acquired = await r.set(lock_key, "1", nx=True, px=LOCK_TTL_MS)
+    if not acquired:
+        if refresh:
+            return None  # another worker is already refreshing; keep serving the stale copy
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await _redis_get(key)
+            if entry is not None and entry.fresh_until > time.time():
+                _local.set(key, entry)
+                return entry.value
+    try:
+        value = await loader()
+        await _store(key, value, ttl, stale_ttl)
+        return value
+    finally:
+        if acquired:
+            await r.delete(lock_key)
+
+
+def _start_load(key: str, loader: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int, *, refresh: bool) -> asyncio.Task:
+    """One load per key per worker; later callers join the running one."""
+    task = _inflight.get((key, refresh))
+    if task is None:
+        task = asyncio.create_task(_load(key, loader, ttl, stale_ttl, refresh=refresh))
+        _inflight[(key, refresh)] = task
+        task.add_done_callback(functools.partial(_load_done, (key, refresh)))
+    return task
+
+
+def _load_done(flight: tuple[str, bool], task: asyncio.Task) -> None:
+    _inflight.pop(flight, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Cache load for %s failed", flight[0], exc_info=task.exception())
+
+
+async def get_or_load(key: str, loader: Callable[[], Awaitable[Any]], *, ttl: int, stale_ttl: int = 0) -> Any:
+    """Return the cached value for ``key``, loading and storing it on a miss.
+
+    ``loader`` must return something JSON-serializable.
+    """
+    entry = _local.get(key)
+    if entry is None:
+        entry = await _redis_get(key)
+        if entry is not None:
+            _local.set(key, entry)
+    if entry is not None:
+        if entry.fresh_until <= time.time():
+            _start_load(key, loader, ttl, stale_ttl, refresh=True)
+        return entry.value
+    return await asyncio.shield(_start_load(key, loader, ttl, stale_ttl, refresh=False))
+
+
+# ─── Invalidation ────────────────────────────────────────────────────────────
+
+async def _publish(keys: list[str]) -> None:
+    r = await get_redis()
+    await r.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+
+
+async def invalidate(*keys: str) -> None:
+    """Delete ``keys`` from Redis and from every worker's local tier."""
+    for key in keys:
+        _local.pop(key)
+        _users.pop(key)
+    r = await get_redis()
+    await r.delete(*keys)
+    await _publish(list(keys))
+
+
+async def get_versions(*namespaces: str) -> list[int]:
+    """Current generations of cache namespaces, to be embedded in their keys.
+
+    Versions this worker doesn't hold are fetched together in one ``MGET``.
+    """
+    keys = [f"ver:{ns}" for ns in namespaces]
+    versions: list[int | None] = []
+    for key in keys:
+        entry = _local.get(key)
+        versions.append(None if entry is None else entry.value)
+    missing = [i for i, v in enumerate(versions) if v is None]
+    if missing:
+        r = await get_redis()
+        fetched = await r.mget([keys[i] for i in missing])
+        expires = time.time() + VERSION_LOCAL_TTL
+        for i, raw in zip(missing, fetched):
+            versions[i] = int(raw or 0)
+            _local.set(keys[i], _Entry(versions[i], expires, expires))
+    return versions
+
+
+async def get_version(namespace: str) -> int:
+    """Current generation of a cache namespace, to be embedded in its keys."""
+    return (await get_versions(namespace))[0]
+
+
+async def bump_version(*namespaces: str) -> None:
+    """Invalidate every key built on these namespaces in O(1); old entries just age out."""
+    keys = [f"ver:{ns}" for ns in namespaces]
+    for key in keys:
+        _local.pop(key)
+    r = await get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.incr(key)
+        await pipe.execute()
+    await _publish(keys)
+
+
+async def run_invalidation_listener() -> None:
+    """Drop local entries invalidated by other workers; started once per worker from the app lifespan."""
+    while True:
+        try:
+            r = await get_redis()
+            async with r.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Messages published while we were disconnected are lost
+                _local.clear()
+                _users.clear()
+                while True:
+                    # Polled rather than listen()ed, which would trip the pool's socket timeout when idle
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        for key in json.loads(message["data"]):
+                            _local.pop(key)
+                            _users.pop(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Cache invalidation listener disconnected; retrying", exc_info=True)
+            await asyncio.sleep(1)
+
+
+# ─── User records ────────────────────────────────────────────────────────────
+
+def user_key(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def cache_user_peek(user_id: str) -> dict | None:
+    """The user from this worker's LRU only; never touches Redis."""
+    entry = _users.get(user_key(user_id))
+    return None if entry is None else entry.value
+
+
+def cache_user_remember(user_id: str, raw: str | None) -> dict | None:
+    """Decode a user record read from Redis (``GET user_key(...)``) and keep it locally."""
+    if raw is None:
+        return None
+    data = json.loads(raw)
+    expires = time.time() + USER_LOCAL_TTL
+    _users.set(user_key(user_id), _Entry(data, expires, expires))
+    return data
+
+
+async def cache_user_get(user_id: str) -> dict | None:
+    """The cached ``{id, email, name, role}`` of a user: worker LRU first, then Redis."""
+    data = cache_user_peek(user_id)
+    if data is not None:
+        return data
+    r = await get_redis()
+    return cache_user_remember(user_id, await r.get(user_key(user_id)))
+
+
+async def cache_user_set(user_id: str, data: dict, ttl: int = USER_TTL) -> None:
+    key = user_key(user_id)
+    r = await get_redis()
+    await r.set(key, json.dumps(data, default=str), ex=ttl)
+    expires = time.time() + min(ttl, USER_LOCAL_TTL)
+    _users.set(key, _Entry(data, expires, expires))
+
+
+async def cache_user_delete(user_id: str) -> None:
+    """Forget a user everywhere; call after any change to their role, name or email."""
+    await invalidate(user_key(user_id))
+
+
+# ─── Decorator ───────────────────────────────────────────────────────────────
+
+def cached(key: str, *, ttl: int, stale_ttl: int = 0, versions: tuple[str, ...] = ()):
+    """Cache a router function's response.
+
+    ``key`` and each of ``versions`` are format strings over the endpoint's
+    parameters, e.g. ``"list:tables:{schema_id}:p{page}"`` with
+    ``versions=("tables:{schema_id}",)``. The current version of each namespace
+    is appended to the key, so :func:`bump_version` invalidates the lot. Misses
+    run the endpoint on a session of their own, so a shared or background load
+    never touches a request's session after that request has finished.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            parts = [key.format(**kwargs)]
+            if versions:
+                parts += [f"v{v}" for v in await get_versions(*(ns.format(**kwargs) for ns in versions))]
+
+            async def load():
+                if isinstance(kwargs.get("db"), AsyncSession):
+                    async with AsyncSessionLocal() as db:
+                        return jsonable_encoder(await fn(*args, **{**kwargs, "db": db}))
+                return jsonable_encoder(await fn(*args, **kwargs))
+
+            return await get_or_load(":".join(parts), load, ttl=ttl, stale_ttl=stale_ttl)
+        return wrapper
+    return decorator
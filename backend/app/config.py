@@ -40,9 +40,17 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:3001"
 
     redis_url: str = "redis://localhost:6379/0"
+    # Per-worker pool: callers wait up to redis_pool_timeout seconds for a free connection
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 5.0
+    redis_socket_timeout: float = 5.0
+    redis_slow_command_ms: float = 50.0     # commands at least this slow are logged
 
     meilisearch_url: str = "http://localhost:7700"
     meilisearch_api_key: str = "dev-meili-master-key"
+    # Routine changes reach the index through the search outbox; a full rebuild
+    # on every boot is only needed when an index was lost or its settings changed.
+    search_reindex_on_startup: bool = False
 
     minio_endpoint: str = "localhost:9000"
     minio_access_key: str = "minioadmin"
@@ -50,6 +58,28 @@ class Settings(BaseSettings):
     minio_bucket: str = "data-catalog"
     minio_use_ssl: bool = False
 
+    # Attachment storage: "s3" (MinIO/S3, above) or "local" (files under storage_local_path, for tests)
+    storage_backend: str = "s3"
+    storage_local_path: str = "/tmp/data-catalog-storage"
+    # Per-worker S3 connection pool, timeouts (seconds) and attempts per call, retries included
+    storage_max_connections: int = 50
+    storage_connect_timeout: float = 5.0
+    storage_read_timeout: float = 60.0
+    storage_max_attempts: int = 4
+
+    # Per-client request budgets ("<count>/<second|minute|hour|day>"), shared by all workers via Redis
+    rate_limit_login: str = "10/minute"
+    rate_limit_search: str = "120/minute"
+    rate_limit_ingest_batch: str = "30/minute"
+    rate_limit_ingest_lineage: str = "120/minute"
+
+    # Responses at least this large are brotli/gzip-compressed for clients that accept it
+    compression_minimum_size: int = 1024
+
+    # Adds X-DB-Statements (SQL statements run for the request) to every response.
+    # Test-only instrumentation: set it just for runs of tests/test_statement_counts.py
+    sql_statement_header: bool = False
+
     class Config:
         env_file = ".env"
         extra = "ignore"
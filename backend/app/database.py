@@ -1,3 +1,6 @@
+from contextvars import ContextVar
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -13,6 +16,16 @@ engine = create_async_engine(
 )
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# SQL statements issued in the current request, when something is counting them
+statement_count: ContextVar[list[int] | None] = ContextVar("statement_count", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(*_):
+    counter = statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
 
 class Base(DeclarativeBase):
     pass
@@ -0,0 +1,84 @@
+"""ETags, Last-Modified and conditional GET handling for JSON responses."""
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+# Responses are per-user (auth required), so browsers may keep them but must revalidate
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+# OpenAPI entry for routes that can answer 304
+NOT_MODIFIED = {304: {"description": "Not Modified"}}
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag over the exact response bytes."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def version_etag(*parts) -> str:
+    """Weak ETag from whatever identifies a representation's version (ids, ``updated_at``s, ...).
+
+    Weak because equal versions promise equivalent, not byte-identical, bodies.
+    """
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's ``If-None-Match`` already names ``etag``.
+
+    ``If-None-Match`` uses weak comparison, so ``W/`` prefixes are ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(request: Request, last_modified: datetime) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request, body: bytes, etag: str | None = None, *,
+    cache_control: str = DEFAULT_CACHE_CONTROL, media_type: str = "application/json",
+) -> Response:
+    """Serve ``body`` with an ETag, or an empty ``304`` if the client already has it."""
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def not_modified(
+    request: Request, response: Response, *, etag: str,
+    last_modified: datetime | None = None, cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response | None:
+    """Attach validators to ``response``; return a ``304`` if the client's copy is current.
+
+    ``If-None-Match`` wins when present; ``If-Modified-Since`` is only checked
+    without it, as RFC 9110 requires. Call before loading anything the 304
+    doesn't need, and return the result when it isn't None.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+    if "if-none-match" in request.headers:
+        current = etag_matches(request, etag)
+    else:
+        current = last_modified is not None and _not_modified_since(request, last_modified)
+    return Response(status_code=304, headers=headers) if current else None
@@ -0,0 +1,31 @@
+"""Eager-load options per model, shared by the list and detail endpoints.
+
+Serializers read relationships (creator names, attachments, links) off every
+row. Loading them together with the rows, instead of one ``db.refresh`` per
+row, keeps each list endpoint at a fixed number of queries whatever the page
+size. Many-to-one relations use ``joinedload`` (same query); collections use
+``selectinload`` (one extra ``IN`` query per page).
+
+Pass them to :func:`app.pagination.paginate` as ``options=`` or apply them
+with ``select(Model).options(*MODEL_RELATED)``.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.audit import AuditLog
+from app.models.catalog import Article, Query
+from app.models.glossary import GlossaryTerm
+from app.models.governance import ApprovalRequest, ResourcePermission
+from app.models.group import UserGroup
+from app.models.social import Comment
+from app.models.webhooks import Webhook
+
+QUERY_RELATED = (joinedload(Query.connection), joinedload(Query.creator))
+ARTICLE_RELATED = (joinedload(Article.creator), selectinload(Article.attachments))
+TERM_RELATED = (joinedload(GlossaryTerm.owner), joinedload(GlossaryTerm.creator), selectinload(GlossaryTerm.links))
+AUDIT_RELATED = (joinedload(AuditLog.actor),)
+APPROVAL_RELATED = (joinedload(ApprovalRequest.requester), joinedload(ApprovalRequest.reviewer))
+PERMISSION_RELATED = (joinedload(ResourcePermission.user), joinedload(ResourcePermission.granter))
+STEWARD_RELATED = (joinedload(ResourcePermission.user),)
+COMMENT_RELATED = (joinedload(Comment.user),)
+WEBHOOK_RELATED = (joinedload(Webhook.creator),)
+MEMBER_RELATED = (joinedload(UserGroup.user),)
@@ -5,27 +5,30 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 from starlette.middleware.sessions import SessionMiddleware
 
+from app.auth.revocation import run_revocation_listener
+from app.cache import run_invalidation_listener
 from app.config import settings
-from app.database import AsyncSessionLocal
+from app.middleware.compression import CompressionMiddleware
 from app.middleware.logging import LoggingMiddleware, configure_logging
-from app.middleware.rate_limit import limiter
 from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.statement_count import StatementCountMiddleware
+from app.redis_client import close_redis
 from app.search_engine import init_indexes
-from app.services.search_sync import reindex_all
-from app.storage import ensure_bucket
+from app.services.last_login import run_last_login_flusher
+from app.services.search_outbox import run_dispatcher
+from app.services.search_sync import ReindexInProgressError, start_reindex, stop_reindex
+from app.storage import close_storage, ensure_bucket
 
 logger = logging.getLogger(__name__)
 
 
-async def _background_reindex():
+async def _startup_reindex():
     try:
-        async with AsyncSessionLocal() as db:
-            counts = await reindex_all(db)
-            logger.info("Startup reindex complete: %s", counts)
+        await start_reindex()
+    except ReindexInProgressError:
+        logger.info("Startup reindex skipped: another worker is already reindexing")
     except Exception:
         logger.warning("Startup reindex failed", exc_info=True)
 
@@ -38,18 +41,28 @@ async def lifespan(app: FastAPI):
     except Exception:
         pass  # Meilisearch may not be ready yet
     try:
-        ensure_bucket()
+        await ensure_bucket()
     except Exception:
         pass  # MinIO may not be ready yet
-    asyncio.create_task(_background_reindex())
+    if settings.search_reindex_on_startup:
+        asyncio.create_task(_startup_reindex())
+    background = [
+        asyncio.create_task(run_dispatcher()),
+        asyncio.create_task(run_invalidation_listener()),
+        asyncio.create_task(run_revocation_listener()),
+        asyncio.create_task(run_last_login_flusher()),
+    ]
     yield
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await stop_reindex()
+    await close_storage()
+    await close_redis()
 
 
 app = FastAPI(title="Data Catalog v2", version="2.0.0", lifespan=lifespan)
 
-# --- State / extensions ---
-app.state.limiter = limiter
-
 # --- Middleware (order matters: outermost first) ---
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(RequestIdMiddleware)
@@ -61,9 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(SessionMiddleware, secret_key=settings.jwt_secret)
-
-# --- Rate-limit error handler ---
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+if settings.sql_statement_header:
+    app.add_middleware(StatementCountMiddleware)
 
 # --- Routers ---
 from app.routers import (  # noqa: E402
@@ -73,6 +86,7 @@ from app.routers import (  # noqa: E402
     auth,
     catalog,
     comments,
+    entities,
     favorites,
     glossary,
     governance,
@@ -90,6 +104,7 @@ from app.routers import (  # noqa: E402
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(catalog.router)
+app.include_router(entities.router)
 app.include_router(search.router)
 app.include_router(queries.router)
 app.include_router(articles.router)
@@ -0,0 +1,160 @@
+"""Negotiated brotli/gzip compression of API responses above a size threshold."""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    """Codings the client accepts, ignoring any it refuses with ``q=0``."""
+    codings = set()
+    for part in accept_encoding.split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            if float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        if coding:
+            codings.add(coding.lower())
+    return codings
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class CompressionMiddleware:
+    """Compress textual responses of at least ``minimum_size`` bytes.
+
+    Prefers brotli when the client accepts it and the ``brotli`` package is
+    installed, otherwise gzip. Responses that are already encoded, partial or
+    range-capable (``206``, ``Content-Range``, ``Accept-Ranges``), bodiless or
+    of a non-textual type pass through untouched. Strong ETags are weakened on
+    compressed responses, which the conditional GET helpers in ``app/etag.py``
+    already compare weakly.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            coding = "br"
+        elif "gzip" in accepted:
+            coding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(self, coding, send))
+
+    def encoder(self, coding: str):
+        return _Brotli(self.brotli_quality) if coding == "br" else _Gzip(self.gzip_level)
+
+
+class _Responder:
+    """The ``send`` callable handed to the app; compresses what passes through it."""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Message | None = None
+        self.encoder = None    # set once the response is known to be compressible
+        self.passthrough = False
+
+    def _compressible(self, headers: Headers, status: int) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            status not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and "accept-ranges" not in headers   # byte ranges refer to the identity encoding
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+        )
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the start message until the first body chunk tells us the size
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = not self._compressible(headers, message["status"])
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if len(body) < self.middleware.minimum_size and not more_body:
+                await self.send(self.start)
+                await self.send(message)
+                self.start = None
+                self.passthrough = True
+                return
+            self.encoder = self.middleware.encoder(self.coding)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.coding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": self.encoder.process(body), "more_body": True})
+                return
+            compressed = self.encoder.process(body) + self.encoder.finish()
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        chunk = self.encoder.process(body)
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
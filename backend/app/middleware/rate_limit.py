@@ -1,4 +1,135 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""Cluster-wide rate limiting: sliding-window counters in Redis, checked as a route dependency.
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+Each budget (``"60/minute"``) is counted per scope (the route group, e.g.
+``search``) and per client, so one heavy client exhausts only its own
+budget. The client is whatever the route has already verified: the signed-in
+user (:class:`UserRateLimit`), the API key on routes that check it
+(:func:`client_api_key`), otherwise the IP address. Unverified headers never
+pick the bucket, or a caller could get a fresh budget per request. Counts are the weighted sum of
+the current and previous fixed windows, which approximates a true sliding
+window in two small keys per client. One Lua call checks and increments
+atomically in a single round trip, so every worker shares the same counters.
+
+If Redis is unavailable the request is let through: throttling is a
+protection, not a reason to take the API down.
+"""
+import hashlib
+import logging
+import math
+import time
+from collections.abc import Callable
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.auth.dependencies import get_current_user
+from app.models.user import User
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS: current window, previous window. ARGV: limit, window (ms), ms elapsed in the current window.
+# Returns {allowed, ms until the next request would be allowed}.
+_SLIDING_WINDOW = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local used = previous * (window - elapsed) / window + current
+if used + 1 > limit then
+    local wait
+    if current + 1 > limit then
+        wait = window - elapsed + math.ceil(window * (current + 1 - limit) / current)
+    else
+        wait = math.ceil((used + 1 - limit) * window / previous)
+    end
+    return {0, wait}
+end
+redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, 0}
+"""
+
+
+def parse_limit(limit: str) -> tuple[int, int]:
+    """``"60/minute"`` -> ``(60, 60)``: requests allowed and window length in seconds."""
+    count, _, period = limit.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if not count.strip().isdigit() or int(count) < 1 or period not in PERIODS:
+        raise ValueError(f"Invalid rate limit {limit!r}; expected e.g. '60/minute'")
+    return int(count), PERIODS[period]
+
+
+# ─── Client identity ─────────────────────────────────────────────────────────
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+def client_ip(request: Request) -> str:
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def client_api_key(request: Request) -> str:
+    """The X-API-Key (hashed); only for routes behind ``require_ingest_api_key``, which ran first."""
+    return f"key:{_digest(request.headers['x-api-key'])}"
+
+
+# ─── Dependency ──────────────────────────────────────────────────────────────
+
+class RateLimit:
+    """Route dependency allowing each client ``limit`` requests per window within ``scope``.
+
+    ``Depends(RateLimit("login", settings.rate_limit_login))`` on a route or
+    router; over budget, it raises 429 with ``Retry-After``.
+    """
+
+    def __init__(self, scope: str, limit: str, key: Callable[[Request], str] = client_ip):
+        self.scope = scope
+        self.limit, window = parse_limit(limit)
+        self.window_ms = window * 1000
+        self.key = key
+        self._description = limit
+
+    async def __call__(self, request: Request) -> None:
+        await self.hit(self.key(request))
+
+    async def hit(self, client: str) -> None:
+        """Count one request by ``client``; 429 if that exceeds its budget."""
+        now_ms = int(time.time() * 1000)
+        index, elapsed = divmod(now_ms, self.window_ms)
+        prefix = f"rl:{self.scope}:{client}"
+        try:
+            r = await get_redis()
+            script = r.register_script(_SLIDING_WINDOW)
+            allowed, retry_ms = await script(
+                keys=[f"{prefix}:{index}", f"{prefix}:{index - 1}"],
+                args=[self.limit, self.window_ms, elapsed],
+            )
+        except Exception:
+            logger.warning("Rate limiter unavailable; allowing %s request", self.scope, exc_info=True)
+            return
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {self._description}",
+                headers={
+                    "Retry-After": str(max(1, math.ceil(int(retry_ms) / 1000))),
+                    "X-RateLimit-Limit": str(self.limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+
+
+class UserRateLimit(RateLimit):
+    """:class:`RateLimit` per authenticated user, for routes that require one.
+
+    Resolving the user first means forged or random credentials are refused
+    by auth and never get a budget of their own. ``get_current_user`` is
+    cached per request, so the route's own dependency on it costs nothing more.
+    """
+
+    async def __call__(self, current_user: User = Depends(get_current_user)) -> None:
+        await self.hit(f"user:{current_user.id}")
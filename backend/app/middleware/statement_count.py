@@ -0,0 +1,33 @@
+"""Report how many SQL statements each request ran, in an X-DB-Statements header."""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import statement_count
+
+
+class StatementCountMiddleware:
+    """Count statements with the engine listener in ``app/database.py``.
+
+    The count is taken when the response starts, which for regular
+    (non-streaming) responses is after the endpoint and its dependencies ran.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = [0]
+        token = statement_count.set(counter)
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-DB-Statements"] = str(counter[0])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            statement_count.reset(token)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,6 +30,10 @@ class DbConnection(SoftDeleteMixin, Base):
 
     schemas: Mapped[list["Schema"]] = relationship("Schema", back_populates="connection", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_db_connections_live_name", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class Schema(SoftDeleteMixin, Base):
     __tablename__ = "schemas"
@@ -46,6 +50,11 @@ class Schema(SoftDeleteMixin, Base):
     connection: Mapped["DbConnection"] = relationship("DbConnection", back_populates="schemas")
     tables: Mapped[list["Table"]] = relationship("Table", back_populates="schema", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        UniqueConstraint("connection_id", "name", name="uq_schemas_connection_name"),
+        Index("ix_schemas_live_connection_name", "connection_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class Table(SoftDeleteMixin, Base):
     __tablename__ = "tables"
@@ -67,6 +76,11 @@ class Table(SoftDeleteMixin, Base):
     schema: Mapped["Schema"] = relationship("Schema", back_populates="tables")
     columns: Mapped[list["Column"]] = relationship("Column", back_populates="table", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        UniqueConstraint("schema_id", "name", name="uq_tables_schema_name"),
+        Index("ix_tables_live_schema_name", "schema_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class Column(SoftDeleteMixin, Base):
     __tablename__ = "columns"
@@ -85,6 +99,25 @@ class Column(SoftDeleteMixin, Base):
 
     table: Mapped["Table"] = relationship("Table", back_populates="columns")
 
+    __table_args__ = (
+        UniqueConstraint("table_id", "name", name="uq_columns_table_name"),
+        Index("ix_columns_live_table_name", "table_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
+
+class CatalogCounter(Base):
+    """Live (not soft-deleted) row counts, per catalog entity and globally.
+
+    Maintained by the writers in the same transaction as the rows they count;
+    see ``app/services/counters.py``. Global totals use the nil UUID.
+    """
+    __tablename__ = "catalog_counters"
+
+    entity_type: Mapped[str] = mapped_column(String(20), primary_key=True)   # global | database | schema | table
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    name: Mapped[str] = mapped_column(String(30), primary_key=True)          # schemas | tables | columns | ...
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
 
 class Query(SoftDeleteMixin, Base):
     __tablename__ = "queries"
@@ -107,6 +140,10 @@ class Query(SoftDeleteMixin, Base):
     connection: Mapped["DbConnection | None"] = relationship("DbConnection")
     creator: Mapped["User | None"] = relationship("User")
 
+    __table_args__ = (
+        Index("ix_queries_live_updated", "updated_at", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class Article(SoftDeleteMixin, Base):
     __tablename__ = "articles"
@@ -129,6 +166,10 @@ class Article(SoftDeleteMixin, Base):
         "ArticleAttachment", back_populates="article", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_articles_live_updated", "updated_at", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class ArticleAttachment(Base):
     __tablename__ = "article_attachments"
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -31,6 +31,10 @@ class GlossaryTerm(Base):
     creator: Mapped["User | None"] = relationship("User", foreign_keys=[created_by])
     links: Mapped[list["TermLink"]] = relationship("TermLink", back_populates="term", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_glossary_terms_live_name", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
 
 class TermLink(Base):
     __tablename__ = "term_links"
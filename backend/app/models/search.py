@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SearchOutbox(Base):
+    """Pending search-index changes, written in the same transaction as the catalog change.
+
+    The auto-incrementing id is the change cursor: the dispatcher drains rows in
+    id order and deletes them once Meilisearch has applied the change. A row
+    that keeps failing is set aside once ``attempts`` reaches the dispatcher's
+    limit, with the reason in ``last_error``.
+    """
+    __tablename__ = "search_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    index_name: Mapped[str] = mapped_column(String(50), nullable=False)  # databases, schemas, tables, ...
+    entity_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
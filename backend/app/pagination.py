@@ -0,0 +1,96 @@
+"""Keyset (cursor) pagination with optional counts, shared by the list endpoints."""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Literal, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.counters import get_counter
+
+# exact: COUNT(*) over every match; estimated: planner row estimate; none: skip counting
+CountMode = Literal["exact", "estimated", "none"]
+
+
+def _encode_cursor(row: Any, sort: Sequence) -> str:
+    values = [str(getattr(row, col.key)) for col in sort]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort: Sequence) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # _encode_cursor writes a list of strings; anything else was not ours
+        if not isinstance(values, list) or len(values) != len(sort) or not all(isinstance(v, str) for v in values):
+            raise ValueError
+        decoded = []
+        for col, value in zip(sort, values):
+            python_type = col.type.python_type
+            if python_type is uuid.UUID:
+                decoded.append(uuid.UUID(value))
+            elif python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            else:
+                decoded.append(value)
+        return decoded
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _estimated_count(db: AsyncSession, stmt: Select) -> int:
+    """Planner row estimate for ``stmt``; costs a plan, not a scan of every match."""
+    conn = await db.connection()
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, stmt: Select, count: CountMode) -> int | None:
+    if count == "none":
+        return None
+    if count == "estimated":
+        return await _estimated_count(db, stmt)
+    count_stmt = stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    return (await db.execute(count_stmt)).scalar_one()
+
+
+async def paginate(
+    db: AsyncSession, stmt: Select, *, sort: Sequence, descending: bool = False,
+    size: int, page: int = 1, cursor: str | None = None, count: CountMode = "exact",
+    counter: tuple[str, uuid.UUID, str] | None = None, options: Sequence = (),
+) -> tuple[list, int | None, str | None]:
+    """Run one page of ``stmt`` ordered by ``sort`` (ending in a unique column).
+
+    With a ``cursor`` the page starts right after the row it encodes, using a
+    row-value comparison the sort index can seek to, so deep pages cost the
+    same as the first. Without one, ``page`` falls back to OFFSET. Returns
+    ``(items, total, next_cursor)``; ``next_cursor`` is None on the last page.
+
+    ``counter`` names the ``catalog_counters`` row that already holds the
+    total for ``stmt``; pass it only when ``stmt`` is unfiltered beyond the
+    parent and liveness, and the total becomes a primary-key lookup.
+
+    ``options`` (e.g. from ``app/loaders.py``) apply to the page query only,
+    so relationships load with the rows and never with the count.
+    """
+    if counter is not None and count != "none":
+        total = await get_counter(db, *counter)
+    else:
+        total = await count_rows(db, stmt, count)
+    page_stmt = stmt.options(*options).order_by(*(col.desc() if descending else col.asc() for col in sort)).limit(size + 1)
+    if cursor:
+        values = _decode_cursor(cursor, sort)
+        key = tuple_(*sort)
+        after = tuple_(*(literal(v, col.type) for col, v in zip(sort, values)))
+        page_stmt = page_stmt.where(key < after if descending else key > after)
+    else:
+        page_stmt = page_stmt.offset((page - 1) * size)
+    rows = list((await db.execute(page_stmt)).scalars().all())
+    next_cursor = _encode_cursor(rows[size - 1], sort) if len(rows) > size else None
+    return rows[:size], total, next_cursor
@@ -1,20 +1,144 @@
+"""Shared Redis client: a bounded connection pool, pipelining helpers and per-command latency stats.
+
+Every worker has one pool of at most ``redis_max_connections`` connections.
+When all are busy, callers wait up to ``redis_pool_timeout`` seconds for one
+instead of opening more. Each command and pipeline is timed into per-worker
+stats (served at ``GET /api/v1/admin/redis``), and any slower than
+``redis_slow_command_ms`` is logged. :func:`pipelined` sends several
+commands in one round trip.
+"""
 import json
+import logging
+import time
 from typing import Any
 
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 pool: aioredis.Redis | None = None
 
 
+# ─── Latency instrumentation ─────────────────────────────────────────────────
+
+class _CommandStats:
+    __slots__ = ("calls", "errors", "total", "max")
+
+    def __init__(self):
+        self.calls = self.errors = 0
+        self.total = self.max = 0.0
+
+
+_stats: dict[str, _CommandStats] = {}
+
+
+def _observe(name: str, elapsed: float, failed: bool) -> None:
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = _CommandStats()
+    stats.calls += 1
+    stats.errors += failed
+    stats.total += elapsed
+    stats.max = max(stats.max, elapsed)
+    if elapsed * 1000 >= settings.redis_slow_command_ms:
+        logger.warning("Slow Redis command %s: %.1f ms", name, elapsed * 1000)
+
+
+def command_stats() -> dict[str, dict]:
+    """Calls, errors and latency (ms) per command since this worker started."""
+    return {
+        name: {
+            "calls": s.calls,
+            "errors": s.errors,
+            "avg_ms": round(s.total / s.calls * 1000, 3),
+            "max_ms": round(s.max * 1000, 3),
+        }
+        for name, s in sorted(_stats.items())
+    }
+
+
+def pool_stats() -> dict:
+    """Size and current use of this worker's connection pool."""
+    if pool is None:
+        return {}
+    connections = pool.connection_pool
+    return {
+        "max_connections": connections.max_connections,
+        "in_use": len(connections._in_use_connections),
+        "idle": len(connections._available_connections),
+    }
+
+
+class _InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        # Timed as a whole, as "PIPELINE" or "MULTI"; the commands share one round trip
+        name = "MULTI" if self.is_transaction else "PIPELINE"
+        start, failed = time.perf_counter(), True
+        try:
+            result = await super().execute(raise_on_error)
+            failed = False
+            return result
+        finally:
+            _observe(name, time.perf_counter() - start, failed)
+
+
+class InstrumentedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        start, failed = time.perf_counter(), True
+        try:
+            result = await super().execute_command(*args, **options)
+            failed = False
+            return result
+        finally:
+            _observe(str(args[0]).upper(), time.perf_counter() - start, failed)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return _InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+# ─── Client ──────────────────────────────────────────────────────────────────
+
 async def get_redis() -> aioredis.Redis:
     global pool
     if pool is None:
-        pool = aioredis.from_url(settings.redis_url, decode_responses=True)
+        connections = aioredis.BlockingConnectionPool.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            socket_timeout=settings.redis_socket_timeout,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            health_check_interval=30,
+        )
+        pool = InstrumentedRedis(connection_pool=connections)
     return pool
 
 
+async def close_redis() -> None:
+    global pool
+    if pool is not None:
+        await pool.aclose()
+    pool = None
+
+
+async def pipelined(*commands: tuple) -> list[Any]:
+    """Run ``commands`` (``("GET", key)``, ``("EXISTS", key)``, ...) in one round trip.
+
+    Results come back in order. A failed command's result is its exception
+    rather than raising, so one bad key doesn't cost the others.
+    """
+    r = await get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        for command in commands:
+            pipe.execute_command(*command)
+        return await pipe.execute(raise_on_error=False)
+
+
+# ─── JSON values ─────────────────────────────────────────────────────────────
+
 async def cache_get(key: str) -> Any | None:
     r = await get_redis()
     val = await r.get(key)
@@ -42,25 +166,3 @@ async def cache_delete_pattern(pattern: str) -> None:
             await r.delete(*keys)
         if cursor == 0:
             break
-
-
-async def cache_user_get(user_id: str) -> dict | None:
-    return await cache_get(f"user:{user_id}")
-
-
-async def cache_user_set(user_id: str, data: dict, ttl: int = 300) -> None:
-    await cache_set(f"user:{user_id}", data, ttl)
-
-
-async def cache_user_delete(user_id: str) -> None:
-    await cache_delete(f"user:{user_id}")
-
-
-async def blacklist_token(jti: str, ttl: int) -> None:
-    r = await get_redis()
-    await r.set(f"bl:{jti}", "1", ex=ttl)
-
-
-async def is_token_blacklisted(jti: str) -> bool:
-    r = await get_redis()
-    return await r.exists(f"bl:{jti}") > 0
@@ -9,14 +9,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_admin, require_steward, get_current_user
 from app.database import get_db
+from app.loaders import AUDIT_RELATED, MEMBER_RELATED
 from app.models.audit import AuditLog
 from app.models.group import Group, UserGroup
 from app.models.user import User
+from app.pagination import CountMode, paginate
 from app.schemas.audit import AuditLogOut, PaginatedAuditLogs
 from app.schemas.group import GroupCreate, GroupOut, GroupPatch, UserGroupOut, AddMember
-from app.redis_client import cache_user_delete
+from app.cache import cache_user_delete
+from app.redis_client import command_stats, pool_stats
 from app.services.audit import log_action
-from app.services.search_sync import reindex_all
+from app.services.counters import get_global_counts, rebuild_counters
+from app.services.permissions import invalidate_all_grants, invalidate_grants
+from app.services.search_outbox import outbox_status, retry_failed
+from app.services.search_sync import ReindexInProgressError, get_reindex_status, start_reindex
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
@@ -65,38 +71,73 @@ async def update_user_role(
 async def list_audit_logs(
     page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     entity_type: str | None = Query(None), entity_id: str | None = Query(None),
+    cursor: str | None = Query(None), count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(require_steward),
 ):
     stmt = select(AuditLog)
-    count_stmt = select(func.count()).select_from(AuditLog)
     if entity_type:
         stmt = stmt.where(AuditLog.entity_type == entity_type)
-        count_stmt = count_stmt.where(AuditLog.entity_type == entity_type)
     if entity_id:
         stmt = stmt.where(AuditLog.entity_id == entity_id)
-        count_stmt = count_stmt.where(AuditLog.entity_id == entity_id)
-    total = (await db.execute(count_stmt)).scalar_one()
-    rows = (await db.execute(stmt.order_by(AuditLog.created_at.desc()).offset((page - 1) * size).limit(size))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["actor"])
-        items.append(AuditLogOut(
+    rows, total, next_cursor = await paginate(
+        db, stmt, sort=(AuditLog.created_at, AuditLog.id), descending=True,
+        size=size, page=page, cursor=cursor, count=count, options=AUDIT_RELATED,
+    )
+    items = [
+        AuditLogOut(
             id=row.id, entity_type=row.entity_type, entity_id=row.entity_id,
             action=row.action, actor_id=row.actor_id,
             actor_name=row.actor.name if row.actor else None,
             old_data=row.old_data, new_data=row.new_data,
             request_id=row.request_id, created_at=row.created_at,
-        ))
-    return PaginatedAuditLogs(total=total, page=page, size=size, items=items)
+        )
+        for row in rows
+    ]
+    return PaginatedAuditLogs(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
-@router.post("/reindex")
-async def reindex_search(
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_steward),
-):
-    counts = await reindex_all(db)
-    return {"status": "ok", "counts": counts}
+@router.post("/reindex", status_code=202)
+async def reindex_search(_: User = Depends(require_steward)):
+    """Start a full rebuild in the background; poll ``GET /reindex`` for progress."""
+    try:
+        await start_reindex()
+    except ReindexInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "started", "status_url": "/api/v1/admin/reindex"}
+
+
+@router.get("/reindex")
+async def reindex_status(_: User = Depends(require_steward)):
+    """Per-index progress and timings of the running (or last) reindex."""
+    status = await get_reindex_status()
+    if status is None:
+        raise HTTPException(status_code=404, detail="No reindex has run recently")
+    return status
+
+
+@router.get("/search-outbox")
+async def search_outbox_status(db: AsyncSession = Depends(get_db), _: User = Depends(require_steward)):
+    """Changes waiting to reach the search index, and those set aside after repeated failures."""
+    return await outbox_status(db)
+
+
+@router.post("/search-outbox/retry")
+async def retry_search_outbox(db: AsyncSession = Depends(get_db), _: User = Depends(require_admin)):
+    """Requeue the set-aside changes, e.g. once the bad row or index setting is fixed."""
+    return {"requeued": await retry_failed(db)}
+
+
+@router.post("/counters/rebuild")
+async def rebuild_catalog_counters(db: AsyncSession = Depends(get_db), _: User = Depends(require_admin)):
+    """Recount catalog_counters from scratch, e.g. after rows were deleted outside the API."""
+    await rebuild_counters(db)
+    return {"status": "ok", "totals": await get_global_counts(db)}
+
+
+@router.get("/redis")
+async def redis_stats(_: User = Depends(require_steward)):
+    """This worker's Redis pool usage and per-command latency since it started."""
+    return {"pool": pool_stats(), "commands": command_stats()}
 
 
 # ─── Groups ──────────────────────────────────────────────────────────────────
@@ -160,6 +201,8 @@ async def update_group(
         setattr(group, field, value)
     await log_action(db, "group", str(group_id), "update", current_user.id, new_data=changes)
     await db.commit()
+    if "app_role" in changes:
+        await invalidate_all_grants()
     await db.refresh(group)
     count = (await db.execute(
         select(func.count()).select_from(UserGroup).where(UserGroup.group_id == group.id)
@@ -182,6 +225,7 @@ async def delete_group(
     await log_action(db, "group", str(group_id), "delete", current_user.id)
     await db.delete(group)
     await db.commit()
+    await invalidate_all_grants()
 
 
 @router.get("/groups/{group_id}/members", response_model=list[UserGroupOut])
@@ -192,15 +236,16 @@ async def list_group_members(
     group = (await db.execute(select(Group).where(Group.id == group_id))).scalar_one_or_none()
     if group is None:
         raise HTTPException(status_code=404, detail="Group not found")
-    rows = (await db.execute(select(UserGroup).where(UserGroup.group_id == group_id))).scalars().all()
-    items = []
-    for ug in rows:
-        await db.refresh(ug, ["user"])
-        items.append(UserGroupOut(
+    rows = (await db.execute(
+        select(UserGroup).options(*MEMBER_RELATED).where(UserGroup.group_id == group_id)
+    )).scalars().all()
+    return [
+        UserGroupOut(
             id=ug.id, user_id=ug.user_id, user_name=ug.user.name,
             user_email=ug.user.email, synced_at=ug.synced_at,
-        ))
-    return items
+        )
+        for ug in rows
+    ]
 
 
 @router.post("/groups/{group_id}/members", response_model=UserGroupOut, status_code=201)
@@ -222,6 +267,7 @@ async def add_group_member(
     ug = UserGroup(user_id=payload.user_id, group_id=group_id)
     db.add(ug)
     await db.commit()
+    await invalidate_grants(payload.user_id)
     await db.refresh(ug, ["user"])
     return UserGroupOut(
         id=ug.id, user_id=ug.user_id, user_name=ug.user.name,
@@ -241,3 +287,4 @@ async def remove_group_member(
         raise HTTPException(status_code=404, detail="Membership not found")
     await db.delete(ug)
     await db.commit()
+    await invalidate_grants(user_id)
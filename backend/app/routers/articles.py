@@ -1,64 +1,81 @@
 """Articles — process documentation with rich-text body and MinIO file attachments."""
 import uuid
 from datetime import datetime, timezone
+from urllib.parse import quote
 
 import nh3
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_steward
 from app.database import get_db
+from app.etag import NOT_MODIFIED, not_modified, version_etag
+from app.loaders import ARTICLE_RELATED
 from app.models.catalog import Article, ArticleAttachment
 from app.models.user import User
+from app.pagination import CountMode, paginate
+from app.responses import sparse_fields
 from app.schemas.catalog import ArticleCreate, ArticleOut, ArticlePatch, AttachmentOut, PaginatedArticles
 from app.services.audit import log_action
-from app.services.search_sync import sync_article_async, remove_document
-from app.storage import ALLOWED_CONTENT_TYPES, MAX_FILE_SIZE, delete_file, download_url, upload_file
+from app.services.counters import GLOBAL_ID, adjust_counter
+from app.services.search_outbox import enqueue_search_sync
+from app.storage import (
+    ALLOWED_CONTENT_TYPES, MAX_FILE_SIZE, FileTooLargeError, InvalidRangeError,
+    delete_file, download_url, download_urls, open_download, upload_stream, url_window,
+)
 
 router = APIRouter(prefix="/api/v1/articles", tags=["articles"])
 
 ALLOWED_PATCH = {"title", "description", "sme_name", "sme_email", "body", "tags"}
+UPLOAD_READ_SIZE = 1024 * 1024   # bytes read from a spooled multipart file at a time
 
 
-def _att_out(att: ArticleAttachment) -> AttachmentOut:
+def _att_out(att: ArticleAttachment, url: str | None = None) -> AttachmentOut:
     return AttachmentOut(
         id=att.id, article_id=att.article_id, filename=att.filename,
         content_type=att.content_type, file_size=att.file_size, s3_key=att.s3_key,
-        download_url=download_url(att.s3_key), created_at=att.created_at,
+        download_url=url, created_at=att.created_at,
     )
 
 
-def _to_out(a: Article) -> ArticleOut:
+def _to_out(a: Article, urls: dict[str, str] | None = None) -> ArticleOut:
+    """Without ``urls`` attachments carry metadata only (``download_url`` is None)."""
+    urls = urls or {}
     return ArticleOut(
         id=a.id, title=a.title, description=a.description,
         sme_name=a.sme_name, sme_email=a.sme_email, body=a.body,
         tags=a.tags, created_by=a.created_by,
         creator_name=a.creator.name if a.creator else None,
         created_at=a.created_at, updated_at=a.updated_at,
-        attachments=[_att_out(att) for att in a.attachments],
+        attachments=[_att_out(att, urls.get(att.s3_key)) for att in a.attachments],
     )
 
 
+async def _to_out_with_urls(a: Article) -> ArticleOut:
+    return _to_out(a, await download_urls(att.s3_key for att in a.attachments))
+
+
 @router.get("", response_model=PaginatedArticles)
+@sparse_fields(ArticleOut)
 async def list_articles(
     page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     q: str | None = Query(None),
+    cursor: str | None = Query(None), count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     stmt = select(Article).where(Article.deleted_at.is_(None))
-    count_stmt = select(func.count()).select_from(Article).where(Article.deleted_at.is_(None))
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(Article.title.ilike(like_q) | Article.description.ilike(like_q))
-        count_stmt = count_stmt.where(Article.title.ilike(like_q) | Article.description.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    rows = (await db.execute(stmt.order_by(Article.updated_at.desc()).offset((page - 1) * size).limit(size))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["creator", "attachments"])
-        items.append(_to_out(row))
-    return PaginatedArticles(total=total, page=page, size=size, items=items)
+    rows, total, next_cursor = await paginate(
+        db, stmt, sort=(Article.updated_at, Article.id), descending=True,
+        size=size, page=page, cursor=cursor, count=count,
+        counter=None if q else ("global", GLOBAL_ID, "articles"), options=ARTICLE_RELATED,
+    )
+    # Attachment metadata only; the detail view and GET .../attachments/{id} hand out download URLs
+    return PaginatedArticles(total=total, page=page, size=size, items=[_to_out(row) for row in rows], next_cursor=next_cursor)
 
 
 @router.post("", response_model=ArticleOut, status_code=201)
@@ -68,25 +85,50 @@ async def create_article(
 ):
     body = nh3.clean(payload.body) if payload.body else payload.body
     a = Article(
-        title=payload.title, description=payload.description,
+        id=uuid.uuid4(), title=payload.title, description=payload.description,
         sme_name=payload.sme_name, sme_email=payload.sme_email,
         body=body, tags=payload.tags, created_by=current_user.id,
     )
     db.add(a)
     await log_action(db, "article", str(a.id), "create", current_user.id, new_data={"title": a.title})
+    await enqueue_search_sync(db, "articles", a.id)
+    await adjust_counter(db, "articles", 1)
     await db.commit()
     await db.refresh(a, ["creator", "attachments"])
-    await sync_article_async(a)
     return _to_out(a)
 
 
-@router.get("/{article_id}", response_model=ArticleOut)
-async def get_article(article_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    a = (await db.execute(select(Article).where(Article.id == article_id, Article.deleted_at.is_(None)))).scalar_one_or_none()
+@router.get("/{article_id}", response_model=ArticleOut, responses=NOT_MODIFIED)
+async def get_article(
+    article_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
+    version = (await db.execute(
+        select(Article.updated_at, func.count(ArticleAttachment.id), func.max(ArticleAttachment.created_at))
+        .outerjoin(ArticleAttachment, ArticleAttachment.article_id == Article.id)
+        .where(Article.id == article_id, Article.deleted_at.is_(None))
+        .group_by(Article.id)
+    )).one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    updated_at, n_attachments, _latest = version
+    if n_attachments:
+        # Attachment download URLs are presigned and expire, so rotate the ETag
+        # every half-lifetime and skip Last-Modified; a cached body then always
+        # carries URLs with at least half their lifetime left.
+        etag = version_etag("article", article_id, *version, url_window())
+        last_modified = None
+    else:
+        etag, last_modified = version_etag("article", article_id, updated_at), updated_at
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=last_modified)) is not None:
+        return unchanged
+
+    a = (await db.execute(
+        select(Article).options(*ARTICLE_RELATED).where(Article.id == article_id, Article.deleted_at.is_(None))
+    )).scalar_one_or_none()
     if a is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    await db.refresh(a, ["creator", "attachments"])
-    return _to_out(a)
+    return await _to_out_with_urls(a)
 
 
 @router.patch("/{article_id}", response_model=ArticleOut)
@@ -104,10 +146,10 @@ async def patch_article(
     for field, value in changes.items():
         setattr(a, field, value)
     await log_action(db, "article", str(article_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "articles", article_id)
     await db.commit()
     await db.refresh(a, ["creator", "attachments"])
-    await sync_article_async(a)
-    return _to_out(a)
+    return await _to_out_with_urls(a)
 
 
 @router.delete("/{article_id}", status_code=204)
@@ -120,46 +162,107 @@ async def delete_article(
         raise HTTPException(status_code=404, detail="Article not found")
     a.deleted_at = datetime.now(timezone.utc)
     await log_action(db, "article", str(article_id), "delete", current_user.id, old_data={"title": a.title})
+    await enqueue_search_sync(db, "articles", article_id)
+    await adjust_counter(db, "articles", -1)
     await db.commit()
-    remove_document("articles", str(article_id))
 
 
-@router.post("/{article_id}/attachments", response_model=AttachmentOut, status_code=201)
-async def upload_attachment(
-    article_id: uuid.UUID, file: UploadFile,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
-):
+async def _store_attachment(
+    db: AsyncSession, article_id: uuid.UUID, chunks, content_type: str | None, filename: str, user: User,
+) -> AttachmentOut:
     a = (await db.execute(select(Article).where(Article.id == article_id, Article.deleted_at.is_(None)))).scalar_one_or_none()
     if a is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    if file.content_type and file.content_type not in ALLOWED_CONTENT_TYPES:
-        raise HTTPException(status_code=400, detail=f"File type {file.content_type} not allowed")
-    data = await file.read()
-    if len(data) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large (max 50MB)")
-    s3_key = upload_file(data, file.content_type or "application/octet-stream", file.filename or "upload")
+    if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"File type {content_type} not allowed")
+    try:
+        s3_key, size = await upload_stream(chunks, content_type or "application/octet-stream", filename)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     att = ArticleAttachment(
-        article_id=article_id, filename=file.filename or "upload",
-        content_type=file.content_type, file_size=len(data),
-        s3_key=s3_key, uploaded_by=current_user.id,
+        article_id=article_id, filename=filename, content_type=content_type,
+        file_size=size, s3_key=s3_key, uploaded_by=user.id,
     )
     db.add(att)
     await db.commit()
     await db.refresh(att)
-    return _att_out(att)
+    return _att_out(att, await download_url(att.s3_key))
 
 
-@router.get("/{article_id}/attachments/{attachment_id}")
-async def get_attachment_url(
-    article_id: uuid.UUID, attachment_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+async def _read_chunks(file: UploadFile):
+    while chunk := await file.read(UPLOAD_READ_SIZE):
+        yield chunk
+
+
+@router.post("/{article_id}/attachments", response_model=AttachmentOut, status_code=201)
+async def upload_attachment(
+    article_id: uuid.UUID, file: UploadFile,
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+):
+    """Multipart form upload; the spooled file is forwarded to storage part by part."""
+    return await _store_attachment(
+        db, article_id, _read_chunks(file), file.content_type, file.filename or "upload", current_user,
+    )
+
+
+@router.post("/{article_id}/attachments/stream", response_model=AttachmentOut, status_code=201)
+async def upload_attachment_stream(
+    article_id: uuid.UUID, request: Request, filename: str = Query(..., min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
 ):
+    """Raw-body upload (``Content-Type`` is the file's type), piped straight from the request stream."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail=f"File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)")
+    content_type = request.headers.get("content-type", "").split(";")[0].strip() or None
+    return await _store_attachment(db, article_id, request.stream(), content_type, filename, current_user)
+
+
+async def _get_attachment(db: AsyncSession, article_id: uuid.UUID, attachment_id: uuid.UUID) -> ArticleAttachment:
     att = (await db.execute(
         select(ArticleAttachment).where(ArticleAttachment.id == attachment_id, ArticleAttachment.article_id == article_id)
     )).scalar_one_or_none()
     if att is None:
         raise HTTPException(status_code=404, detail="Attachment not found")
-    return {"download_url": download_url(att.s3_key)}
+    return att
+
+
+@router.get("/{article_id}/attachments/{attachment_id}")
+async def get_attachment_url(
+    article_id: uuid.UUID, attachment_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
+    att = await _get_attachment(db, article_id, attachment_id)
+    return {"download_url": await download_url(att.s3_key)}
+
+
+@router.get("/{article_id}/attachments/{attachment_id}/content", responses={206: {"description": "Partial Content"}})
+async def download_attachment(
+    article_id: uuid.UUID, attachment_id: uuid.UUID, request: Request,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
+    """Stream an attachment through the API, honouring a single ``Range: bytes=`` request."""
+    att = await _get_attachment(db, article_id, attachment_id)
+    byte_range = request.headers.get("range")
+    if byte_range and (not byte_range.startswith("bytes=") or "," in byte_range):
+        byte_range = None   # multi-range and other units: send the whole file, as RFC 9110 allows
+    try:
+        obj, body = await open_download(att.s3_key, byte_range)
+    except InvalidRangeError:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{att.file_size or 0}"})
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(obj["ContentLength"]),
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(att.filename)}",
+    }
+    if obj.get("ETag"):
+        headers["ETag"] = obj["ETag"]
+    status = 200
+    if obj.get("ContentRange"):
+        status, headers["Content-Range"] = 206, obj["ContentRange"]
+    media_type = att.content_type or obj.get("ContentType") or "application/octet-stream"
+    return StreamingResponse(body, status_code=status, media_type=media_type, headers=headers)
 
 
 @router.delete("/{article_id}/attachments/{attachment_id}", status_code=204)
@@ -167,11 +270,7 @@ async def delete_attachment(
     article_id: uuid.UUID, attachment_id: uuid.UUID,
     db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
 ):
-    att = (await db.execute(
-        select(ArticleAttachment).where(ArticleAttachment.id == attachment_id, ArticleAttachment.article_id == article_id)
-    )).scalar_one_or_none()
-    if att is None:
-        raise HTTPException(status_code=404, detail="Attachment not found")
-    delete_file(att.s3_key)
+    att = await _get_attachment(db, article_id, attachment_id)
+    await delete_file(att.s3_key)
     await db.delete(att)
     await db.commit()
@@ -12,12 +12,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, resolve_sso_role
 from app.auth.jwt import create_access_token, decode_access_token
+from app.auth.revocation import revoke_token
+from app.cache import cache_user_delete
 from app.config import settings
 from app.database import get_db
-from app.middleware.rate_limit import limiter
+from app.middleware.rate_limit import RateLimit
 from app.models.group import Group, UserGroup
 from app.models.user import User
-from app.redis_client import blacklist_token, cache_user_delete
+from app.services.permissions import invalidate_grants
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -223,6 +225,7 @@ async def callback(provider: str, request: Request, db: AsyncSession = Depends(g
     user.last_login = datetime.now(timezone.utc)
     await db.commit()
     await cache_user_delete(str(user.id))
+    await invalidate_grants(user.id)
 
     access_token = create_access_token({"sub": str(user.id), "role": user.role})
     redirect_url = f"{settings.frontend_url}/auth/callback?token={access_token}"
@@ -251,16 +254,15 @@ async def logout(current_user: User = Depends(get_current_user), request: Reques
             if jti:
                 import time
                 ttl = max(int(exp - time.time()), 1)
-                await blacklist_token(jti, ttl)
+                await revoke_token(jti, ttl)
         except Exception:
             pass
     await cache_user_delete(str(current_user.id))
     return {"message": "Logged out"}
 
 
-@router.post("/login")
-@limiter.limit("10/minute")
-async def local_login(body: LocalLoginRequest, request: Request, db: AsyncSession = Depends(get_db)):
+@router.post("/login", dependencies=[Depends(RateLimit("login", settings.rate_limit_login))])
+async def local_login(body: LocalLoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == body.email))
     user = result.scalar_one_or_none()
 
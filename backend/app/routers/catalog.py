@@ -1,63 +1,69 @@
 """Browse and enrichment endpoints for catalog metadata."""
+import json
 import uuid
 
 import nh3
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import String, cast, func, literal, null, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.auth.dependencies import get_current_user, require_steward
-from app.database import get_db
+from app.cache import bump_version, cached, get_or_load, get_version
+from app.database import AsyncSessionLocal, get_db
+from app.etag import NOT_MODIFIED, conditional_response, make_etag, not_modified, version_etag
 from app.models.catalog import Column, DbConnection, Schema, Table
 from app.models.user import User
+from app.pagination import CountMode, paginate
+from app.responses import FastJSONResponse, sparse_fields
 from app.schemas.catalog import (
-    BreadcrumbContext, ColumnOut, ColumnPatch, ColumnWithContext,
+    BreadcrumbContext, CatalogTree, ColumnOut, ColumnPatch, ColumnWithContext,
     DbConnectionOut, DbConnectionPatch,
     PaginatedColumns, PaginatedDbConnections, PaginatedSchemas, PaginatedTables,
     SchemaPatch, SchemaOut,
     TableOut, TablePatch, TableWithContext,
 )
-from app.redis_client import cache_delete_pattern, cache_get, cache_set
 from app.services.audit import log_action
-from app.services.search_sync import sync_database_async, sync_column_async, sync_schema_async, sync_table_async
+from app.services.counters import GLOBAL_ID, counter_value
+from app.services.search_outbox import enqueue_search_sync
 
-router = APIRouter(prefix="/api/v1", tags=["catalog"])
+router = APIRouter(prefix="/api/v1", tags=["catalog"], default_response_class=FastJSONResponse)
 
 ALLOWED_DB_PATCH = {"description", "tags"}
 ALLOWED_SCHEMA_PATCH = {"description", "tags", "title"}
 ALLOWED_TABLE_PATCH = {"description", "tags", "title", "sme_name", "sme_email"}
 ALLOWED_COLUMN_PATCH = {"description", "tags", "title"}
 
+LIST_CACHE_TTL = 120
+LIST_CACHE_STALE_TTL = 60
+
 
 # ─── Databases ────────────────────────────────────────────────────────────────
 
 @router.get("/databases", response_model=PaginatedDbConnections)
+@cached("list:dbs:p{page}:s{size}:q{q}:d{include_deleted}:c{cursor}:n{count}",
+        ttl=LIST_CACHE_TTL, stale_ttl=LIST_CACHE_STALE_TTL, versions=("dbs",))
 async def list_databases(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     q: str = Query(None),
     include_deleted: bool = Query(False),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    cache_key = f"list:dbs:p{page}:s{size}:q{q}:d{include_deleted}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
     stmt = select(DbConnection)
-    count_stmt = select(func.count()).select_from(DbConnection)
     if not include_deleted:
         stmt = stmt.where(DbConnection.deleted_at.is_(None))
-        count_stmt = count_stmt.where(DbConnection.deleted_at.is_(None))
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(DbConnection.name.ilike(like_q) | DbConnection.description.ilike(like_q))
-        count_stmt = count_stmt.where(DbConnection.name.ilike(like_q) | DbConnection.description.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    items = (await db.execute(stmt.order_by(DbConnection.name.asc()).offset((page - 1) * size).limit(size))).scalars().all()
-    return PaginatedDbConnections(total=total, page=page, size=size, items=list(items))
+    items, total, next_cursor = await paginate(
+        db, stmt, sort=(DbConnection.name, DbConnection.id), size=size, page=page, cursor=cursor, count=count,
+        counter=None if q or include_deleted else ("global", GLOBAL_ID, "databases"),
+    )
+    return PaginatedDbConnections(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
 @router.get("/databases/{db_id}", response_model=DbConnectionOut)
@@ -84,38 +90,37 @@ async def patch_database(
     for field, value in changes.items():
         setattr(row, field, value)
     await log_action(db, "database", str(db_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "databases", db_id)
     await db.commit()
     await db.refresh(row)
-    await sync_database_async(row)
-    await cache_delete_pattern("list:dbs:*")
+    await bump_version("dbs")
     return row
 
 
 # ─── Schemas ──────────────────────────────────────────────────────────────────
 
 @router.get("/databases/{db_id}/schemas", response_model=PaginatedSchemas)
+@cached("list:schemas:{db_id}:p{page}:s{size}:q{q}:d{include_deleted}:c{cursor}:n{count}",
+        ttl=LIST_CACHE_TTL, stale_ttl=LIST_CACHE_STALE_TTL, versions=("schemas:{db_id}",))
 async def list_schemas(
     db_id: uuid.UUID, page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     q: str = Query(None),
     include_deleted: bool = Query(False),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
-    cache_key = f"list:schemas:{db_id}:p{page}:s{size}:d{include_deleted}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
     base = Schema.connection_id == db_id
     filters = [base] if include_deleted else [base, Schema.deleted_at.is_(None)]
     stmt = select(Schema).where(*filters)
-    count_stmt = select(func.count()).select_from(Schema).where(*filters)
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(Schema.name.ilike(like_q) | Schema.description.ilike(like_q))
-        count_stmt = count_stmt.where(Schema.name.ilike(like_q) | Schema.description.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    items = (await db.execute(stmt.order_by(Schema.name.asc()).offset((page - 1) * size).limit(size))).scalars().all()
-    return PaginatedSchemas(total=total, page=page, size=size, items=list(items))
+    items, total, next_cursor = await paginate(
+        db, stmt, sort=(Schema.name, Schema.id), size=size, page=page, cursor=cursor, count=count,
+        counter=None if q or include_deleted else ("database", db_id, "schemas"),
+    )
+    return PaginatedSchemas(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
 @router.get("/schemas/{schema_id}", response_model=SchemaOut)
@@ -131,14 +136,9 @@ async def patch_schema(
     schema_id: uuid.UUID, patch: SchemaPatch,
     db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
 ):
-    row = (await db.execute(
-        select(Schema)
-        .where(Schema.id == schema_id, Schema.deleted_at.is_(None))
-        .options(selectinload(Schema.connection))
-    )).scalar_one_or_none()
+    row = (await db.execute(select(Schema).where(Schema.id == schema_id, Schema.deleted_at.is_(None)))).scalar_one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Schema not found")
-    _db_name = row.connection.name
     changes = {k: v for k, v in patch.model_dump(exclude_unset=True).items() if k in ALLOWED_SCHEMA_PATCH}
     if "description" in changes and changes["description"]:
         changes["description"] = nh3.clean(changes["description"])
@@ -146,46 +146,52 @@ async def patch_schema(
     for field, value in changes.items():
         setattr(row, field, value)
     await log_action(db, "schema", str(schema_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "schemas", schema_id)
     await db.commit()
     await db.refresh(row)
-    await sync_schema_async(row, db_name=_db_name)
-    await cache_delete_pattern("list:schemas:*")
+    await bump_version(f"schemas:{row.connection_id}")
     return row
 
 
 # ─── Tables ───────────────────────────────────────────────────────────────────
 
 @router.get("/schemas/{schema_id}/tables", response_model=PaginatedTables)
+@sparse_fields(TableOut)
+@cached("list:tables:{schema_id}:p{page}:s{size}:q{q}:d{include_deleted}:c{cursor}:n{count}",
+        ttl=LIST_CACHE_TTL, stale_ttl=LIST_CACHE_STALE_TTL, versions=("tables:{schema_id}",))
 async def list_tables(
     schema_id: uuid.UUID, page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     q: str = Query(None),
     include_deleted: bool = Query(False),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
-    cache_key = f"list:tables:{schema_id}:p{page}:s{size}:q{q}:d{include_deleted}"
-    cached = await cache_get(cache_key)
-    if cached:
-        return cached
-
     filters = [Table.schema_id == schema_id]
     if not include_deleted:
         filters.append(Table.deleted_at.is_(None))
     stmt = select(Table).where(*filters)
-    count_stmt = select(func.count()).select_from(Table).where(*filters)
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(Table.name.ilike(like_q) | Table.description.ilike(like_q))
-        count_stmt = count_stmt.where(Table.name.ilike(like_q) | Table.description.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    items = (await db.execute(stmt.order_by(Table.name.asc()).offset((page - 1) * size).limit(size))).scalars().all()
-    return PaginatedTables(total=total, page=page, size=size, items=list(items))
+    items, total, next_cursor = await paginate(
+        db, stmt, sort=(Table.name, Table.id), size=size, page=page, cursor=cursor, count=count,
+        counter=None if q or include_deleted else ("schema", schema_id, "tables"),
+    )
+    return PaginatedTables(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
-@router.get("/tables/{table_id}", response_model=TableOut)
-async def get_table(table_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
+@router.get("/tables/{table_id}", response_model=TableOut, responses=NOT_MODIFIED)
+async def get_table(
+    table_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
     row = (await db.execute(select(Table).where(Table.id == table_id))).scalar_one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Table not found")
+    etag = version_etag("table", row.id, row.updated_at)
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=row.updated_at)) is not None:
+        return unchanged
     return row
 
 
@@ -194,16 +200,9 @@ async def patch_table(
     table_id: uuid.UUID, patch: TablePatch,
     db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
 ):
-    row = (await db.execute(
-        select(Table)
-        .where(Table.id == table_id, Table.deleted_at.is_(None))
-        .options(selectinload(Table.schema).selectinload(Schema.connection))
-    )).scalar_one_or_none()
+    row = (await db.execute(select(Table).where(Table.id == table_id, Table.deleted_at.is_(None)))).scalar_one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Table not found")
-    _schema_name = row.schema.name
-    _db_name = row.schema.connection.name
-    _connection_id = str(row.schema.connection_id)
     changes = {k: v for k, v in patch.model_dump(exclude_unset=True).items() if k in ALLOWED_TABLE_PATCH}
     if "description" in changes and changes["description"]:
         changes["description"] = nh3.clean(changes["description"])
@@ -211,34 +210,46 @@ async def patch_table(
     for field, value in changes.items():
         setattr(row, field, value)
     await log_action(db, "table", str(table_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "tables", table_id)
     await db.commit()
     await db.refresh(row)
-    await sync_table_async(row, db_name=_db_name, schema_name=_schema_name, connection_id=_connection_id)
-    await cache_delete_pattern("list:tables:*")
+    await bump_version(f"tables:{row.schema_id}")
     return row
 
 
 # ─── Columns ──────────────────────────────────────────────────────────────────
 
 @router.get("/tables/{table_id}/columns", response_model=PaginatedColumns)
+@sparse_fields(ColumnOut)
 async def list_columns(
     table_id: uuid.UUID, page: int = Query(1, ge=1), size: int = Query(100, ge=1, le=500),
     include_deleted: bool = Query(False),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     filters = [Column.table_id == table_id]
     if not include_deleted:
         filters.append(Column.deleted_at.is_(None))
-    total = (await db.execute(select(func.count()).select_from(Column).where(*filters))).scalar_one()
-    items = (await db.execute(select(Column).where(*filters).order_by(Column.name).offset((page - 1) * size).limit(size))).scalars().all()
-    return PaginatedColumns(total=total, page=page, size=size, items=list(items))
+    items, total, next_cursor = await paginate(
+        db, select(Column).where(*filters), sort=(Column.name, Column.id),
+        size=size, page=page, cursor=cursor, count=count,
+        counter=None if include_deleted else ("table", table_id, "columns"),
+    )
+    return PaginatedColumns(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
-@router.get("/columns/{column_id}", response_model=ColumnOut)
-async def get_column(column_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
+@router.get("/columns/{column_id}", response_model=ColumnOut, responses=NOT_MODIFIED)
+async def get_column(
+    column_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
     row = (await db.execute(select(Column).where(Column.id == column_id, Column.deleted_at.is_(None)))).scalar_one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Column not found")
+    etag = version_etag("column", row.id, row.updated_at)
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=row.updated_at)) is not None:
+        return unchanged
     return row
 
 
@@ -247,19 +258,9 @@ async def patch_column(
     column_id: uuid.UUID, patch: ColumnPatch,
     db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
 ):
-    row = (await db.execute(
-        select(Column)
-        .where(Column.id == column_id, Column.deleted_at.is_(None))
-        .options(selectinload(Column.table).selectinload(Table.schema).selectinload(Schema.connection))
-    )).scalar_one_or_none()
+    row = (await db.execute(select(Column).where(Column.id == column_id, Column.deleted_at.is_(None)))).scalar_one_or_none()
     if row is None:
         raise HTTPException(status_code=404, detail="Column not found")
-    # Capture sync metadata before commit (relationships expire after session flush)
-    _table_name = row.table.name
-    _schema_name = row.table.schema.name
-    _db_name = row.table.schema.connection.name
-    _connection_id = str(row.table.schema.connection_id)
-    _schema_id = str(row.table.schema_id)
     changes = {k: v for k, v in patch.model_dump(exclude_unset=True).items() if k in ALLOWED_COLUMN_PATCH}
     if "description" in changes and changes["description"]:
         changes["description"] = nh3.clean(changes["description"])
@@ -267,19 +268,32 @@ async def patch_column(
     for field, value in changes.items():
         setattr(row, field, value)
     await log_action(db, "column", str(column_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "columns", column_id)
     await db.commit()
     await db.refresh(row)
-    await sync_column_async(row, db_name=_db_name, schema_name=_schema_name, table_name=_table_name,
-                           connection_id=_connection_id, schema_id=_schema_id)
     return row
 
 
 # ─── Context Endpoints (waterfall elimination) ──────────────────────────────
 
-@router.get("/tables/{table_id}/context", response_model=TableWithContext)
+@router.get("/tables/{table_id}/context", response_model=TableWithContext, responses=NOT_MODIFIED)
 async def get_table_context(
-    table_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+    table_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
+    # One cheap join answers revalidations before the full breadcrumb load
+    versions = (await db.execute(
+        select(Table.updated_at, Schema.updated_at, DbConnection.updated_at)
+        .join(Schema, Schema.id == Table.schema_id)
+        .join(DbConnection, DbConnection.id == Schema.connection_id)
+        .where(Table.id == table_id)
+    )).one_or_none()
+    if versions is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+    etag = version_etag("table-context", table_id, *versions)
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=max(versions))) is not None:
+        return unchanged
+
     row = (await db.execute(
         select(Table)
         .where(Table.id == table_id)
@@ -296,10 +310,24 @@ async def get_table_context(
     )
 
 
-@router.get("/columns/{column_id}/context", response_model=ColumnWithContext)
+@router.get("/columns/{column_id}/context", response_model=ColumnWithContext, responses=NOT_MODIFIED)
 async def get_column_context(
-    column_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+    column_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
+    versions = (await db.execute(
+        select(Column.updated_at, Table.updated_at, Schema.updated_at, DbConnection.updated_at)
+        .join(Table, Table.id == Column.table_id)
+        .join(Schema, Schema.id == Table.schema_id)
+        .join(DbConnection, DbConnection.id == Schema.connection_id)
+        .where(Column.id == column_id)
+    )).one_or_none()
+    if versions is None:
+        raise HTTPException(status_code=404, detail="Column not found")
+    etag = version_etag("column-context", column_id, *versions)
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=max(versions))) is not None:
+        return unchanged
+
     row = (await db.execute(
         select(Column)
         .where(Column.id == column_id)
@@ -315,3 +343,100 @@ async def get_column_context(
         ),
         table=TableOut.model_validate(row.table),
     )
+
+
+# ─── Sidebar Tree ─────────────────────────────────────────────────────────────
+
+TREE_MAX_DEPTH = 3        # databases → schemas → tables
+TREE_CACHE_TTL = 600      # ingest bumps the "tree" version, so this only bounds memory
+
+# (level, kind, model, parent FK, detail column, child FK, child counter)
+_TREE_LEVELS = (
+    (1, "database", DbConnection, None, DbConnection.db_type, Schema.connection_id, "schemas"),
+    (2, "schema", Schema, Schema.connection_id, None, Table.schema_id, "tables"),
+    (3, "table", Table, Table.schema_id, Table.object_type, Column.table_id, "columns"),
+)
+
+
+def _tree_level_stmt(level, kind, model, parent_fk, detail, child_fk, child_counter, db_id, include_deleted):
+    if include_deleted:
+        # Counters only track live rows, so count deleted ones the slow way
+        child_count = select(func.count()).where(child_fk == model.id).scalar_subquery()
+    else:
+        child_count = func.coalesce(counter_value(kind, model.id, child_counter), 0)
+    stmt = select(
+        literal(level).label("level"),
+        literal(kind).label("kind"),
+        model.id.label("id"),
+        (parent_fk if parent_fk is not None else cast(null(), model.id.type)).label("parent_id"),
+        model.name.label("name"),
+        (detail if detail is not None else cast(null(), String)).label("detail"),
+        child_count.label("child_count"),
+        model.deleted_at.is_not(None).label("deleted"),
+    )
+    if not include_deleted:
+        stmt = stmt.where(model.deleted_at.is_(None))
+    if db_id is not None:
+        if model is DbConnection:
+            stmt = stmt.where(DbConnection.id == db_id)
+        elif model is Schema:
+            stmt = stmt.where(Schema.connection_id == db_id)
+        else:
+            stmt = stmt.where(Table.schema_id.in_(select(Schema.id).where(Schema.connection_id == db_id)))
+    return stmt
+
+
+async def _load_tree(db: AsyncSession, depth: int, db_id: uuid.UUID | None, include_deleted: bool) -> list[dict]:
+    """All requested levels in one UNION ALL, child counts included, assembled parent-first."""
+    levels = union_all(*(
+        _tree_level_stmt(*spec, db_id, include_deleted) for spec in _TREE_LEVELS[:depth]
+    )).subquery()
+    rows = (await db.execute(
+        select(levels).order_by(levels.c.level, levels.c.name, levels.c.id)
+    )).all()
+
+    roots: list[dict] = []
+    nodes: dict[uuid.UUID, dict] = {}
+    for r in rows:
+        node = {"id": str(r.id), "name": r.name, "type": r.kind, "child_count": r.child_count}
+        if r.detail is not None:
+            node["db_type" if r.kind == "database" else "object_type"] = r.detail
+        if r.deleted:
+            node["deleted"] = True
+        if r.level < depth:
+            node["children"] = []
+        if r.level == 1:
+            roots.append(node)
+        else:
+            parent = nodes.get(r.parent_id)
+            if parent is None:
+                continue  # parent filtered out (e.g. soft-deleted)
+            parent["children"].append(node)
+        nodes[r.id] = node
+    return roots
+
+
+@router.get("/tree", response_model=CatalogTree, responses=NOT_MODIFIED)
+async def get_catalog_tree(
+    request: Request,
+    depth: int = Query(2, ge=1, le=TREE_MAX_DEPTH),
+    db_id: uuid.UUID | None = Query(None),
+    include_deleted: bool = Query(False),
+    _: User = Depends(get_current_user),
+):
+    """The database → schema → table hierarchy down to ``depth``, for the sidebar.
+
+    The rendered body and its strong ETag are cached until the next ingest, so
+    a repeat load with ``If-None-Match`` is answered ``304`` without touching
+    the database.
+    """
+    key = f"tree:d{depth}:r{db_id}:x{include_deleted}:v{await get_version('tree')}"
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            items = await _load_tree(db, depth, db_id, include_deleted)
+        body = json.dumps({"depth": depth, "items": items}, separators=(",", ":"))
+        return {"etag": make_etag(body.encode()), "body": body}
+
+    entry = await get_or_load(key, load, ttl=TREE_CACHE_TTL)
+    return conditional_response(request, entry["body"].encode(), entry["etag"])
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
 from app.database import get_db
+from app.loaders import COMMENT_RELATED
 from app.models.social import Comment
 from app.models.user import User
 from app.schemas.social import CommentCreate, CommentOut
@@ -22,18 +23,18 @@ async def list_comments(
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     rows = (await db.execute(
-        select(Comment).where(Comment.entity_type == entity_type, Comment.entity_id == entity_id, Comment.deleted_at.is_(None))
+        select(Comment).options(*COMMENT_RELATED)
+        .where(Comment.entity_type == entity_type, Comment.entity_id == entity_id, Comment.deleted_at.is_(None))
         .order_by(Comment.created_at.desc())
     )).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["user"])
-        items.append(CommentOut(
+    return [
+        CommentOut(
             id=row.id, entity_type=row.entity_type, entity_id=row.entity_id,
             user_id=row.user_id, user_name=row.user.name if row.user else None,
             body=row.body, created_at=row.created_at, updated_at=row.updated_at,
-        ))
-    return items
+        )
+        for row in rows
+    ]
 
 
 @router.post("/{entity_type}/{entity_id}", response_model=CommentOut, status_code=201)
@@ -0,0 +1,177 @@
+"""Batch lookup of mixed catalog entities by (entity_type, entity_id)."""
+import uuid
+from collections import defaultdict
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user
+from app.database import get_db
+from app.models.catalog import Article, Column, DbConnection, Query, Schema, Table
+from app.models.glossary import GlossaryTerm
+from app.models.user import User
+from app.schemas.catalog import EntityBatchRequest, EntityBatchResponse, EntityRef, EntitySummary
+
+router = APIRouter(prefix="/api/v1/entities", tags=["entities"])
+
+MAX_BATCH_KEYS = 500
+
+
+def _ref(entity_type: str, id_, name) -> EntityRef:
+    return EntityRef(entity_type=entity_type, id=id_, name=name)
+
+
+# ─── Per-type loaders (one IN-list query each) ───────────────────────────────
+
+async def _load_databases(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(DbConnection.id, DbConnection.name, DbConnection.description, DbConnection.deleted_at)
+        .where(DbConnection.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="database", id=r.id, name=r.name, description=r.description, deleted=r.deleted_at is not None,
+    ) for r in rows}
+
+
+async def _load_schemas(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(
+            Schema.id, Schema.name, Schema.title, Schema.description, Schema.deleted_at,
+            DbConnection.id.label("db_id"), DbConnection.name.label("db_name"),
+        )
+        .join(DbConnection, DbConnection.id == Schema.connection_id)
+        .where(Schema.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="schema", id=r.id, name=r.name, title=r.title, description=r.description,
+        deleted=r.deleted_at is not None,
+        breadcrumb=[_ref("database", r.db_id, r.db_name)],
+    ) for r in rows}
+
+
+async def _load_tables(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(
+            Table.id, Table.name, Table.title, Table.description, Table.object_type, Table.deleted_at,
+            Schema.id.label("schema_id"), Schema.name.label("schema_name"),
+            DbConnection.id.label("db_id"), DbConnection.name.label("db_name"),
+        )
+        .join(Schema, Schema.id == Table.schema_id)
+        .join(DbConnection, DbConnection.id == Schema.connection_id)
+        .where(Table.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="table", id=r.id, name=r.name, title=r.title, description=r.description,
+        object_type=r.object_type, deleted=r.deleted_at is not None,
+        breadcrumb=[_ref("database", r.db_id, r.db_name), _ref("schema", r.schema_id, r.schema_name)],
+    ) for r in rows}
+
+
+async def _load_columns(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(
+            Column.id, Column.name, Column.title, Column.description, Column.data_type, Column.deleted_at,
+            Table.id.label("table_id"), Table.name.label("table_name"),
+            Schema.id.label("schema_id"), Schema.name.label("schema_name"),
+            DbConnection.id.label("db_id"), DbConnection.name.label("db_name"),
+        )
+        .join(Table, Table.id == Column.table_id)
+        .join(Schema, Schema.id == Table.schema_id)
+        .join(DbConnection, DbConnection.id == Schema.connection_id)
+        .where(Column.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="column", id=r.id, name=r.name, title=r.title, description=r.description,
+        data_type=r.data_type, deleted=r.deleted_at is not None,
+        breadcrumb=[
+            _ref("database", r.db_id, r.db_name),
+            _ref("schema", r.schema_id, r.schema_name),
+            _ref("table", r.table_id, r.table_name),
+        ],
+    ) for r in rows}
+
+
+async def _load_queries(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(
+            Query.id, Query.name, Query.description, Query.deleted_at,
+            DbConnection.id.label("db_id"), DbConnection.name.label("db_name"),
+        )
+        .outerjoin(DbConnection, DbConnection.id == Query.connection_id)
+        .where(Query.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="query", id=r.id, name=r.name, description=r.description, deleted=r.deleted_at is not None,
+        breadcrumb=[_ref("database", r.db_id, r.db_name)] if r.db_id else [],
+    ) for r in rows}
+
+
+async def _load_articles(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(Article.id, Article.title, Article.description, Article.deleted_at).where(Article.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="article", id=r.id, name=r.title, title=r.title, description=r.description,
+        deleted=r.deleted_at is not None,
+    ) for r in rows}
+
+
+async def _load_glossary(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, EntitySummary]:
+    rows = (await db.execute(
+        select(GlossaryTerm.id, GlossaryTerm.name, GlossaryTerm.definition, GlossaryTerm.deleted_at)
+        .where(GlossaryTerm.id.in_(ids))
+    )).all()
+    return {r.id: EntitySummary(
+        entity_type="glossary", id=r.id, name=r.name, description=r.definition, deleted=r.deleted_at is not None,
+    ) for r in rows}
+
+
+_LOADERS = {
+    "database": _load_databases,
+    "schema": _load_schemas,
+    "table": _load_tables,
+    "column": _load_columns,
+    "query": _load_queries,
+    "article": _load_articles,
+    "glossary": _load_glossary,
+}
+
+
+# ─── Endpoint ────────────────────────────────────────────────────────────────
+
+@router.post("/batch", response_model=EntityBatchResponse)
+async def batch_entities(
+    payload: EntityBatchRequest,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
+    """Resolve favorites, trending and notification targets in one round trip.
+
+    Keys of unknown types, malformed ids and missing rows come back as ``None``;
+    soft-deleted entities are returned with ``deleted: true``.
+    """
+    if len(payload.keys) > MAX_BATCH_KEYS:
+        raise HTTPException(status_code=400, detail=f"Max {MAX_BATCH_KEYS} keys per batch")
+
+    wanted: dict[str, set[uuid.UUID]] = defaultdict(set)
+    for k in payload.keys:
+        if k.entity_type not in _LOADERS:
+            continue
+        try:
+            wanted[k.entity_type].add(uuid.UUID(k.entity_id))
+        except ValueError:
+            continue
+
+    found: dict[tuple[str, uuid.UUID], EntitySummary] = {}
+    for entity_type, ids in wanted.items():
+        for id_, summary in (await _LOADERS[entity_type](db, list(ids))).items():
+            found[(entity_type, id_)] = summary
+
+    results: dict[str, EntitySummary | None] = {}
+    for k in payload.keys:
+        try:
+            key = (k.entity_type, uuid.UUID(k.entity_id))
+        except ValueError:
+            key = None
+        results[f"{k.entity_type}:{k.entity_id}"] = found.get(key)
+    return EntityBatchResponse(results=results)
@@ -2,20 +2,24 @@
 import uuid
 
 import nh3
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_steward
 from app.database import get_db
+from app.etag import NOT_MODIFIED, not_modified, version_etag
+from app.loaders import TERM_RELATED
 from app.models.glossary import GlossaryTerm, TermLink
 from app.models.user import User
+from app.pagination import CountMode, paginate
 from app.schemas.glossary import (
     GlossaryTermCreate, GlossaryTermOut, GlossaryTermPatch,
     PaginatedGlossaryTerms, TermLinkCreate, TermLinkOut,
 )
 from app.services.audit import log_action
-from app.services.search_sync import sync_glossary_term_async, remove_document
+from app.services.counters import GLOBAL_ID, adjust_counter
+from app.services.search_outbox import enqueue_search_sync
 
 router = APIRouter(prefix="/api/v1/glossary", tags=["glossary"])
 
@@ -35,21 +39,18 @@ def _to_out(t: GlossaryTerm) -> GlossaryTermOut:
 async def list_terms(
     page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     q: str | None = Query(None),
+    cursor: str | None = Query(None), count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     stmt = select(GlossaryTerm).where(GlossaryTerm.deleted_at.is_(None))
-    count_stmt = select(func.count()).select_from(GlossaryTerm).where(GlossaryTerm.deleted_at.is_(None))
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(GlossaryTerm.name.ilike(like_q) | GlossaryTerm.definition.ilike(like_q))
-        count_stmt = count_stmt.where(GlossaryTerm.name.ilike(like_q) | GlossaryTerm.definition.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    rows = (await db.execute(stmt.order_by(GlossaryTerm.name).offset((page - 1) * size).limit(size))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["owner", "creator", "links"])
-        items.append(_to_out(row))
-    return PaginatedGlossaryTerms(total=total, page=page, size=size, items=items)
+    rows, total, next_cursor = await paginate(
+        db, stmt, sort=(GlossaryTerm.name, GlossaryTerm.id), size=size, page=page, cursor=cursor, count=count,
+        counter=None if q else ("global", GLOBAL_ID, "glossary_terms"), options=TERM_RELATED,
+    )
+    return PaginatedGlossaryTerms(total=total, page=page, size=size, items=[_to_out(row) for row in rows], next_cursor=next_cursor)
 
 
 @router.post("", response_model=GlossaryTermOut, status_code=201)
@@ -59,23 +60,41 @@ async def create_term(
 ):
     definition = nh3.clean(payload.definition) if payload.definition else payload.definition
     term = GlossaryTerm(
-        name=payload.name, definition=definition, tags=payload.tags,
+        id=uuid.uuid4(), name=payload.name, definition=definition, tags=payload.tags,
         status=payload.status, owner_id=current_user.id, created_by=current_user.id,
     )
     db.add(term)
     await log_action(db, "glossary_term", str(term.id), "create", current_user.id, new_data={"name": term.name})
+    await enqueue_search_sync(db, "glossary", term.id)
+    await adjust_counter(db, "glossary_terms", 1)
     await db.commit()
     await db.refresh(term, ["owner", "creator", "links"])
-    await sync_glossary_term_async(term)
     return _to_out(term)
 
 
-@router.get("/{term_id}", response_model=GlossaryTermOut)
-async def get_term(term_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    term = (await db.execute(select(GlossaryTerm).where(GlossaryTerm.id == term_id, GlossaryTerm.deleted_at.is_(None)))).scalar_one_or_none()
+@router.get("/{term_id}", response_model=GlossaryTermOut, responses=NOT_MODIFIED)
+async def get_term(
+    term_id: uuid.UUID, request: Request, response: Response,
+    db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
+):
+    version = (await db.execute(
+        select(GlossaryTerm.updated_at, func.count(TermLink.id), func.max(TermLink.created_at))
+        .outerjoin(TermLink, TermLink.term_id == GlossaryTerm.id)
+        .where(GlossaryTerm.id == term_id, GlossaryTerm.deleted_at.is_(None))
+        .group_by(GlossaryTerm.id)
+    )).one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Term not found")
+    last_modified = max(t for t in (version[0], version[2]) if t is not None)
+    etag = version_etag("glossary", term_id, *version)
+    if (unchanged := not_modified(request, response, etag=etag, last_modified=last_modified)) is not None:
+        return unchanged
+
+    term = (await db.execute(
+        select(GlossaryTerm).options(*TERM_RELATED).where(GlossaryTerm.id == term_id, GlossaryTerm.deleted_at.is_(None))
+    )).scalar_one_or_none()
     if term is None:
         raise HTTPException(status_code=404, detail="Term not found")
-    await db.refresh(term, ["owner", "creator", "links"])
     return _to_out(term)
 
 
@@ -94,9 +113,9 @@ async def patch_term(
     for field, value in changes.items():
         setattr(term, field, value)
     await log_action(db, "glossary_term", str(term_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "glossary", term_id)
     await db.commit()
     await db.refresh(term, ["owner", "creator", "links"])
-    await sync_glossary_term_async(term)
     return _to_out(term)
 
 
@@ -111,8 +130,9 @@ async def delete_term(
         raise HTTPException(status_code=404, detail="Term not found")
     term.deleted_at = datetime.now(timezone.utc)
     await log_action(db, "glossary_term", str(term_id), "delete", current_user.id, old_data={"name": term.name})
+    await enqueue_search_sync(db, "glossary", term_id)
+    await adjust_counter(db, "glossary_terms", -1)
     await db.commit()
-    remove_document("glossary", str(term_id))
 
 
 @router.post("/{term_id}/links", response_model=TermLinkOut, status_code=201)
@@ -1,13 +1,16 @@
 """Governance — data classifications, approval workflows."""
+import contextlib
 import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_steward
 from app.database import get_db
+from app.loaders import APPROVAL_RELATED, PERMISSION_RELATED, STEWARD_RELATED
+from app.models.catalog import Column, Table
 from app.models.governance import ApprovalRequest, DataClassification, Endorsement, ResourcePermission
 from app.models.user import User
 from sqlalchemy.orm import selectinload
@@ -20,9 +23,25 @@ from app.schemas.governance import (
     StewardAssign, StewardOut,
 )
 from app.services.audit import log_action
+from app.services.permissions import effective_role, invalidate_grants, outranks
+from app.services.search_outbox import enqueue_search_sync
 
 router = APIRouter(prefix="/api/v1/governance", tags=["governance"])
 
+# Entity types whose search documents carry their classification level: search index, model
+CLASSIFIED_INDEXES = {"table": ("tables", Table), "column": ("columns", Column)}
+
+
+async def _require_entity_steward(user: User, entity_type: str, entity_id: str) -> str:
+    """403 unless the user stewards the entity: app-wide, via a group, or by a grant on it or an ancestor.
+
+    Returns the user's effective role there, which caps the roles they may grant or revoke.
+    """
+    role = await effective_role(user, entity_type, entity_id)
+    if outranks("steward", role):
+        raise HTTPException(status_code=403, detail="Steward role required")
+    return role
+
 
 # ─── Classifications ─────────────────────────────────────────────────────────
 
@@ -48,8 +67,9 @@ async def get_classification(
 @router.put("/classifications", response_model=ClassificationOut)
 async def set_classification(
     payload: ClassificationCreate,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    await _require_entity_steward(current_user, payload.entity_type, payload.entity_id)
     valid_levels = {"public", "internal", "confidential", "restricted"}
     if payload.level not in valid_levels:
         raise HTTPException(status_code=400, detail=f"Level must be one of {valid_levels}")
@@ -68,6 +88,16 @@ async def set_classification(
         )
         db.add(row)
     await log_action(db, "classification", payload.entity_id, "update", current_user.id, new_data={"level": payload.level})
+    if payload.entity_type in CLASSIFIED_INDEXES:
+        index_name, model = CLASSIFIED_INDEXES[payload.entity_type]
+        # The level is part of the entity's search document, so this counts as
+        # a change to the entity: a running reindex replays rows by updated_at
+        with contextlib.suppress(ValueError):
+            await db.execute(
+                update(model).where(model.id == uuid.UUID(payload.entity_id))
+                .values(updated_at=datetime.now(timezone.utc))
+            )
+        await enqueue_search_sync(db, index_name, payload.entity_id)
     await db.commit()
     await db.refresh(row, ["classifier"])
     return ClassificationOut(
@@ -92,11 +122,11 @@ async def list_approvals(
         stmt = stmt.where(ApprovalRequest.status == status_filter)
         count_stmt = count_stmt.where(ApprovalRequest.status == status_filter)
     total = (await db.execute(count_stmt)).scalar_one()
-    rows = (await db.execute(stmt.order_by(ApprovalRequest.created_at.desc()).offset((page - 1) * size).limit(size))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["requester", "reviewer"])
-        items.append(ApprovalOut(
+    rows = (await db.execute(
+        stmt.options(*APPROVAL_RELATED).order_by(ApprovalRequest.created_at.desc()).offset((page - 1) * size).limit(size)
+    )).scalars().all()
+    items = [
+        ApprovalOut(
             id=row.id, entity_type=row.entity_type, entity_id=row.entity_id,
             action=row.action, requested_by=row.requested_by,
             requester_name=row.requester.name if row.requester else None,
@@ -105,7 +135,9 @@ async def list_approvals(
             status=row.status, proposed_changes=row.proposed_changes,
             review_comment=row.review_comment, created_at=row.created_at,
             reviewed_at=row.reviewed_at,
-        ))
+        )
+        for row in rows
+    ]
     return PaginatedApprovals(total=total, page=page, size=size, items=items)
 
 
@@ -134,11 +166,12 @@ async def create_approval(
 @router.post("/approvals/{approval_id}/review", response_model=ApprovalOut)
 async def review_approval(
     approval_id: uuid.UUID, review: ApprovalReview,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
     req = (await db.execute(select(ApprovalRequest).where(ApprovalRequest.id == approval_id))).scalar_one_or_none()
     if req is None:
         raise HTTPException(status_code=404, detail="Approval request not found")
+    await _require_entity_steward(current_user, req.entity_type, req.entity_id)
     if req.status != "pending":
         raise HTTPException(status_code=400, detail="Already reviewed")
     if review.status not in ("approved", "rejected"):
@@ -169,24 +202,36 @@ async def list_permissions(
     db: AsyncSession = Depends(get_db), _: User = Depends(require_steward),
 ):
     rows = (await db.execute(
-        select(ResourcePermission).where(ResourcePermission.entity_type == entity_type, ResourcePermission.entity_id == entity_id)
+        select(ResourcePermission).options(*PERMISSION_RELATED)
+        .where(ResourcePermission.entity_type == entity_type, ResourcePermission.entity_id == entity_id)
     )).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["user", "granter"])
-        items.append(ResourcePermissionOut(
+    return [
+        ResourcePermissionOut(
             id=row.id, user_id=row.user_id, user_name=row.user.name if row.user else None,
             entity_type=row.entity_type, entity_id=row.entity_id, role=row.role,
             granted_by=row.granted_by, created_at=row.created_at,
-        ))
-    return items
+        )
+        for row in rows
+    ]
+
+
+@router.get("/permissions/effective/{entity_type}/{entity_id}")
+async def get_effective_role(
+    entity_type: str, entity_id: str, current_user: User = Depends(get_current_user),
+):
+    """The current user's role on an entity, including group roles and grants inherited from its ancestors."""
+    role = await effective_role(current_user, entity_type, entity_id)
+    return {"entity_type": entity_type, "entity_id": entity_id, "role": role}
 
 
 @router.post("/permissions", response_model=ResourcePermissionOut, status_code=201)
 async def grant_permission(
     payload: ResourcePermissionCreate,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    own_role = await _require_entity_steward(current_user, payload.entity_type, payload.entity_id)
+    if outranks(payload.role, own_role):
+        raise HTTPException(status_code=403, detail=f"Cannot grant a role above your own ({own_role})")
     perm = ResourcePermission(
         user_id=payload.user_id, entity_type=payload.entity_type,
         entity_id=payload.entity_id, role=payload.role,
@@ -194,6 +239,7 @@ async def grant_permission(
     )
     db.add(perm)
     await db.commit()
+    await invalidate_grants(perm.user_id)
     await db.refresh(perm, ["user", "granter"])
     return ResourcePermissionOut(
         id=perm.id, user_id=perm.user_id, user_name=perm.user.name if perm.user else None,
@@ -205,13 +251,17 @@ async def grant_permission(
 @router.delete("/permissions/{perm_id}", status_code=204)
 async def revoke_permission(
     perm_id: uuid.UUID, db: AsyncSession = Depends(get_db),
-    _: User = Depends(require_steward),
+    current_user: User = Depends(get_current_user),
 ):
     perm = (await db.execute(select(ResourcePermission).where(ResourcePermission.id == perm_id))).scalar_one_or_none()
     if perm is None:
         raise HTTPException(status_code=404, detail="Permission not found")
+    own_role = await _require_entity_steward(current_user, perm.entity_type, perm.entity_id)
+    if outranks(perm.role, own_role):
+        raise HTTPException(status_code=403, detail=f"Cannot revoke a role above your own ({own_role})")
     await db.delete(perm)
     await db.commit()
+    await invalidate_grants(perm.user_id)
 
 
 # ─── User Lookup (for steward/admin assignment dropdowns) ──────────────────
@@ -227,48 +277,34 @@ async def list_users_for_assignment(
 
 # ─── Stewardship ────────────────────────────────────────────────────────────
 
-async def _is_steward_or_admin(db: AsyncSession, user: User, entity_type: str, entity_id: str) -> bool:
-    if user.role == "admin":
-        return True
-    perm = (await db.execute(
-        select(ResourcePermission).where(
-            ResourcePermission.user_id == user.id,
-            ResourcePermission.entity_type == entity_type,
-            ResourcePermission.entity_id == entity_id,
-            ResourcePermission.role == "steward",
-        )
-    )).scalar_one_or_none()
-    return perm is not None
-
-
 @router.get("/stewards/{entity_type}/{entity_id}", response_model=list[StewardOut])
 async def get_stewards(
     entity_type: str, entity_id: str,
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     rows = (await db.execute(
-        select(ResourcePermission).where(
+        select(ResourcePermission).options(*STEWARD_RELATED).where(
             ResourcePermission.entity_type == entity_type,
             ResourcePermission.entity_id == entity_id,
             ResourcePermission.role == "steward",
         )
     )).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["user"])
-        items.append(StewardOut(
+    return [
+        StewardOut(
             id=row.id, user_id=row.user_id, user_name=row.user.name,
             user_email=row.user.email, entity_type=row.entity_type,
             entity_id=row.entity_id, created_at=row.created_at,
-        ))
-    return items
+        )
+        for row in rows
+    ]
 
 
 @router.post("/stewards", response_model=StewardOut, status_code=201)
 async def assign_steward(
     payload: StewardAssign,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    await _require_entity_steward(current_user, payload.entity_type, payload.entity_id)
     # Check user exists
     target_user = (await db.execute(select(User).where(User.id == payload.user_id))).scalar_one_or_none()
     if target_user is None:
@@ -291,6 +327,7 @@ async def assign_steward(
     )
     db.add(perm)
     await db.commit()
+    await invalidate_grants(perm.user_id)
     await db.refresh(perm, ["user"])
     return StewardOut(
         id=perm.id, user_id=perm.user_id, user_name=perm.user.name,
@@ -302,8 +339,9 @@ async def assign_steward(
 @router.delete("/stewards/{entity_type}/{entity_id}/{user_id}", status_code=204)
 async def remove_steward(
     entity_type: str, entity_id: str, user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    await _require_entity_steward(current_user, entity_type, entity_id)
     perm = (await db.execute(
         select(ResourcePermission).where(
             ResourcePermission.user_id == user_id,
@@ -316,6 +354,7 @@ async def remove_steward(
         raise HTTPException(status_code=404, detail="Steward assignment not found")
     await db.delete(perm)
     await db.commit()
+    await invalidate_grants(user_id)
 
 
 # ─── Endorsements ───────────────────────────────────────────────────────────
@@ -345,8 +384,9 @@ async def get_endorsement(
 @router.put("/endorsements", response_model=EndorsementOut)
 async def set_endorsement(
     payload: EndorsementCreate,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    await _require_entity_steward(current_user, payload.entity_type, payload.entity_id)
     if payload.status not in VALID_ENDORSEMENT_STATUSES:
         raise HTTPException(status_code=400, detail=f"Status must be one of {VALID_ENDORSEMENT_STATUSES}")
     if payload.status in ("warned", "deprecated") and not payload.comment:
@@ -380,8 +420,9 @@ async def set_endorsement(
 @router.delete("/endorsements/{entity_type}/{entity_id}", status_code=204)
 async def remove_endorsement(
     entity_type: str, entity_id: str,
-    db: AsyncSession = Depends(get_db), current_user: User = Depends(require_steward),
+    db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user),
 ):
+    await _require_entity_steward(current_user, entity_type, entity_id)
     row = (await db.execute(
         select(Endorsement).where(Endorsement.entity_type == entity_type, Endorsement.entity_id == entity_id)
     )).scalar_one_or_none()
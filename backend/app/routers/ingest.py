@@ -1,5 +1,6 @@
 """Metadata ingestion endpoints — protected by API key."""
 import uuid
+from collections import Counter
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -8,12 +9,16 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_ingest_api_key
+from app.cache import bump_version
+from app.config import settings
 from app.database import get_db
+from app.middleware.rate_limit import RateLimit, client_api_key
 from app.models.catalog import Column, DbConnection, Schema, Table, TableLineage
 from app.models.governance import ResourcePermission
 from app.models.user import User
 from app.schemas.catalog import IngestBatchPayload, IngestBatchResult, LineageEdgeCreate
-from app.services.search_sync import sync_column_async, sync_database_async, sync_schema_async, sync_table_async
+from app.services.counters import apply_counter_deltas, track
+from app.services.search_outbox import enqueue_search_sync, enqueue_search_sync_many
 
 router = APIRouter(prefix="/api/v1/ingest", tags=["ingest"], dependencies=[Depends(require_ingest_api_key)])
 
@@ -47,23 +52,34 @@ async def _assign_stewards(db: AsyncSession, entity_type: str, entity_id: str, e
         ))
 
 
-@router.post("/batch", response_model=IngestBatchResult)
+@router.post(
+    "/batch", response_model=IngestBatchResult,
+    dependencies=[Depends(RateLimit("ingest:batch", settings.rate_limit_ingest_batch, key=client_api_key))],
+)
 async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(get_db)):
     if len(payload.schemas) > MAX_SCHEMAS:
         raise HTTPException(status_code=400, detail=f"Max {MAX_SCHEMAS} schemas per batch")
 
+    # Signed live-row count changes, applied to catalog_counters just before commit
+    counts = Counter()
+
     result = await db.execute(select(DbConnection).where(DbConnection.name == payload.database.name))
     db_conn = result.scalar_one_or_none()
     if db_conn is None:
         db_conn = DbConnection(id=uuid.uuid4(), **payload.database.model_dump())
         db.add(db_conn)
+        track(counts, "databases", 1)
     else:
         db_conn.db_type = payload.database.db_type
+        if db_conn.deleted_at is not None:
+            track(counts, "databases", 1)
         db_conn.deleted_at = None
 
     await db.flush()
 
     schemas_upserted = tables_upserted = columns_upserted = 0
+    # Every touched or soft-deleted entity id, per search index
+    changed: dict[str, set] = {"schemas": set(), "tables": set(), "columns": set()}
 
     for schema_payload in payload.schemas:
         if len(schema_payload.tables) > MAX_TABLES_PER_SCHEMA:
@@ -76,13 +92,17 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                 title=schema_payload.title, description=schema_payload.description,
             )
             db.add(schema)
+            track(counts, "schemas", 1, database=db_conn.id)
         else:
             if schema_payload.title is not None:
                 schema.title = schema_payload.title
             if schema_payload.description is not None:
                 schema.description = schema_payload.description
+            if schema.deleted_at is not None:
+                track(counts, "schemas", 1, database=db_conn.id)
             schema.deleted_at = None
         schemas_upserted += 1
+        changed["schemas"].add(schema.id)
         await db.flush()
 
         if schema_payload.steward_emails:
@@ -101,6 +121,7 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                     view_definition=table_payload.view_definition,
                 )
                 db.add(table)
+                track(counts, "tables", 1, database=db_conn.id, schema=schema.id)
             else:
                 if table_payload.title is not None:
                     table.title = table_payload.title
@@ -110,8 +131,11 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                     table.row_count = table_payload.row_count
                 table.object_type = table_payload.object_type
                 table.view_definition = table_payload.view_definition
+                if table.deleted_at is not None:
+                    track(counts, "tables", 1, database=db_conn.id, schema=schema.id)
                 table.deleted_at = None
             tables_upserted += 1
+            changed["tables"].add(table.id)
             await db.flush()
 
             if table_payload.steward_emails:
@@ -130,6 +154,8 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                         col.title = col_payload.title
                     if col_payload.description is not None:
                         col.description = col_payload.description
+                    if col.deleted_at is not None:
+                        track(counts, "columns", 1, database=db_conn.id, schema=schema.id, table=table.id)
                     col.deleted_at = None
                 else:
                     col = Column(
@@ -139,7 +165,11 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                         title=col_payload.title, description=col_payload.description,
                     )
                     db.add(col)
+                    # A repeated name in the payload updates this row rather than inserting a second
+                    existing_cols[col.name] = col
+                    track(counts, "columns", 1, database=db_conn.id, schema=schema.id, table=table.id)
                 columns_upserted += 1
+                changed["columns"].add(col.id)
 
     # Mark missing objects as deleted if requested
     if payload.mark_missing_as_deleted:
@@ -153,17 +183,23 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
         for s in all_schemas:
             if s.name not in ingested_schema_names:
                 s.deleted_at = now
+                changed["schemas"].add(s.id)
+                track(counts, "schemas", -1, database=db_conn.id)
                 # Also mark all tables/columns under this schema as deleted
                 all_tables = (await db.execute(
                     select(Table).where(Table.schema_id == s.id, Table.deleted_at.is_(None))
                 )).scalars().all()
                 for t in all_tables:
                     t.deleted_at = now
+                    changed["tables"].add(t.id)
+                    track(counts, "tables", -1, database=db_conn.id, schema=s.id)
                     all_cols = (await db.execute(
                         select(Column).where(Column.table_id == t.id, Column.deleted_at.is_(None))
                     )).scalars().all()
                     for c in all_cols:
                         c.deleted_at = now
+                        changed["columns"].add(c.id)
+                        track(counts, "columns", -1, database=db_conn.id, schema=s.id, table=t.id)
 
         # For each ingested schema, mark missing tables
         for schema_payload in payload.schemas:
@@ -179,11 +215,15 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
             for t in all_tables:
                 if t.name not in ingested_table_names:
                     t.deleted_at = now
+                    changed["tables"].add(t.id)
+                    track(counts, "tables", -1, database=db_conn.id, schema=schema_row.id)
                     all_cols = (await db.execute(
                         select(Column).where(Column.table_id == t.id, Column.deleted_at.is_(None))
                     )).scalars().all()
                     for c in all_cols:
                         c.deleted_at = now
+                        changed["columns"].add(c.id)
+                        track(counts, "columns", -1, database=db_conn.id, schema=schema_row.id, table=t.id)
 
             # For each ingested table, mark missing columns
             for table_payload in schema_payload.tables:
@@ -199,29 +239,18 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
                 for c in all_cols:
                     if c.name not in ingested_col_names:
                         c.deleted_at = now
+                        changed["columns"].add(c.id)
+                        track(counts, "columns", -1, database=db_conn.id, schema=schema_row.id, table=table_row.id)
 
+    # Queue search sync in the same transaction so the index can never miss a committed change
+    await enqueue_search_sync(db, "databases", db_conn.id)
+    for index_name, ids in changed.items():
+        await enqueue_search_sync_many(db, index_name, ids)
+    await apply_counter_deltas(db, counts)
     await db.commit()
 
-    # Sync all ingested entities to Meilisearch
-    try:
-        await sync_database_async(db_conn)
-        for schema_payload in payload.schemas:
-            result = await db.execute(select(Schema).where(Schema.connection_id == db_conn.id, Schema.name == schema_payload.name))
-            schema = result.scalar_one_or_none()
-            if schema is None:
-                continue
-            await sync_schema_async(schema, db_name=db_conn.name)
-            for table_payload in schema_payload.tables:
-                result = await db.execute(select(Table).where(Table.schema_id == schema.id, Table.name == table_payload.name))
-                table = result.scalar_one_or_none()
-                if table is None:
-                    continue
-                await sync_table_async(table, db_name=db_conn.name, schema_name=schema.name, connection_id=str(db_conn.id))
-                cols = (await db.execute(select(Column).where(Column.table_id == table.id))).scalars().all()
-                for col in cols:
-                    await sync_column_async(col, db_name=db_conn.name, schema_name=schema.name, table_name=table.name, connection_id=str(db_conn.id), schema_id=str(schema.id))
-    except Exception:
-        pass
+    # Every touched table sits under a touched schema, so this covers all affected list pages
+    await bump_version("dbs", "tree", f"schemas:{db_conn.id}", *(f"tables:{sid}" for sid in changed["schemas"]))
 
     return IngestBatchResult(
         database_id=db_conn.id, schemas_upserted=schemas_upserted,
@@ -229,7 +258,10 @@ async def ingest_batch(payload: IngestBatchPayload, db: AsyncSession = Depends(g
     )
 
 
-@router.post("/lineage", status_code=200)
+@router.post(
+    "/lineage", status_code=200,
+    dependencies=[Depends(RateLimit("ingest:lineage", settings.rate_limit_ingest_lineage, key=client_api_key))],
+)
 async def ingest_lineage(edges: list[LineageEdgeCreate], db: AsyncSession = Depends(get_db)):
     if not edges:
         return {"inserted": 0}
@@ -20,9 +20,10 @@ from app.schemas.catalog import (
     LineageNode,
     LineageTableSearchResult,
 )
+from app.responses import FastJSONResponse
 from app.services.audit import log_action
 
-router = APIRouter(prefix="/api/v1", tags=["lineage"])
+router = APIRouter(prefix="/api/v1", tags=["lineage"], default_response_class=FastJSONResponse)
 
 MAX_BFS_NODES = 500
 
@@ -162,7 +163,7 @@ async def expand_lineage_node(
 ):
     nodes = await _bfs(db_name, table_name, levels, db, direction)
     await _mark_has_more(nodes, db)
-    return nodes
+    return FastJSONResponse(nodes)
 
 
 @router.get("/tables/{table_id}/lineage", response_model=LineageGraph)
@@ -174,7 +175,8 @@ async def get_table_lineage(
     upstream = await _bfs(db_name, table_name, levels, db, "upstream")
     downstream = await _bfs(db_name, table_name, levels, db, "downstream")
     await _mark_has_more(upstream + downstream, db)
-    return LineageGraph(upstream=upstream, downstream=downstream, current_db=db_name, current_table=table_name)
+    # Nested trees: serialize once, skipping the response_model re-validation
+    return FastJSONResponse(LineageGraph(upstream=upstream, downstream=downstream, current_db=db_name, current_table=table_name))
 
 
 @router.post("/lineage", response_model=LineageEdgeOut, status_code=status.HTTP_201_CREATED)
@@ -4,16 +4,20 @@ from datetime import datetime, timezone
 
 import nh3
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user, require_steward
 from app.database import get_db
+from app.loaders import QUERY_RELATED
 from app.models.catalog import DbConnection, Query as QueryModel
 from app.models.user import User
+from app.pagination import CountMode, paginate
+from app.responses import sparse_fields
 from app.schemas.catalog import PaginatedQueries, QueryCreate, QueryOut, QueryPatch
 from app.services.audit import log_action
-from app.services.search_sync import sync_query_async, remove_document
+from app.services.counters import GLOBAL_ID, adjust_counter
+from app.services.search_outbox import enqueue_search_sync
 
 router = APIRouter(prefix="/api/v1/queries", tags=["queries"])
 
@@ -33,27 +37,25 @@ def _to_out(q: QueryModel) -> QueryOut:
 
 
 @router.get("", response_model=PaginatedQueries)
+@sparse_fields(QueryOut)
 async def list_queries(
     page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
     db_id: uuid.UUID | None = Query(None), q: str | None = Query(None),
+    cursor: str | None = Query(None), count: CountMode = Query("exact"),
     db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user),
 ):
     stmt = select(QueryModel).where(QueryModel.deleted_at.is_(None))
-    count_stmt = select(func.count()).select_from(QueryModel).where(QueryModel.deleted_at.is_(None))
     if db_id:
         stmt = stmt.where(QueryModel.connection_id == db_id)
-        count_stmt = count_stmt.where(QueryModel.connection_id == db_id)
     if q:
         like_q = f"%{q}%"
         stmt = stmt.where(QueryModel.name.ilike(like_q) | QueryModel.description.ilike(like_q))
-        count_stmt = count_stmt.where(QueryModel.name.ilike(like_q) | QueryModel.description.ilike(like_q))
-    total = (await db.execute(count_stmt)).scalar_one()
-    rows = (await db.execute(stmt.order_by(QueryModel.updated_at.desc()).offset((page - 1) * size).limit(size))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["connection", "creator"])
-        items.append(_to_out(row))
-    return PaginatedQueries(total=total, page=page, size=size, items=items)
+    rows, total, next_cursor = await paginate(
+        db, stmt, sort=(QueryModel.updated_at, QueryModel.id), descending=True,
+        size=size, page=page, cursor=cursor, count=count,
+        counter=None if db_id or q else ("global", GLOBAL_ID, "queries"), options=QUERY_RELATED,
+    )
+    return PaginatedQueries(total=total, page=page, size=size, items=[_to_out(row) for row in rows], next_cursor=next_cursor)
 
 
 @router.post("", response_model=QueryOut, status_code=201)
@@ -67,24 +69,26 @@ async def create_query(
             raise HTTPException(status_code=404, detail="Database not found")
     desc = nh3.clean(payload.description) if payload.description else payload.description
     q = QueryModel(
-        name=payload.name, description=desc, connection_id=payload.connection_id,
+        id=uuid.uuid4(), name=payload.name, description=desc, connection_id=payload.connection_id,
         sme_name=payload.sme_name, sme_email=payload.sme_email,
         sql_text=payload.sql_text, created_by=current_user.id,
     )
     db.add(q)
     await log_action(db, "query", str(q.id), "create", current_user.id, new_data={"name": q.name})
+    await enqueue_search_sync(db, "queries", q.id)
+    await adjust_counter(db, "queries", 1)
     await db.commit()
     await db.refresh(q, ["connection", "creator"])
-    await sync_query_async(q)
     return _to_out(q)
 
 
 @router.get("/{query_id}", response_model=QueryOut)
 async def get_query(query_id: uuid.UUID, db: AsyncSession = Depends(get_db), _: User = Depends(get_current_user)):
-    q = (await db.execute(select(QueryModel).where(QueryModel.id == query_id, QueryModel.deleted_at.is_(None)))).scalar_one_or_none()
+    q = (await db.execute(
+        select(QueryModel).options(*QUERY_RELATED).where(QueryModel.id == query_id, QueryModel.deleted_at.is_(None))
+    )).scalar_one_or_none()
     if q is None:
         raise HTTPException(status_code=404, detail="Query not found")
-    await db.refresh(q, ["connection", "creator"])
     return _to_out(q)
 
 
@@ -107,9 +111,9 @@ async def patch_query(
     for field, value in changes.items():
         setattr(q, field, value)
     await log_action(db, "query", str(query_id), "update", current_user.id, old_data, changes)
+    await enqueue_search_sync(db, "queries", query_id)
     await db.commit()
     await db.refresh(q, ["connection", "creator"])
-    await sync_query_async(q)
     return _to_out(q)
 
 
@@ -123,5 +127,6 @@ async def delete_query(
         raise HTTPException(status_code=404, detail="Query not found")
     q.deleted_at = datetime.now(timezone.utc)
     await log_action(db, "query", str(query_id), "delete", current_user.id, old_data={"name": q.name})
+    await enqueue_search_sync(db, "queries", query_id)
+    await adjust_counter(db, "queries", -1)
     await db.commit()
-    remove_document("queries", str(query_id))
@@ -2,17 +2,20 @@
 from typing import Literal
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.auth.dependencies import get_current_user
+from app.config import settings
 from app.database import get_db
+from app.middleware.rate_limit import UserRateLimit
 from app.models.user import User
-from app.redis_client import cache_get, cache_set
+from app.responses import FastJSONResponse
 from app.schemas.catalog import SearchResponse, SearchResult
-from app.search_engine import multi_search, INDEXES
+from app.search_engine import FACET_ATTRS, multi_search, INDEXES
+from app.services.counters import get_global_counts
 
-router = APIRouter(prefix="/api/v1", tags=["search"])
+router = APIRouter(prefix="/api/v1", tags=["search"], default_response_class=FastJSONResponse)
 
 EntityType = Literal["all", "database", "schema", "table", "column", "query", "article", "glossary"]
 
@@ -29,16 +32,41 @@ INDEX_MAP = {
 # Reverse map: index uid -> entity type (rstrip("s") fails for "queries" → "querie")
 INDEX_TO_ENTITY = {v: k for k, v in INDEX_MAP.items()}
 
+# Meilisearch document attribute -> facet name in the API response
+FACET_NAMES = {
+    "db_name": "database",
+    "schema_name": "schema",
+    "object_type": "object_type",
+    "tags": "tags",
+    "classification": "classification",
+}
+
 
-@router.get("/search", response_model=SearchResponse)
+@router.get(
+    "/search", response_model=SearchResponse,
+    dependencies=[Depends(UserRateLimit("search", settings.rate_limit_search))],
+)
 async def search(
     q: str = Query(..., min_length=1),
     type: EntityType = Query("all"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    database: str | None = Query(None, description="Database name"),
+    schema: str | None = Query(None, description="Schema name"),
+    object_type: str | None = Query(None, description="table, view, materialized_view, ..."),
+    tags: list[str] = Query([], description="Match any of these tags"),
+    classification: str | None = Query(None, description="public, internal, confidential, restricted"),
+    facets: bool = Query(False, description="Include facet distribution counts"),
     _: User = Depends(get_current_user),
 ):
     offset = (page - 1) * size
+    filters = {
+        "db_name": [database] if database else [],
+        "schema_name": [schema] if schema else [],
+        "object_type": [object_type] if object_type else [],
+        "tags": tags,
+        "classification": [classification] if classification else [],
+    }
 
     if type == "all":
         target_indexes = INDEXES
@@ -47,17 +75,27 @@ async def search(
         target_indexes = [idx] if idx else INDEXES
 
     try:
-        result = multi_search(q, target_indexes, limit=size, offset=offset)
+        result = await run_in_threadpool(
+            multi_search, q, target_indexes, limit=size, offset=offset,
+            filters=filters, facets=FACET_ATTRS if facets else None,
+        )
     except Exception:
         return SearchResponse(total=0, page=page, size=size, results=[])
 
     results = []
     total = 0
+    facet_counts: dict[str, dict[str, int]] = {}
     for idx_result in result.get("results", []):
         index_uid = idx_result.get("indexUid", "")
         entity_type = INDEX_TO_ENTITY.get(index_uid, index_uid)
         estimated_total = idx_result.get("estimatedTotalHits", 0)
         total += estimated_total
+        if facets:
+            facet_counts.setdefault("entity_type", {})[entity_type] = estimated_total
+            for attr, dist in (idx_result.get("facetDistribution") or {}).items():
+                merged = facet_counts.setdefault(FACET_NAMES.get(attr, attr), {})
+                for value, count in dist.items():
+                    merged[value] = merged.get(value, 0) + count
 
         for hit in idx_result.get("hits", []):
             name = hit.get("name") or hit.get("title", "")
@@ -83,7 +121,7 @@ async def search(
                 schema_id=hit.get("schema_id"),
             ))
 
-    return SearchResponse(total=total, page=page, size=size, results=results)
+    return FastJSONResponse(SearchResponse(total=total, page=page, size=size, results=results, facets=facet_counts))
 
 
 @router.get("/stats")
@@ -91,21 +129,5 @@ async def stats(
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    cached = await cache_get("stats")
-    if cached:
-        return cached
-
-    row = (await db.execute(text("""
-        SELECT
-            (SELECT COUNT(*) FROM db_connections WHERE deleted_at IS NULL) AS databases,
-            (SELECT COUNT(*) FROM schemas WHERE deleted_at IS NULL) AS schemas,
-            (SELECT COUNT(*) FROM tables WHERE deleted_at IS NULL) AS tables,
-            (SELECT COUNT(*) FROM columns WHERE deleted_at IS NULL) AS columns,
-            (SELECT COUNT(*) FROM queries WHERE deleted_at IS NULL) AS queries,
-            (SELECT COUNT(*) FROM articles WHERE deleted_at IS NULL) AS articles,
-            (SELECT COUNT(*) FROM glossary_terms WHERE deleted_at IS NULL) AS glossary_terms
-    """))).mappings().one()
-
-    result = dict(row)
-    await cache_set("stats", result, ttl=60)
-    return result
+    # Maintained by the writers (see app/services/counters.py), so this is one PK range read
+    return await get_global_counts(db)
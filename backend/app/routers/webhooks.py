@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_steward
 from app.database import get_db
+from app.loaders import WEBHOOK_RELATED
 from app.models.user import User
 from app.models.webhooks import Webhook, WebhookEvent
 from app.schemas.webhooks import (
@@ -19,17 +20,18 @@ router = APIRouter(prefix="/api/v1/webhooks", tags=["webhooks"])
 
 @router.get("", response_model=list[WebhookOut])
 async def list_webhooks(db: AsyncSession = Depends(get_db), _: User = Depends(require_steward)):
-    rows = (await db.execute(select(Webhook).order_by(Webhook.created_at.desc()))).scalars().all()
-    items = []
-    for row in rows:
-        await db.refresh(row, ["creator"])
-        items.append(WebhookOut(
+    rows = (await db.execute(
+        select(Webhook).options(*WEBHOOK_RELATED).order_by(Webhook.created_at.desc())
+    )).scalars().all()
+    return [
+        WebhookOut(
             id=row.id, name=row.name, url=row.url, events=row.events,
             is_active=row.is_active, created_by=row.created_by,
             creator_name=row.creator.name if row.creator else None,
             created_at=row.created_at,
-        ))
-    return items
+        )
+        for row in rows
+    ]
 
 
 @router.post("", response_model=WebhookOut, status_code=201)
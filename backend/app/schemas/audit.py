@@ -20,7 +20,8 @@ class AuditLogOut(BaseModel):
 
 
 class PaginatedAuditLogs(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[AuditLogOut]
+    next_cursor: str | None = None
@@ -146,6 +146,57 @@ class ColumnWithContext(ColumnOut):
     table: TableOut
 
 
+# ─── Sidebar tree ────────────────────────────────────────────────────────────
+
+class TreeNode(BaseModel):
+    id: uuid.UUID
+    name: str
+    type: str                          # database | schema | table
+    object_type: str | None = None     # tables only: table | view | ...
+    db_type: str | None = None         # databases only
+    child_count: int
+    deleted: bool = False
+    children: list["TreeNode"] | None = None   # omitted below the requested depth
+
+
+class CatalogTree(BaseModel):
+    depth: int
+    items: list[TreeNode]
+
+
+# ─── Batch entity lookup ─────────────────────────────────────────────────────
+
+class EntityKey(BaseModel):
+    entity_type: str
+    entity_id: str
+
+
+class EntityBatchRequest(BaseModel):
+    keys: list[EntityKey]
+
+
+class EntityRef(BaseModel):
+    entity_type: str
+    id: uuid.UUID
+    name: str
+
+
+class EntitySummary(BaseModel):
+    entity_type: str
+    id: uuid.UUID
+    name: str
+    title: str | None = None
+    description: str | None = None
+    object_type: str | None = None     # tables
+    data_type: str | None = None       # columns
+    deleted: bool = False
+    breadcrumb: list[EntityRef] = []   # database → schema → table above the entity
+
+
+class EntityBatchResponse(BaseModel):
+    results: dict[str, EntitySummary | None]   # "entity_type:entity_id" → summary, None if not found
+
+
 # ─── Ingest payload ──────────────────────────────────────────────────────────
 
 class IngestColumn(BaseModel):
@@ -209,6 +260,8 @@ class SearchResponse(BaseModel):
     page: int
     size: int
     results: list[SearchResult]
+    # facet -> value -> hit count, summed across indexes; only filled when requested
+    facets: dict[str, dict[str, int]] = {}
 
 
 # ─── Query ───────────────────────────────────────────────────────────────────
@@ -249,10 +302,11 @@ class QueryOut(BaseModel):
 
 
 class PaginatedQueries(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[QueryOut]
+    next_cursor: str | None = None
 
 
 # ─── Article ─────────────────────────────────────────────────────────────────
@@ -306,10 +360,11 @@ class ArticleOut(BaseModel):
 
 
 class PaginatedArticles(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[ArticleOut]
+    next_cursor: str | None = None
 
 
 # ─── Lineage ─────────────────────────────────────────────────────────────────
@@ -381,28 +436,32 @@ class LineageGraph(BaseModel):
 # ─── Pagination ──────────────────────────────────────────────────────────────
 
 class PaginatedDbConnections(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[DbConnectionOut]
+    next_cursor: str | None = None
 
 
 class PaginatedSchemas(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[SchemaOut]
+    next_cursor: str | None = None
 
 
 class PaginatedTables(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[TableOut]
+    next_cursor: str | None = None
 
 
 class PaginatedColumns(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[ColumnOut]
+    next_cursor: str | None = None
@@ -45,10 +45,11 @@ class GlossaryTermOut(BaseModel):
 
 
 class PaginatedGlossaryTerms(BaseModel):
-    total: int
+    total: int | None
     page: int
     size: int
     items: list[GlossaryTermOut]
+    next_cursor: str | None = None
 
 
 class TermLinkCreate(BaseModel):
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -67,11 +68,14 @@ class PaginatedApprovals(BaseModel):
 
 # ─── Resource Permissions ────────────────────────────────────────────────────
 
+GrantRole = Literal["viewer", "editor", "steward", "admin"]
+
+
 class ResourcePermissionCreate(BaseModel):
     user_id: uuid.UUID
     entity_type: str
     entity_id: str
-    role: str
+    role: GrantRole
 
 
 class ResourcePermissionOut(BaseModel):
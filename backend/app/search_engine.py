@@ -1,9 +1,13 @@
 import meilisearch
+from meilisearch.errors import MeilisearchApiError
 
 from app.config import settings
 
 _client: meilisearch.Client | None = None
 
+# Full reindexes build into "<index>_shadow" and are swapped live when complete
+SHADOW_SUFFIX = "_shadow"
+
 INDEXES = ["databases", "schemas", "tables", "columns", "queries", "articles", "glossary"]
 
 # Mapping from index name to singular entity type
@@ -28,15 +32,18 @@ SEARCHABLE_ATTRS = {
 }
 
 FILTERABLE_ATTRS = {
-    "databases": ["entity_type"],
-    "schemas": ["entity_type", "connection_id"],
-    "tables": ["entity_type", "schema_id", "object_type"],
-    "columns": ["entity_type", "table_id"],
-    "queries": ["entity_type", "connection_id"],
-    "articles": ["entity_type"],
-    "glossary": ["entity_type", "status"],
+    "databases": ["entity_type", "db_name", "tags"],
+    "schemas": ["entity_type", "connection_id", "db_name", "schema_name", "tags"],
+    "tables": ["entity_type", "schema_id", "connection_id", "db_name", "schema_name", "object_type", "tags", "classification"],
+    "columns": ["entity_type", "table_id", "schema_id", "connection_id", "db_name", "schema_name", "tags", "classification"],
+    "queries": ["entity_type", "connection_id", "db_name"],
+    "articles": ["entity_type", "tags"],
+    "glossary": ["entity_type", "status", "tags"],
 }
 
+# Attributes the search API can filter and facet on
+FACET_ATTRS = ["db_name", "schema_name", "object_type", "tags", "classification"]
+
 
 def get_client() -> meilisearch.Client:
     global _client
@@ -45,6 +52,15 @@ def get_client() -> meilisearch.Client:
     return _client
 
 
+def _index_settings(index_name: str) -> dict:
+    body = {}
+    if index_name in SEARCHABLE_ATTRS:
+        body["searchableAttributes"] = SEARCHABLE_ATTRS[index_name]
+    if index_name in FILTERABLE_ATTRS:
+        body["filterableAttributes"] = FILTERABLE_ATTRS[index_name]
+    return body
+
+
 def init_indexes() -> None:
     client = get_client()
     for idx in INDEXES:
@@ -52,11 +68,61 @@ def init_indexes() -> None:
             client.create_index(idx, {"primaryKey": "id"})
         except Exception:
             pass
-        index = client.index(idx)
-        if idx in SEARCHABLE_ATTRS:
-            index.update_searchable_attributes(SEARCHABLE_ATTRS[idx])
-        if idx in FILTERABLE_ATTRS:
-            index.update_filterable_attributes(FILTERABLE_ATTRS[idx])
+        client.index(idx).update_settings(_index_settings(idx))
+
+
+def shadow_index_name(index_name: str) -> str:
+    return f"{index_name}{SHADOW_SUFFIX}"
+
+
+def wait_for_tasks(task_uids: list[int], timeout_ms: int = 600_000) -> None:
+    """Block until every task has finished; raise if any of them failed."""
+    client = get_client()
+    for uid in task_uids:
+        task = client.wait_for_task(uid, timeout_in_ms=timeout_ms, interval_in_ms=200)
+        if task.status != "succeeded":
+            raise RuntimeError(f"Meilisearch task {uid} {task.status}: {task.error}")
+
+
+def prepare_shadow_index(index_name: str) -> str:
+    """Create an empty, fully configured shadow copy of ``index_name``.
+
+    Any leftover shadow from an interrupted rebuild is dropped first. The live
+    index is created too if it is missing, since a swap needs both sides.
+    """
+    client = get_client()
+    shadow = shadow_index_name(index_name)
+    tasks = [client.delete_index(shadow).task_uid]
+    try:
+        client.get_index(index_name)
+    except MeilisearchApiError:
+        tasks.append(client.create_index(index_name, {"primaryKey": "id"}).task_uid)
+        tasks.append(client.index(index_name).update_settings(_index_settings(index_name)).task_uid)
+    client.wait_for_task(tasks[0], timeout_in_ms=60_000)  # missing shadow is not an error
+    wait_for_tasks(tasks[1:], timeout_ms=60_000)
+    wait_for_tasks([
+        client.create_index(shadow, {"primaryKey": "id"}).task_uid,
+        client.index(shadow).update_settings(_index_settings(index_name)).task_uid,
+    ], timeout_ms=60_000)
+    return shadow
+
+
+def swap_shadow_indexes(index_names: list[str]) -> None:
+    """Atomically swap every live index with its shadow, then drop the old data."""
+    client = get_client()
+    task = client.swap_indexes([{"indexes": [idx, shadow_index_name(idx)]} for idx in index_names])
+    wait_for_tasks([task.task_uid], timeout_ms=60_000)
+    for idx in index_names:
+        client.delete_index(shadow_index_name(idx))
+
+
+def drop_shadow_indexes(index_names: list[str]) -> None:
+    client = get_client()
+    for idx in index_names:
+        try:
+            client.delete_index(shadow_index_name(idx))
+        except Exception:
+            pass
 
 
 def index_document(index_name: str, doc: dict) -> None:
@@ -65,14 +131,18 @@ def index_document(index_name: str, doc: dict) -> None:
     client.index(index_name).add_documents([doc])
 
 
-def index_documents(index_name: str, docs: list[dict]) -> None:
+def index_documents(index_name: str, docs: list[dict], *, index_uid: str | None = None) -> int | None:
+    """Add documents to ``index_name`` (or to ``index_uid``, e.g. its shadow).
+
+    Returns the Meilisearch task uid so callers can wait for indexing to finish.
+    """
     if not docs:
-        return
+        return None
     client = get_client()
     entity_type = _INDEX_TO_ENTITY.get(index_name, index_name)
     for d in docs:
         d["entity_type"] = entity_type
-    client.index(index_name).add_documents(docs)
+    return client.index(index_uid or index_name).add_documents(docs).task_uid
 
 
 def delete_document(index_name: str, doc_id: str) -> None:
@@ -80,6 +150,13 @@ def delete_document(index_name: str, doc_id: str) -> None:
     client.index(index_name).delete_document(doc_id)
 
 
+def delete_documents(index_name: str, doc_ids: list[str]) -> int | None:
+    if not doc_ids:
+        return None
+    client = get_client()
+    return client.index(index_name).delete_documents(doc_ids).task_uid
+
+
 def search_index(index_name: str, query: str, limit: int = 20, offset: int = 0, filter_str: str | None = None) -> dict:
     client = get_client()
     params = {"limit": limit, "offset": offset}
@@ -88,8 +165,40 @@ def search_index(index_name: str, query: str, limit: int = 20, offset: int = 0,
     return client.index(index_name).search(query, params)
 
 
-def multi_search(query: str, indexes: list[str] | None = None, limit: int = 20, offset: int = 0) -> dict:
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def build_filter(filters: dict[str, list[str]]) -> str | None:
+    """``{"tags": ["pii", "finance"], "db_name": ["dwh"]}`` -> ``tags IN ["pii", "finance"] AND db_name IN ["dwh"]``."""
+    clauses = [f"{attr} IN [{', '.join(_quote(v) for v in values)}]" for attr, values in filters.items() if values]
+    return " AND ".join(clauses) or None
+
+
+def multi_search(
+    query: str, indexes: list[str] | None = None, limit: int = 20, offset: int = 0,
+    filters: dict[str, list[str]] | None = None, facets: list[str] | None = None,
+) -> dict:
+    """Search several indexes in one request, pushing filters and facets down to Meilisearch.
+
+    An index that can't filter on every requested attribute can't hold a match,
+    so it is left out of the request entirely.
+    """
     client = get_client()
-    target_indexes = indexes or INDEXES
-    queries = [{"indexUid": idx, "q": query, "limit": limit, "offset": offset} for idx in target_indexes]
+    active = {attr: values for attr, values in (filters or {}).items() if values}
+    filter_str = build_filter(active)
+    queries = []
+    for idx in indexes or INDEXES:
+        filterable = FILTERABLE_ATTRS.get(idx, [])
+        if any(attr not in filterable for attr in active):
+            continue
+        q = {"indexUid": idx, "q": query, "limit": limit, "offset": offset}
+        if filter_str:
+            q["filter"] = filter_str
+        index_facets = [f for f in facets or [] if f in filterable]
+        if index_facets:
+            q["facets"] = index_facets
+        queries.append(q)
+    if not queries:
+        return {"results": []}
     return client.multi_search(queries)
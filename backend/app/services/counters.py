@@ -0,0 +1,125 @@
+"""Materialized live-row counts for the catalog hierarchy and the global stats.
+
+Writers collect signed deltas in a :class:`collections.Counter` with
+:func:`track` while they change rows, then write them with
+:func:`apply_counter_deltas` right before ``db.commit()``, so the counts commit
+(or roll back) together with the rows. Readers get O(1) totals instead of
+``COUNT(*)`` scans.
+
+A row counts while its own ``deleted_at`` is NULL, matching the list
+endpoints; per-database and per-schema counts include every live descendant.
+"""
+import uuid
+from collections import Counter
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog import CatalogCounter
+
+GLOBAL_ID = uuid.UUID(int=0)
+
+# Keys of the global counters, as returned by GET /stats
+GLOBAL_COUNTERS = ("databases", "schemas", "tables", "columns", "queries", "articles", "glossary_terms")
+
+UPSERT_CHUNK_SIZE = 5000   # rows per statement; keeps well under asyncpg's 32767 bind parameters
+
+# The single live definition of every counter. Migration 0009 keeps a frozen
+# copy for its one-off backfill; edit only this one.
+_REBUILD_SQL = """
+INSERT INTO catalog_counters (entity_type, entity_id, name, value)
+SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'databases', count(*) FROM db_connections WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'schemas', count(*) FROM schemas WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'tables', count(*) FROM tables WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'columns', count(*) FROM columns WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'queries', count(*) FROM queries WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'articles', count(*) FROM articles WHERE deleted_at IS NULL
+UNION ALL SELECT 'global', '00000000-0000-0000-0000-000000000000'::uuid, 'glossary_terms', count(*) FROM glossary_terms WHERE deleted_at IS NULL
+UNION ALL SELECT 'database', s.connection_id, 'schemas', count(*)
+    FROM schemas s WHERE s.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'database', s.connection_id, 'tables', count(*)
+    FROM tables t JOIN schemas s ON s.id = t.schema_id WHERE t.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'database', s.connection_id, 'columns', count(*)
+    FROM columns c JOIN tables t ON t.id = c.table_id JOIN schemas s ON s.id = t.schema_id
+    WHERE c.deleted_at IS NULL GROUP BY s.connection_id
+UNION ALL SELECT 'schema', t.schema_id, 'tables', count(*)
+    FROM tables t WHERE t.deleted_at IS NULL GROUP BY t.schema_id
+UNION ALL SELECT 'schema', t.schema_id, 'columns', count(*)
+    FROM columns c JOIN tables t ON t.id = c.table_id WHERE c.deleted_at IS NULL GROUP BY t.schema_id
+UNION ALL SELECT 'table', c.table_id, 'columns', count(*)
+    FROM columns c WHERE c.deleted_at IS NULL GROUP BY c.table_id
+"""
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+
+def track(
+    deltas: Counter, name: str, delta: int, *,
+    database: uuid.UUID | None = None, schema: uuid.UUID | None = None, table: uuid.UUID | None = None,
+) -> None:
+    """Add ``delta`` to the global ``name`` counter and to each given ancestor's."""
+    deltas[("global", GLOBAL_ID, name)] += delta
+    for entity_type, entity_id in (("database", database), ("schema", schema), ("table", table)):
+        if entity_id is not None:
+            deltas[(entity_type, entity_id, name)] += delta
+
+
+async def apply_counter_deltas(db: AsyncSession, deltas: Counter) -> None:
+    """Upsert the accumulated deltas, a few thousand rows per statement. Call before ``db.commit()``.
+
+    Rows are written in key order so concurrent writers lock shared counters
+    (the global ones above all) in the same order and cannot deadlock.
+    """
+    rows = [
+        {"entity_type": t, "entity_id": i, "name": n, "value": v}
+        for (t, i, n), v in sorted(deltas.items(), key=lambda kv: (kv[0][0], str(kv[0][1]), kv[0][2]))
+        if v
+    ]
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(CatalogCounter).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[CatalogCounter.entity_type, CatalogCounter.entity_id, CatalogCounter.name],
+            set_={"value": CatalogCounter.value + stmt.excluded.value},
+        ))
+
+
+async def adjust_counter(db: AsyncSession, name: str, delta: int) -> None:
+    """Shortcut for a single global counter (queries, articles, glossary terms)."""
+    await apply_counter_deltas(db, Counter({("global", GLOBAL_ID, name): delta}))
+
+
+async def rebuild_counters(db: AsyncSession) -> None:
+    """Recount everything from the base tables, e.g. after rows were deleted by hand.
+
+    Writers block on the table lock until this commits, then apply their
+    deltas on top of the fresh counts.
+    """
+    await db.execute(text("LOCK TABLE catalog_counters IN EXCLUSIVE MODE"))
+    await db.execute(text("DELETE FROM catalog_counters"))
+    await db.execute(text(_REBUILD_SQL))
+    await db.commit()
+
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+
+def counter_value(entity_type: str, entity_id, name: str):
+    """Scalar subquery for one counter; correlates when ``entity_id`` is a column."""
+    return select(CatalogCounter.value).where(
+        CatalogCounter.entity_type == entity_type,
+        CatalogCounter.entity_id == entity_id,
+        CatalogCounter.name == name,
+    ).scalar_subquery()
+
+
+async def get_counter(db: AsyncSession, entity_type: str, entity_id: uuid.UUID, name: str) -> int:
+    return (await db.execute(select(counter_value(entity_type, entity_id, name)))).scalar() or 0
+
+
+async def get_global_counts(db: AsyncSession) -> dict[str, int]:
+    rows = (await db.execute(
+        select(CatalogCounter.name, CatalogCounter.value)
+        .where(CatalogCounter.entity_type == "global", CatalogCounter.entity_id == GLOBAL_ID)
+    )).all()
+    values = dict(rows)
+    return {name: values.get(name, 0) for name in GLOBAL_COUNTERS}
@@ -0,0 +1,64 @@
+"""Throttled, batched ``users.last_login`` updates for header-authenticated requests."""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from app.database import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+LAST_LOGIN_THROTTLE = 300        # seconds before a worker records the same user again
+LAST_LOGIN_FLUSH_INTERVAL = 30   # seconds between batched UPDATEs
+
+_pending: dict[uuid.UUID, datetime] = {}
+_recorded_at: dict[uuid.UUID, float] = {}   # user id -> monotonic time of the last record
+
+
+def record_login(user_id: uuid.UUID) -> None:
+    """Note that ``user_id`` was just seen; written at most once per throttle window."""
+    now = time.monotonic()
+    if now - _recorded_at.get(user_id, float("-inf")) < LAST_LOGIN_THROTTLE:
+        return
+    _recorded_at[user_id] = now
+    _pending[user_id] = datetime.now(timezone.utc)
+
+
+async def flush_last_logins() -> int:
+    """Write every pending ``last_login`` in one bulk UPDATE; returns the number of users."""
+    global _pending
+    if not _pending:
+        return 0
+    batch, _pending = _pending, {}
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(User), [{"id": uid, "last_login": ts} for uid, ts in batch.items()])
+            await db.commit()
+    except BaseException:
+        # Keep them for the next round, unless something newer arrived meanwhile
+        _pending = {**batch, **_pending}
+        raise
+    cutoff = time.monotonic() - LAST_LOGIN_THROTTLE
+    for uid in [uid for uid, at in _recorded_at.items() if at < cutoff]:
+        del _recorded_at[uid]
+    return len(batch)
+
+
+async def run_last_login_flusher() -> None:
+    """Flush recorded logins periodically, and once more on shutdown; started from the app lifespan."""
+    try:
+        while True:
+            await asyncio.sleep(LAST_LOGIN_FLUSH_INTERVAL)
+            try:
+                await flush_last_logins()
+            except Exception:
+                logger.warning("last_login flush failed; will retry", exc_info=True)
+    finally:
+        try:
+            await flush_last_logins()
+        except Exception:
+            logger.warning("Final last_login flush failed", exc_info=True)
@@ -0,0 +1,134 @@
+"""Resolve what a user may do on a catalog entity, from cached grants and ancestry.
+
+A user's rights combine their own role and their groups' ``app_role``s
+(app-wide) with their ``ResourcePermission`` grants (per entity). Grants are
+inherited down the catalog: a database steward stewards its schemas, tables
+and columns, and its saved queries. Both halves are cached in the two-tier
+cache, so a check is a few dict lookups on a hot worker:
+
+* grants per user: ``{"role": best group role, "entities": {"table:<id>": "steward"}}``,
+  under a key carrying a global and a per-user version. Grant/revoke bumps the
+  user's version and group changes the global one, rather than deleting the
+  entry, so a load that read the old grants and stores them late lands on a
+  key nobody reads any more: the cache fails closed;
+* ancestry per entity: ``["schema:<id>", "database:<id>"]``; entities don't
+  move, so it only ages out.
+"""
+import uuid
+
+from sqlalchemy import select
+
+from app.cache import bump_version, get_or_load, get_versions
+from app.database import AsyncSessionLocal
+from app.models.catalog import Column, Query, Schema, Table
+from app.models.governance import ResourcePermission
+from app.models.group import Group, UserGroup
+from app.models.user import User
+
+ROLE_RANK = {"viewer": 0, "editor": 1, "steward": 2, "admin": 3}
+GRANTS_TTL = 600
+ANCESTRY_TTL = 3600
+GRANTS_NAMESPACE = "perms"    # bumped when a group's role changes or a group is deleted
+
+
+def _rank(role: str | None) -> int:
+    return ROLE_RANK.get(role or "", 0)
+
+
+# ─── Loading ─────────────────────────────────────────────────────────────────
+
+async def _load_grants(user_id: uuid.UUID) -> dict:
+    async with AsyncSessionLocal() as db:
+        perms = (await db.execute(
+            select(ResourcePermission.entity_type, ResourcePermission.entity_id, ResourcePermission.role)
+            .where(ResourcePermission.user_id == user_id)
+        )).all()
+        group_roles = (await db.execute(
+            select(Group.app_role).join(UserGroup, UserGroup.group_id == Group.id).where(UserGroup.user_id == user_id)
+        )).scalars().all()
+    entities: dict[str, str] = {}
+    for entity_type, entity_id, role in perms:
+        key = f"{entity_type}:{entity_id}"
+        if _rank(role) > _rank(entities.get(key)):
+            entities[key] = role
+    return {"role": max(group_roles, key=_rank, default="viewer"), "entities": entities}
+
+
+async def _load_ancestry(entity_type: str, entity_id: str) -> list[str]:
+    try:
+        uid = uuid.UUID(entity_id)
+    except ValueError:
+        return []
+    async with AsyncSessionLocal() as db:
+        if entity_type == "column":
+            row = (await db.execute(
+                select(Column.table_id, Table.schema_id, Schema.connection_id)
+                .join(Table, Table.id == Column.table_id).join(Schema, Schema.id == Table.schema_id)
+                .where(Column.id == uid)
+            )).first()
+            return [f"table:{row[0]}", f"schema:{row[1]}", f"database:{row[2]}"] if row else []
+        if entity_type == "table":
+            row = (await db.execute(
+                select(Table.schema_id, Schema.connection_id)
+                .join(Schema, Schema.id == Table.schema_id).where(Table.id == uid)
+            )).first()
+            return [f"schema:{row[0]}", f"database:{row[1]}"] if row else []
+        if entity_type == "schema":
+            connection_id = (await db.execute(select(Schema.connection_id).where(Schema.id == uid))).scalar()
+            return [f"database:{connection_id}"] if connection_id else []
+        if entity_type == "query":
+            connection_id = (await db.execute(select(Query.connection_id).where(Query.id == uid))).scalar()
+            return [f"database:{connection_id}"] if connection_id else []
+    return []
+
+
+def _user_namespace(user_id) -> str:
+    return f"{GRANTS_NAMESPACE}:{user_id}"
+
+
+async def _grants_key(user_id) -> str:
+    global_ver, user_ver = await get_versions(GRANTS_NAMESPACE, _user_namespace(user_id))
+    return f"perms:{user_id}:v{global_ver}:v{user_ver}"
+
+
+async def _grants(user_id) -> dict:
+    return await get_or_load(await _grants_key(user_id), lambda: _load_grants(user_id), ttl=GRANTS_TTL)
+
+
+# ─── Checks ──────────────────────────────────────────────────────────────────
+
+async def effective_role(user: User, entity_type: str, entity_id: str) -> str:
+    """The strongest of the user's own role, their groups' roles and any grant on the entity or its ancestors."""
+    if user.role == "admin":
+        return "admin"
+    grants = await _grants(user.id)
+    best = max((user.role, grants["role"]), key=_rank)
+    entities = grants["entities"]
+    if entities:
+        chain = [f"{entity_type}:{entity_id}"]
+        chain += await get_or_load(
+            f"ancestry:{entity_type}:{entity_id}", lambda: _load_ancestry(entity_type, entity_id), ttl=ANCESTRY_TTL,
+        )
+        best = max((best, *(entities.get(key) for key in chain)), key=_rank)
+    return best or "viewer"
+
+
+async def has_role(user: User, role: str, entity_type: str, entity_id: str) -> bool:
+    return _rank(await effective_role(user, entity_type, entity_id)) >= _rank(role)
+
+
+def outranks(role: str, other: str) -> bool:
+    """True when ``role`` is strictly stronger than ``other``."""
+    return _rank(role) > _rank(other)
+
+
+# ─── Invalidation ────────────────────────────────────────────────────────────
+
+async def invalidate_grants(user_id) -> None:
+    """Call after granting or revoking a user's resource permission or group membership (after the commit)."""
+    await bump_version(_user_namespace(user_id))
+
+
+async def invalidate_all_grants() -> None:
+    """Call after a group's role changes or a group is deleted."""
+    await bump_version(GRANTS_NAMESPACE)
@@ -0,0 +1,167 @@
+"""Transactional outbox for search-index changes and its background dispatcher."""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+from meilisearch.errors import MeilisearchCommunicationError, MeilisearchTimeoutError
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.database import AsyncSessionLocal
+from app.models.search import SearchOutbox
+from app.search_engine import wait_for_tasks
+from app.services.search_sync import apply_changes
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_BATCH_SIZE = 500      # outbox rows claimed per dispatch round
+DISPATCH_POLL_INTERVAL = 1.0   # seconds to sleep when the outbox is empty or on error
+ENQUEUE_CHUNK_SIZE = 5000      # rows per INSERT statement
+MAX_DISPATCH_ATTEMPTS = 5      # failures before a row is set aside for an admin to look at
+# Only one worker dispatches at a time; the others just poll the lock.
+DISPATCH_LOCK_ID = 0x5EA7C4
+
+# Meilisearch or the database being unreachable says nothing about the rows:
+# the whole batch is retried and no row is charged an attempt
+TRANSIENT_ERRORS = (MeilisearchCommunicationError, MeilisearchTimeoutError, SQLAlchemyError)
+
+
+# ─── Enqueue ─────────────────────────────────────────────────────────────────
+
+async def enqueue_search_sync(db: AsyncSession, index_name: str, entity_id) -> None:
+    """Record that ``entity_id`` in ``index_name`` changed. Call before ``db.commit()``."""
+    db.add(SearchOutbox(index_name=index_name, entity_id=str(entity_id)))
+
+
+async def enqueue_search_sync_many(db: AsyncSession, index_name: str, entity_ids: Iterable) -> None:
+    """Bulk variant of :func:`enqueue_search_sync` for ingest-sized change sets."""
+    rows = [{"index_name": index_name, "entity_id": str(i)} for i in entity_ids]
+    for start in range(0, len(rows), ENQUEUE_CHUNK_SIZE):
+        await db.execute(insert(SearchOutbox), rows[start:start + ENQUEUE_CHUNK_SIZE])
+
+
+# ─── Dispatcher ──────────────────────────────────────────────────────────────
+
+async def _apply(db: AsyncSession, index_name: str, entity_ids: list[str]) -> None:
+    task_uids = await apply_changes(db, index_name, entity_ids)
+    await run_in_threadpool(wait_for_tasks, task_uids)
+
+
+async def dispatch_once(db: AsyncSession) -> int:
+    """Apply one batch of pending changes to Meilisearch. Returns rows consumed.
+
+    Rows for the same entity coalesce into one document fetched from the DB at
+    dispatch time, so a burst of edits costs a single upsert. Each index is
+    applied on its own; if one fails, its entities are retried one by one, so
+    a bad row or a document Meilisearch rejects only holds back itself. Rows
+    that made it are deleted; rows that failed are charged an attempt and set
+    aside after ``MAX_DISPATCH_ATTEMPTS``. Transient errors (Meilisearch or the
+    DB unreachable) roll back the whole batch for the next round instead.
+    """
+    locked = (await db.execute(select(func.pg_try_advisory_xact_lock(DISPATCH_LOCK_ID)))).scalar()
+    if not locked:
+        await db.rollback()
+        return 0
+
+    rows = (await db.execute(
+        select(SearchOutbox.id, SearchOutbox.index_name, SearchOutbox.entity_id)
+        .where(SearchOutbox.attempts < MAX_DISPATCH_ATTEMPTS)
+        .order_by(SearchOutbox.id)
+        .limit(DISPATCH_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not rows:
+        await db.rollback()
+        return 0
+
+    # index -> entity -> outbox row ids
+    pending: dict[str, dict[str, list[int]]] = defaultdict(lambda: defaultdict(list))
+    for r in rows:
+        pending[r.index_name][r.entity_id].append(r.id)
+
+    done: list[int] = []
+    failed: dict[str, list[int]] = defaultdict(list)   # error -> outbox row ids
+    for index_name, entities in pending.items():
+        try:
+            await _apply(db, index_name, list(entities))
+            done.extend(i for ids in entities.values() for i in ids)
+            continue
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception:
+            logger.warning("Search sync of %s failed; retrying entity by entity", index_name, exc_info=True)
+        for entity_id, ids in entities.items():
+            try:
+                await _apply(db, index_name, [entity_id])
+                done.extend(ids)
+            except TRANSIENT_ERRORS:
+                raise
+            except Exception as exc:
+                failed[f"{type(exc).__name__}: {exc}"[:2000]].extend(ids)
+
+    if done:
+        await db.execute(delete(SearchOutbox).where(SearchOutbox.id.in_(done)))
+    for error, ids in failed.items():
+        given_up = (await db.execute(
+            update(SearchOutbox).where(SearchOutbox.id.in_(ids))
+            .values(attempts=SearchOutbox.attempts + 1, last_error=error)
+            .returning(SearchOutbox.index_name, SearchOutbox.entity_id, SearchOutbox.attempts)
+        )).all()
+        for index_name, entity_id, attempts in given_up:
+            if attempts >= MAX_DISPATCH_ATTEMPTS:
+                logger.error(
+                    "Search sync of %s %s failed %d times; set aside (see GET /api/v1/admin/search-outbox): %s",
+                    index_name, entity_id, attempts, error,
+                )
+    await db.commit()
+    return len(rows)
+
+
+# ─── Failed rows ─────────────────────────────────────────────────────────────
+
+async def outbox_status(db: AsyncSession, limit: int = 100) -> dict:
+    """Rows waiting to sync, and the rows set aside after too many failures."""
+    given_up = SearchOutbox.attempts >= MAX_DISPATCH_ATTEMPTS
+    pending, failed_total = (await db.execute(
+        select(func.count().filter(~given_up), func.count().filter(given_up)).select_from(SearchOutbox)
+    )).one()
+    failed = (await db.execute(
+        select(SearchOutbox).where(given_up).order_by(SearchOutbox.id).limit(limit)
+    )).scalars().all()
+    return {
+        "pending": pending,
+        "failed_total": failed_total,
+        "failed": [
+            {"id": r.id, "index_name": r.index_name, "entity_id": r.entity_id,
+             "attempts": r.attempts, "last_error": r.last_error, "created_at": r.created_at}
+            for r in failed
+        ],
+    }
+
+
+async def retry_failed(db: AsyncSession) -> int:
+    """Put every set-aside row back in the queue, e.g. after fixing its cause. Returns how many."""
+    result = await db.execute(
+        update(SearchOutbox).where(SearchOutbox.attempts >= MAX_DISPATCH_ATTEMPTS)
+        .values(attempts=0, last_error=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def run_dispatcher() -> None:
+    """Drain the outbox forever; started once per worker from the app lifespan."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                consumed = await dispatch_once(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Search outbox dispatch failed; will retry", exc_info=True)
+            consumed = 0
+        if consumed < DISPATCH_BATCH_SIZE:
+            await asyncio.sleep(DISPATCH_POLL_INTERVAL)
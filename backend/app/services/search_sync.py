@@ -1,42 +1,87 @@
+import asyncio
+import contextlib
 import logging
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
 from functools import partial
+from typing import Awaitable, Callable
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, String, cast, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 
+from app.database import AsyncSessionLocal
 from app.models.catalog import Article, Column, DbConnection, Query, Schema, Table
 from app.models.glossary import GlossaryTerm
-from app.search_engine import delete_document, index_document, index_documents
+from app.models.governance import DataClassification
+from app.models.search import SearchOutbox
+from app.redis_client import cache_get, cache_set, get_redis
+from app.search_engine import (
+    INDEXES, delete_documents, drop_shadow_indexes, index_documents,
+    prepare_shadow_index, shadow_index_name, swap_shadow_indexes, wait_for_tasks,
+)
 
 logger = logging.getLogger(__name__)
 
+REINDEX_LOCK_KEY = "reindex:lock"
+REINDEX_LOCK_TTL = 300          # renewed every REINDEX_LOCK_RENEW while the rebuild runs
+REINDEX_LOCK_RENEW = 60
+REINDEX_BATCH_SIZE = 1000      # rows per cursor fetch and per add-documents task
+REINDEX_MAX_IN_FLIGHT = 4      # enqueued-but-unfinished Meilisearch tasks per chunk
+REINDEX_CHUNKS_PER_INDEX = 4   # id-range slices each index is split into
+REINDEX_CONCURRENCY = 4        # chunks streamed at once, each on its own DB connection
+REINDEX_STATUS_KEY = "reindex:status"
+REINDEX_STATUS_TTL = 86400
 
-def sync_database(db_conn) -> None:
-    index_document("databases", {
+
+class ReindexInProgressError(RuntimeError):
+    """Another worker already holds the reindex lock."""
+
+
+class ReindexLockLostError(RuntimeError):
+    """The reindex lock expired or was taken over while this rebuild still ran."""
+
+
+# KEYS: lock. ARGV: our token, TTL (s). Extends the lock only while we still own it.
+_RENEW_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+# ─── Document builders ───────────────────────────────────────────────────────
+
+def _database_doc(db_conn) -> dict:
+    return {
         "id": str(db_conn.id),
         "name": db_conn.name,
         "description": db_conn.description or "",
         "tags": db_conn.tags or [],
         "db_type": db_conn.db_type,
+        "db_name": db_conn.name,
         "breadcrumb": [db_conn.name],
-    })
+    }
 
 
-def sync_schema(schema, *, db_name: str) -> None:
-    index_document("schemas", {
+def _schema_doc(schema, *, db_name: str) -> dict:
+    return {
         "id": str(schema.id),
         "name": schema.name,
         "description": schema.description or "",
         "tags": schema.tags or [],
         "connection_id": str(schema.connection_id),
         "db_name": db_name,
+        "schema_name": schema.name,
         "breadcrumb": [db_name, schema.name],
-    })
+    }
 
 
-def sync_table(table, *, db_name: str, schema_name: str, connection_id: str = "") -> None:
-    index_document("tables", {
+def _table_doc(table, *, db_name: str, schema_name: str, connection_id: str = "", classification: str | None = None) -> dict:
+    return {
         "id": str(table.id),
         "name": table.name,
         "description": table.description or "",
@@ -47,12 +92,16 @@ def sync_table(table, *, db_name: str, schema_name: str, connection_id: str = ""
         "connection_id": connection_id,
         "db_name": db_name,
         "schema_name": schema_name,
+        "classification": classification,
         "breadcrumb": [db_name, schema_name, table.name],
-    })
+    }
 
 
-def sync_column(col, *, db_name: str, schema_name: str, table_name: str, connection_id: str = "", schema_id: str = "") -> None:
-    index_document("columns", {
+def _column_doc(
+    col, *, db_name: str, schema_name: str, table_name: str, connection_id: str = "", schema_id: str = "",
+    classification: str | None = None,
+) -> dict:
+    return {
         "id": str(col.id),
         "name": col.name,
         "description": col.description or "",
@@ -64,24 +113,26 @@ def sync_column(col, *, db_name: str, schema_name: str, table_name: str, connect
         "db_name": db_name,
         "schema_name": schema_name,
         "table_name": table_name,
+        "classification": classification,
         "breadcrumb": [db_name, schema_name, table_name],
-    })
+    }
 
 
-def sync_query(q) -> None:
-    index_document("queries", {
+def _query_doc(q, *, db_name: str = "") -> dict:
+    return {
         "id": str(q.id),
         "name": q.name,
         "description": q.description or "",
         "sme_name": q.sme_name or "",
         "sql_text": q.sql_text or "",
         "connection_id": str(q.connection_id) if q.connection_id else "",
+        "db_name": db_name,
         "breadcrumb": [q.name],
-    })
+    }
 
 
-def sync_article(a) -> None:
-    index_document("articles", {
+def _article_doc(a) -> dict:
+    return {
         "id": str(a.id),
         "title": a.title,
         "name": a.title,
@@ -90,210 +141,364 @@ def sync_article(a) -> None:
         "body": a.body or "",
         "tags": a.tags or [],
         "breadcrumb": [a.title],
-    })
+    }
 
 
-def sync_glossary_term(term) -> None:
-    index_document("glossary", {
+def _glossary_doc(term) -> dict:
+    return {
         "id": str(term.id),
         "name": term.name,
         "definition": term.definition or "",
         "tags": term.tags or [],
         "status": term.status,
         "breadcrumb": [term.name],
-    })
-
-
-async def sync_database_async(db_conn) -> None:
-    await run_in_threadpool(sync_database, db_conn)
-
-
-async def sync_schema_async(schema, *, db_name: str) -> None:
-    await run_in_threadpool(partial(sync_schema, schema, db_name=db_name))
-
-
-async def sync_table_async(table, *, db_name: str, schema_name: str, connection_id: str = "") -> None:
-    await run_in_threadpool(partial(sync_table, table, db_name=db_name, schema_name=schema_name, connection_id=connection_id))
-
-
-async def sync_column_async(col, *, db_name: str, schema_name: str, table_name: str, connection_id: str = "", schema_id: str = "") -> None:
-    await run_in_threadpool(partial(sync_column, col, db_name=db_name, schema_name=schema_name, table_name=table_name, connection_id=connection_id, schema_id=schema_id))
-
-
-async def sync_query_async(q) -> None:
-    await run_in_threadpool(sync_query, q)
-
-
-async def sync_article_async(a) -> None:
-    await run_in_threadpool(sync_article, a)
-
-
-async def sync_glossary_term_async(term) -> None:
-    await run_in_threadpool(sync_glossary_term, term)
-
-
-def remove_document(index_name: str, doc_id: str) -> None:
+    }
+
+
+# ─── Index sources ───────────────────────────────────────────────────────────
+
+def _classification_of(entity_type: str, id_col):
+    return (DataClassification.entity_type == entity_type) & (DataClassification.entity_id == cast(id_col, String))
+
+
+def _index_sources() -> dict[str, tuple[type, Select, Callable[[Row], dict]]]:
+    """index -> (model, row query, row -> document), with parent names joined in.
+
+    Queries select plain columns rather than ORM entities so that streamed rows
+    are cheap tuples and nothing accumulates in the session identity map.
+    Callers add their own filters (live rows only, a set of ids, ...).
+    """
+    return {
+        "databases": (DbConnection, select(
+            DbConnection.id, DbConnection.name, DbConnection.description, DbConnection.tags, DbConnection.db_type,
+        ), _database_doc),
+        "schemas": (Schema, select(
+            Schema.id, Schema.name, Schema.description, Schema.tags, Schema.connection_id,
+            DbConnection.name.label("db_name"),
+        ).join(DbConnection, Schema.connection_id == DbConnection.id),
+            lambda r: _schema_doc(r, db_name=r.db_name)),
+        "tables": (Table, select(
+            Table.id, Table.name, Table.description, Table.tags, Table.sme_name, Table.object_type, Table.schema_id,
+            Schema.name.label("schema_name"), Schema.connection_id, DbConnection.name.label("db_name"),
+            DataClassification.level.label("classification"),
+        ).join(Schema, Table.schema_id == Schema.id)
+         .join(DbConnection, Schema.connection_id == DbConnection.id)
+         .outerjoin(DataClassification, _classification_of("table", Table.id)),
+            lambda r: _table_doc(
+                r, db_name=r.db_name, schema_name=r.schema_name, connection_id=str(r.connection_id),
+                classification=r.classification,
+            )),
+        "columns": (Column, select(
+            Column.id, Column.name, Column.description, Column.data_type, Column.tags, Column.table_id,
+            Table.name.label("table_name"), Table.schema_id, Schema.name.label("schema_name"),
+            Schema.connection_id, DbConnection.name.label("db_name"),
+            DataClassification.level.label("classification"),
+        ).join(Table, Column.table_id == Table.id)
+         .join(Schema, Table.schema_id == Schema.id)
+         .join(DbConnection, Schema.connection_id == DbConnection.id)
+         .outerjoin(DataClassification, _classification_of("column", Column.id)),
+            lambda r: _column_doc(
+                r, db_name=r.db_name, schema_name=r.schema_name, table_name=r.table_name,
+                connection_id=str(r.connection_id), schema_id=str(r.schema_id), classification=r.classification,
+            )),
+        "queries": (Query, select(
+            Query.id, Query.name, Query.description, Query.sme_name, Query.sql_text, Query.connection_id,
+            DbConnection.name.label("db_name"),
+        ).outerjoin(DbConnection, Query.connection_id == DbConnection.id),
+            lambda r: _query_doc(r, db_name=r.db_name or "")),
+        "articles": (Article, select(
+            Article.id, Article.title, Article.description, Article.sme_name, Article.body, Article.tags,
+        ), _article_doc),
+        "glossary": (GlossaryTerm, select(
+            GlossaryTerm.id, GlossaryTerm.name, GlossaryTerm.definition, GlossaryTerm.tags, GlossaryTerm.status,
+        ), _glossary_doc),
+    }
+
+
+# ─── Incremental sync ────────────────────────────────────────────────────────
+
+async def apply_changes(db: AsyncSession, index_name: str, entity_ids: list[str]) -> list[int]:
+    """Bring the given documents in line with the DB. Returns Meilisearch task uids.
+
+    Ids that resolve to a live row are (re)indexed; ids whose row is gone or
+    soft-deleted are removed from the index. Malformed ids are dropped.
+    """
+    model, stmt, to_doc = _index_sources()[index_name]
+    ids = set()
+    for i in entity_ids:
+        with contextlib.suppress(ValueError):
+            ids.add(uuid.UUID(i))
+    if not ids:
+        return []
+    rows = (await db.execute(stmt.where(model.id.in_(ids), model.deleted_at.is_(None)))).all()
+    docs = [to_doc(r) for r in rows]
+    live = {d["id"] for d in docs}
+    gone = [str(i) for i in ids if str(i) not in live]
+    task_uids = []
+    if docs:
+        task_uids.append(await run_in_threadpool(index_documents, index_name, docs))
+    if gone:
+        task_uids.append(await run_in_threadpool(delete_documents, index_name, gone))
+    return task_uids
+
+
+# ─── Full reindex ────────────────────────────────────────────────────────────
+
+class _ReindexProgress:
+    """Per-index progress and timings of the running reindex.
+
+    Mirrored to Redis after every batch so the admin status endpoint can read
+    it from any worker, not just the one holding the reindex lock.
+    """
+
+    def __init__(self, chunks_per_index: int):
+        self._t0 = time.monotonic()
+        self._index_t0: dict[str, float] = {}
+        self.state = {
+            "status": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "duration_s": None,
+            "indexes": {
+                idx: {"status": "pending", "documents": 0, "chunks_done": 0,
+                      "chunks_total": chunks_per_index, "duration_s": None}
+                for idx in INDEXES
+            },
+        }
+
+    async def publish(self) -> None:
+        await cache_set(REINDEX_STATUS_KEY, self.state, REINDEX_STATUS_TTL)
+
+    async def chunk_started(self, index_name: str) -> None:
+        entry = self.state["indexes"][index_name]
+        if entry["status"] == "pending":
+            entry["status"] = "running"
+            self._index_t0[index_name] = time.monotonic()
+            await self.publish()
+
+    async def add_documents(self, index_name: str, count: int) -> None:
+        self.state["indexes"][index_name]["documents"] += count
+        await self.publish()
+
+    async def chunk_done(self, index_name: str) -> None:
+        entry = self.state["indexes"][index_name]
+        entry["chunks_done"] += 1
+        if entry["chunks_done"] == entry["chunks_total"]:
+            entry["status"] = "done"
+            entry["duration_s"] = round(time.monotonic() - self._index_t0[index_name], 3)
+        await self.publish()
+
+    async def finish(self, status: str) -> None:
+        self.state["status"] = status
+        self.state["duration_s"] = round(time.monotonic() - self._t0, 3)
+        await self.publish()
+
+    def counts(self) -> dict[str, int]:
+        return {idx: entry["documents"] for idx, entry in self.state["indexes"].items()}
+
+
+def _id_ranges(n: int) -> list[tuple[uuid.UUID | None, uuid.UUID | None]]:
+    """Split the UUID key space into ``n`` contiguous ``[lo, hi)`` ranges.
+
+    Primary keys are uuid4, so the slices hold roughly equal numbers of rows
+    and each one is a plain range scan on the primary key index.
+    """
+    bounds = [None] + [uuid.UUID(int=(i << 128) // n) for i in range(1, n)] + [None]
+    return list(zip(bounds, bounds[1:]))
+
+
+async def _stream_into_shadow(
+    db: AsyncSession, index_name: str, stmt: Select, to_doc: Callable[[Row], dict],
+    on_batch: Callable[[int], Awaitable[None]],
+) -> None:
+    """Stream rows through a server-side cursor into the shadow of ``index_name``.
+
+    Rows arrive ``REINDEX_BATCH_SIZE`` at a time and each batch becomes one
+    add-documents task. At most ``REINDEX_MAX_IN_FLIGHT`` of those tasks are
+    left enqueued in Meilisearch before we wait on the oldest, so neither our
+    memory nor the Meilisearch task queue grows with the size of the catalog.
+    """
+    shadow = shadow_index_name(index_name)
+    in_flight: deque[int] = deque()
+    result = await db.stream(stmt.execution_options(yield_per=REINDEX_BATCH_SIZE))
+    async for rows in result.partitions():
+        docs = [to_doc(r) for r in rows]
+        in_flight.append(await run_in_threadpool(partial(index_documents, index_name, docs, index_uid=shadow)))
+        if len(in_flight) >= REINDEX_MAX_IN_FLIGHT:
+            await run_in_threadpool(wait_for_tasks, [in_flight.popleft()])
+        await on_batch(len(docs))
+    await run_in_threadpool(wait_for_tasks, list(in_flight))
+
+
+async def _reindex_chunk(
+    index_name: str, lo: uuid.UUID | None, hi: uuid.UUID | None,
+    limit: asyncio.Semaphore, progress: _ReindexProgress,
+) -> None:
+    """Load one id range of one index into its shadow, on a session of its own."""
+    model, stmt, to_doc = _index_sources()[index_name]
+    stmt = stmt.where(model.deleted_at.is_(None))
+    if lo is not None:
+        stmt = stmt.where(model.id >= lo)
+    if hi is not None:
+        stmt = stmt.where(model.id < hi)
+    async with limit:
+        await progress.chunk_started(index_name)
+        async with AsyncSessionLocal() as db:
+            await _stream_into_shadow(db, index_name, stmt, to_doc, partial(progress.add_documents, index_name))
+        await progress.chunk_done(index_name)
+
+
+async def _build_shadow_indexes(progress: _ReindexProgress) -> None:
+    """Load every live entity into the shadow indexes and wait until indexed.
+
+    All indexes and id ranges are fanned out at once; the semaphore keeps at
+    most ``REINDEX_CONCURRENCY`` of them holding a DB connection. If any chunk
+    fails, the rest are cancelled.
+    """
+    limit = asyncio.Semaphore(REINDEX_CONCURRENCY)
+    tasks = [
+        asyncio.create_task(_reindex_chunk(index_name, lo, hi, limit, progress))
+        for index_name in INDEXES
+        for lo, hi in _id_ranges(REINDEX_CHUNKS_PER_INDEX)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _requeue_changed_since(since: datetime) -> None:
+    """Queue rows modified after ``since`` for another incremental sync.
+
+    Changes the dispatcher applied while the shadows were being built went to
+    the old live indexes and were discarded by the swap; this replays them.
+    """
+    async with AsyncSessionLocal() as db:
+        for index_name, (model, _, _) in _index_sources().items():
+            await db.execute(insert(SearchOutbox).from_select(
+                ["index_name", "entity_id"],
+                select(literal(index_name), cast(model.id, String)).where(model.updated_at >= since),
+            ))
+        await db.commit()
+
+
+async def get_reindex_status() -> dict | None:
+    """Progress of the running reindex, or the outcome of the last one."""
+    return await cache_get(REINDEX_STATUS_KEY)
+
+
+async def _acquire_reindex() -> tuple[str, datetime, _ReindexProgress]:
+    """Take the cluster-wide reindex lock and publish a fresh "running" status."""
+    r = await get_redis()
+    token = str(uuid.uuid4())
+    if not await r.set(REINDEX_LOCK_KEY, token, nx=True, ex=REINDEX_LOCK_TTL):
+        raise ReindexInProgressError("A search reindex is already running")
+    started_at = datetime.now(timezone.utc)
+    progress = _ReindexProgress(REINDEX_CHUNKS_PER_INDEX)
+    try:
+        await progress.publish()
+    except BaseException:
+        await r.delete(REINDEX_LOCK_KEY)
+        raise
+    return token, started_at, progress
+
+
+async def _hold_reindex_lock(token: str, rebuild: asyncio.Task, lost: asyncio.Event) -> None:
+    """Keep extending the lock while ``rebuild`` runs; cancel it if the lock is gone.
+
+    Rebuilds of large catalogs outlast any fixed TTL, and a lock that expired
+    mid-run would let a second reindex recreate the shadows this one is filling.
+    A failed renewal is retried: the lock still has most of its TTL left.
+    """
+    r = await get_redis()
+    renew = r.register_script(_RENEW_LOCK)
+    while True:
+        await asyncio.sleep(REINDEX_LOCK_RENEW)
+        try:
+            held = await renew(keys=[REINDEX_LOCK_KEY], args=[token, REINDEX_LOCK_TTL])
+        except Exception:
+            logger.warning("Could not renew the reindex lock; retrying", exc_info=True)
+            continue
+        if not held:
+            logger.error("Reindex lock lost; abandoning this rebuild")
+            lost.set()
+            rebuild.cancel()
+            return
+
+
+async def _rebuild(token: str, started_at: datetime, progress: _ReindexProgress) -> dict:
+    r = await get_redis()
+    lost = asyncio.Event()
+    heartbeat = asyncio.create_task(_hold_reindex_lock(token, asyncio.current_task(), lost))
     try:
-        delete_document(index_name, doc_id)
-    except Exception:
-        pass
-
-
-async def reindex_all(db: AsyncSession) -> dict[str, int]:
-    """Reload all entities from DB and bulk-index them into Meilisearch."""
-    counts: dict[str, int] = {}
-
-    # Databases
-    dbs = (await db.execute(
-        select(DbConnection).where(DbConnection.deleted_at.is_(None))
-    )).scalars().all()
-    db_docs = []
-    for d in dbs:
-        db_docs.append({
-            "id": str(d.id),
-            "name": d.name,
-            "description": d.description or "",
-            "tags": d.tags or [],
-            "db_type": d.db_type,
-            "breadcrumb": [d.name],
-        })
-    index_documents("databases", db_docs)
-    counts["databases"] = len(db_docs)
-
-    # Build a lookup for db names
-    db_name_map = {d.id: d.name for d in dbs}
-
-    # Schemas
-    schemas = (await db.execute(
-        select(Schema).where(Schema.deleted_at.is_(None))
-    )).scalars().all()
-    schema_docs = []
-    for s in schemas:
-        d_name = db_name_map.get(s.connection_id, "")
-        schema_docs.append({
-            "id": str(s.id),
-            "name": s.name,
-            "description": s.description or "",
-            "tags": s.tags or [],
-            "connection_id": str(s.connection_id),
-            "db_name": d_name,
-            "breadcrumb": [d_name, s.name],
-        })
-    index_documents("schemas", schema_docs)
-    counts["schemas"] = len(schema_docs)
-
-    # Build schema lookups
-    schema_info_map = {s.id: (db_name_map.get(s.connection_id, ""), s.name) for s in schemas}
-    schema_conn_map = {s.id: str(s.connection_id) for s in schemas}
-
-    # Tables
-    tables = (await db.execute(
-        select(Table).where(Table.deleted_at.is_(None))
-    )).scalars().all()
-    table_docs = []
-    for t in tables:
-        d_name, s_name = schema_info_map.get(t.schema_id, ("", ""))
-        conn_id = schema_conn_map.get(t.schema_id, "")
-        table_docs.append({
-            "id": str(t.id),
-            "name": t.name,
-            "description": t.description or "",
-            "tags": t.tags or [],
-            "sme_name": t.sme_name or "",
-            "object_type": t.object_type or "table",
-            "schema_id": str(t.schema_id),
-            "connection_id": conn_id,
-            "db_name": d_name,
-            "schema_name": s_name,
-            "breadcrumb": [d_name, s_name, t.name],
-        })
-    index_documents("tables", table_docs)
-    counts["tables"] = len(table_docs)
-
-    # Build table lookup
-    table_info_map = {}
-    for t in tables:
-        d_name, s_name = schema_info_map.get(t.schema_id, ("", ""))
-        conn_id = schema_conn_map.get(t.schema_id, "")
-        table_info_map[t.id] = (d_name, s_name, t.name, conn_id, str(t.schema_id))
-
-    # Columns
-    columns = (await db.execute(
-        select(Column).where(Column.deleted_at.is_(None))
-    )).scalars().all()
-    col_docs = []
-    for c in columns:
-        d_name, s_name, t_name, conn_id, s_id = table_info_map.get(c.table_id, ("", "", "", "", ""))
-        col_docs.append({
-            "id": str(c.id),
-            "name": c.name,
-            "description": c.description or "",
-            "data_type": c.data_type,
-            "tags": c.tags or [],
-            "table_id": str(c.table_id),
-            "schema_id": s_id,
-            "connection_id": conn_id,
-            "db_name": d_name,
-            "schema_name": s_name,
-            "table_name": t_name,
-            "breadcrumb": [d_name, s_name, t_name],
-        })
-    index_documents("columns", col_docs)
-    counts["columns"] = len(col_docs)
-
-    # Queries
-    queries = (await db.execute(
-        select(Query).where(Query.deleted_at.is_(None))
-    )).scalars().all()
-    q_docs = []
-    for q in queries:
-        q_docs.append({
-            "id": str(q.id),
-            "name": q.name,
-            "description": q.description or "",
-            "sme_name": q.sme_name or "",
-            "sql_text": q.sql_text or "",
-            "connection_id": str(q.connection_id) if q.connection_id else "",
-            "breadcrumb": [q.name],
-        })
-    index_documents("queries", q_docs)
-    counts["queries"] = len(q_docs)
-
-    # Articles
-    articles = (await db.execute(
-        select(Article).where(Article.deleted_at.is_(None))
-    )).scalars().all()
-    a_docs = []
-    for a in articles:
-        a_docs.append({
-            "id": str(a.id),
-            "title": a.title,
-            "name": a.title,
-            "description": a.description or "",
-            "sme_name": a.sme_name or "",
-            "body": a.body or "",
-            "tags": a.tags or [],
-            "breadcrumb": [a.title],
-        })
-    index_documents("articles", a_docs)
-    counts["articles"] = len(a_docs)
-
-    # Glossary
-    terms = (await db.execute(
-        select(GlossaryTerm).where(GlossaryTerm.deleted_at.is_(None))
-    )).scalars().all()
-    g_docs = []
-    for term in terms:
-        g_docs.append({
-            "id": str(term.id),
-            "name": term.name,
-            "definition": term.definition or "",
-            "tags": term.tags or [],
-            "status": term.status,
-            "breadcrumb": [term.name],
-        })
-    index_documents("glossary", g_docs)
-    counts["glossary"] = len(g_docs)
-
-    logger.info("Reindex complete: %s", counts)
-    return counts
+        for idx in INDEXES:
+            await run_in_threadpool(prepare_shadow_index, idx)
+        try:
+            await _build_shadow_indexes(progress)
+        except BaseException:
+            # Without the lock the shadows may already belong to another run
+            if not lost.is_set():
+                await run_in_threadpool(drop_shadow_indexes, INDEXES)
+            raise
+        await run_in_threadpool(swap_shadow_indexes, INDEXES)
+        await _requeue_changed_since(started_at)
+        await progress.finish("done")
+    except asyncio.CancelledError:
+        if not lost.is_set():
+            await progress.finish("failed")
+            raise
+        asyncio.current_task().uncancel()
+        raise ReindexLockLostError("The reindex lock was lost before the rebuild finished") from None
+    except BaseException:
+        if not lost.is_set():
+            await progress.finish("failed")
+        raise
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+        if await r.get(REINDEX_LOCK_KEY) == token:
+            await r.delete(REINDEX_LOCK_KEY)
+
+    logger.info("Reindex complete in %.1fs: %s", progress.state["duration_s"], progress.counts())
+    return progress.state
+
+
+async def reindex_all() -> dict:
+    """Rebuild all indexes from the DB without disturbing live search.
+
+    Documents are loaded into shadow indexes which replace the live ones in a
+    single atomic swap once fully indexed, so searches never see a partial
+    index and entities removed from the DB are purged. Only one reindex runs
+    at a time across all workers. Returns the final progress report.
+    """
+    return await _rebuild(*await _acquire_reindex())
+
+
+_running: set[asyncio.Task] = set()
+
+
+def _reindex_finished(task: asyncio.Task) -> None:
+    _running.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background reindex failed", exc_info=task.exception())
+
+
+async def start_reindex() -> None:
+    """Like :func:`reindex_all`, but returns once the lock is held and rebuilds in the background.
+
+    Raises :class:`ReindexInProgressError` right away if another reindex runs.
+    Progress is served by :func:`get_reindex_status`.
+    """
+    lock = await _acquire_reindex()
+    task = asyncio.create_task(_rebuild(*lock))
+    _running.add(task)
+    task.add_done_callback(_reindex_finished)
+
+
+async def stop_reindex() -> None:
+    """Cancel this worker's background reindex, if any, releasing the lock; called on shutdown."""
+    for task in list(_running):
+        task.cancel()
+    await asyncio.gather(*_running, return_exceptions=True)
@@ -0,0 +1,147 @@
+"""Attachment storage: S3/MinIO in deployments, the local filesystem for tests.
+
+``settings.storage_backend`` picks the backend once per worker; routes only
+use the functions below.
+"""
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Iterable
+
+from app.config import settings
+from app.storage.base import (
+    ALLOWED_CONTENT_TYPES, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_URL_EXPIRES, MAX_FILE_SIZE, UPLOAD_PART_SIZE,
+    FileTooLargeError, InvalidRangeError, StorageBackend,
+)
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage
+
+__all__ = [
+    "ALLOWED_CONTENT_TYPES", "DOWNLOAD_CHUNK_SIZE", "DOWNLOAD_URL_EXPIRES", "MAX_FILE_SIZE", "UPLOAD_PART_SIZE",
+    "FileTooLargeError", "InvalidRangeError", "StorageBackend", "LocalStorage", "S3Storage",
+    "get_storage", "close_storage", "ensure_bucket", "upload_stream", "open_download", "delete_file",
+    "url_window", "download_urls", "download_url",
+]
+
+BACKENDS = {"s3": S3Storage, "local": LocalStorage}
+URL_CACHE_MAX_ENTRIES = 10_000
+
+_storage: StorageBackend | None = None
+
+# s3_key -> (url_window() it was signed in, download URL); LRU order
+_url_cache: OrderedDict[str, tuple[int, str]] = OrderedDict()
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        try:
+            _storage = BACKENDS[settings.storage_backend]()
+        except KeyError:
+            raise ValueError(f"Unknown storage backend: {settings.storage_backend}") from None
+    return _storage
+
+
+async def close_storage() -> None:
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+    _storage = None
+
+
+async def ensure_bucket() -> None:
+    await get_storage().ensure_bucket()
+
+
+def _new_key(filename: str) -> str:
+    return f"attachments/{uuid.uuid4()}/{filename}"
+
+
+async def _limited(chunks: AsyncIterator[bytes], counter: list[int]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        counter[0] += len(chunk)
+        if counter[0] > MAX_FILE_SIZE:
+            raise FileTooLargeError(f"File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)")
+        yield chunk
+
+
+# ─── Streaming upload / download ─────────────────────────────────────────────
+
+async def upload_stream(chunks: AsyncIterator[bytes], content_type: str, filename: str) -> tuple[str, int]:
+    """Store ``chunks`` as a new object and return ``(s3_key, size)``.
+
+    The backend consumes the stream as it arrives (S3 in multipart parts), so
+    an upload never holds the whole file. Raises :class:`FileTooLargeError`
+    past ``MAX_FILE_SIZE``, in which case nothing is stored.
+    """
+    s3_key, size = _new_key(filename), [0]
+    await get_storage().put(s3_key, _limited(chunks, size), content_type)
+    return s3_key, size[0]
+
+
+async def open_download(s3_key: str, byte_range: str | None = None) -> tuple[dict, AsyncIterator[bytes]]:
+    """Start reading ``s3_key``, optionally limited to an HTTP ``Range``.
+
+    Returns S3-style metadata (``ContentLength``, ``ContentRange``, ...) and
+    an iterator over the body, which releases its connection or file when
+    exhausted or closed. Raises :class:`InvalidRangeError` for unsatisfiable
+    ranges.
+    """
+    return await get_storage().open(s3_key, byte_range)
+
+
+async def delete_file(s3_key: str) -> None:
+    await get_storage().delete(s3_key)
+    _url_cache.pop(s3_key, None)
+
+
+# ─── Presigned download URLs ─────────────────────────────────────────────────
+
+def url_window(now: float | None = None) -> int:
+    """Index of the current half-lifetime window of presigned download URLs.
+
+    A URL is reused only within the window it was signed in, so it always has
+    at least half its lifetime left by the end of that window. Article ETags
+    include the window for the same reason.
+    """
+    return int((time.time() if now is None else now) // (DOWNLOAD_URL_EXPIRES // 2))
+
+
+def _cached_url(s3_key: str, window: int) -> str | None:
+    entry = _url_cache.get(s3_key)
+    if entry is None or entry[0] != window:
+        return None
+    _url_cache.move_to_end(s3_key)
+    return entry[1]
+
+
+def _remember(s3_key: str, window: int, url: str) -> None:
+    _url_cache[s3_key] = (window, url)
+    _url_cache.move_to_end(s3_key)
+    while len(_url_cache) > URL_CACHE_MAX_ENTRIES:
+        _url_cache.popitem(last=False)
+
+
+async def download_urls(s3_keys: Iterable[str]) -> dict[str, str]:
+    """Download URLs for ``s3_keys``, from the per-worker cache where possible.
+
+    Misses are signed together in one backend call; S3 signs them in the
+    threadpool, so SigV4 signing never runs on the event loop.
+    """
+    window = url_window()
+    urls, missing = {}, []
+    for key in dict.fromkeys(s3_keys):
+        if (url := _cached_url(key, window)) is not None:
+            urls[key] = url
+        else:
+            missing.append(key)
+    if missing:
+        signed = await get_storage().sign(missing)
+        for key, url in zip(missing, signed):
+            _remember(key, window, url)
+            urls[key] = url
+    return urls
+
+
+async def download_url(s3_key: str) -> str:
+    return (await download_urls([s3_key]))[s3_key]
@@ -0,0 +1,65 @@
+"""Limits, errors and the interface every attachment storage backend implements."""
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+ALLOWED_CONTENT_TYPES = {
+    "application/pdf",
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "text/plain",
+    "text/csv",
+    "text/markdown",
+    "application/json",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/zip",
+    "application/gzip",
+}
+
+MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+DOWNLOAD_URL_EXPIRES = 3600       # seconds a presigned download URL stays valid
+UPLOAD_PART_SIZE = 5 * 1024 * 1024    # S3's minimum part size; bounds the memory one upload holds
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class FileTooLargeError(Exception):
+    """An upload stream went past ``MAX_FILE_SIZE``; nothing was stored."""
+
+
+class InvalidRangeError(Exception):
+    """A requested byte range lies outside the object."""
+
+
+class StorageBackend(ABC):
+    """Where attachment bytes live. All I/O is async; nothing blocks the event loop.
+
+    ``open`` returns S3-style metadata (``ContentLength``, ``ContentRange``,
+    ``ContentType``, ``ETag``) whichever backend serves it, so routes don't
+    care which one is configured.
+    """
+
+    @abstractmethod
+    async def ensure_bucket(self) -> None:
+        """Create the bucket (or directory) if it doesn't exist yet."""
+
+    @abstractmethod
+    async def put(self, key: str, chunks: AsyncIterator[bytes], content_type: str) -> None:
+        """Store ``chunks`` under ``key``; on any error nothing is left behind."""
+
+    @abstractmethod
+    async def open(self, key: str, byte_range: str | None = None) -> tuple[dict, AsyncIterator[bytes]]:
+        """Metadata and a body stream for ``key`` (or ``byte_range`` of it, e.g. ``"bytes=0-99"``)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove ``key``; a missing key is not an error."""
+
+    @abstractmethod
+    async def sign(self, keys: list[str]) -> list[str]:
+        """Download URLs for ``keys``, valid for ``DOWNLOAD_URL_EXPIRES`` seconds."""
+
+    async def close(self) -> None:
+        """Release clients or connections; nothing to do by default."""
@@ -0,0 +1,110 @@
+"""Local filesystem backend for tests and single-node development.
+
+Objects are plain files under ``settings.storage_local_path``; download URLs
+are ``file://`` URIs, so it is no substitute for S3 behind a browser.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.storage.base import DOWNLOAD_CHUNK_SIZE, InvalidRangeError, StorageBackend
+
+
+def _parse_range(byte_range: str, size: int) -> tuple[int, int] | None:
+    """Inclusive ``(start, end)`` for a single ``bytes=`` range, as S3 reads it.
+
+    Malformed ranges are ignored (None, the whole object), like S3 does;
+    ranges starting past the end raise :class:`InvalidRangeError`.
+    """
+    spec = byte_range.removeprefix("bytes=").strip()
+    first, sep, last = spec.partition("-")
+    if not byte_range.startswith("bytes=") or not sep or "," in spec:
+        return None
+    try:
+        if not first:                       # bytes=-N: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise InvalidRangeError(byte_range)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if end < start:
+        return None
+    if start >= size:
+        raise InvalidRangeError(byte_range)
+    return start, min(end, size - 1)
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root or settings.storage_local_path)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    async def ensure_bucket(self) -> None:
+        await run_in_threadpool(self.root.mkdir, parents=True, exist_ok=True)
+
+    async def put(self, key: str, chunks: AsyncIterator[bytes], content_type: str) -> None:
+        """Write to a temporary sibling and rename into place once complete."""
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.part")
+        await run_in_threadpool(path.parent.mkdir, parents=True, exist_ok=True)
+        f = await run_in_threadpool(open, tmp, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    await run_in_threadpool(f.write, chunk)
+            finally:
+                await run_in_threadpool(f.close)
+            await run_in_threadpool(os.replace, tmp, path)
+        except BaseException:
+            await run_in_threadpool(tmp.unlink, missing_ok=True)
+            raise
+
+    async def open(self, key: str, byte_range: str | None = None) -> tuple[dict, AsyncIterator[bytes]]:
+        path = self._path(key)
+        stat = await run_in_threadpool(path.stat)
+        size = stat.st_size
+        start, end = 0, size - 1
+        obj = {
+            "ContentLength": size,
+            "ETag": f'"{hashlib.sha256(f"{key}|{stat.st_mtime_ns}|{size}".encode()).hexdigest()[:32]}"',
+        }
+        bounds = _parse_range(byte_range, size) if byte_range else None
+        if bounds is not None:
+            start, end = bounds
+            obj["ContentLength"] = end - start + 1
+            obj["ContentRange"] = f"bytes {start}-{end}/{size}"
+
+        async def body() -> AsyncIterator[bytes]:
+            f = await run_in_threadpool(open, path, "rb")
+            try:
+                await run_in_threadpool(f.seek, start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await run_in_threadpool(f.read, min(DOWNLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                await run_in_threadpool(f.close)
+
+        return obj, body()
+
+    async def delete(self, key: str) -> None:
+        await run_in_threadpool(self._path(key).unlink, missing_ok=True)
+
+    async def sign(self, keys: list[str]) -> list[str]:
+        return [self._path(key).as_uri() for key in keys]
@@ -0,0 +1,145 @@
+"""S3/MinIO backend on a shared aiobotocore client."""
+import asyncio
+import contextlib
+from typing import AsyncIterator
+
+import botocore.session
+from aiobotocore.session import get_session
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.storage.base import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_URL_EXPIRES, UPLOAD_PART_SIZE, InvalidRangeError, StorageBackend
+
+
+def _client_kwargs() -> dict:
+    return {
+        "endpoint_url": f"{'https' if settings.minio_use_ssl else 'http'}://{settings.minio_endpoint}",
+        "aws_access_key_id": settings.minio_access_key,
+        "aws_secret_access_key": settings.minio_secret_key,
+        "region_name": "us-east-1",
+        "config": BotoConfig(
+            signature_version="s3v4",
+            # One pool per worker, shared by every request; sized so a burst of
+            # uploads and downloads doesn't queue behind the default of 10
+            max_pool_connections=settings.storage_max_connections,
+            connect_timeout=settings.storage_connect_timeout,
+            read_timeout=settings.storage_read_timeout,
+            retries={"max_attempts": settings.storage_max_attempts, "mode": "standard"},
+        ),
+    }
+
+
+def _error_code(e: ClientError) -> str:
+    return e.response.get("Error", {}).get("Code", "")
+
+
+class S3Storage(StorageBackend):
+    def __init__(self):
+        self._client = None
+        self._stack: contextlib.AsyncExitStack | None = None
+        self._lock = asyncio.Lock()
+        self._signer = None
+
+    async def _get_client(self):
+        """The worker's aiobotocore client, created on first use."""
+        async with self._lock:
+            if self._client is None:
+                stack = contextlib.AsyncExitStack()
+                self._client = await stack.enter_async_context(get_session().create_client("s3", **_client_kwargs()))
+                self._stack = stack
+        return self._client
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+        self._client = self._stack = None
+
+    async def ensure_bucket(self) -> None:
+        client = await self._get_client()
+        try:
+            await client.head_bucket(Bucket=settings.minio_bucket)
+        except ClientError as e:
+            if _error_code(e) not in ("404", "NoSuchBucket"):
+                raise
+            await client.create_bucket(Bucket=settings.minio_bucket)
+
+    async def put(self, key: str, chunks: AsyncIterator[bytes], content_type: str) -> None:
+        """Send ``chunks`` in ``UPLOAD_PART_SIZE`` multipart parts as they arrive.
+
+        Uploads smaller than one part use a single ``PutObject``. On any
+        failure the multipart upload is aborted, so no parts are left behind.
+        """
+        client = await self._get_client()
+        bucket = settings.minio_bucket
+        buffer = bytearray()
+        upload_id = None
+        parts: list[dict] = []
+
+        async def send_part(data: bytes) -> None:
+            number = len(parts) + 1
+            result = await client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=data)
+            parts.append({"ETag": result["ETag"], "PartNumber": number})
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= UPLOAD_PART_SIZE:
+                    if upload_id is None:
+                        upload_id = (await client.create_multipart_upload(
+                            Bucket=bucket, Key=key, ContentType=content_type,
+                        ))["UploadId"]
+                    await send_part(bytes(buffer[:UPLOAD_PART_SIZE]))
+                    del buffer[:UPLOAD_PART_SIZE]
+            if upload_id is None:
+                await client.put_object(Bucket=bucket, Key=key, Body=bytes(buffer), ContentType=content_type)
+            else:
+                if buffer:
+                    await send_part(bytes(buffer))
+                await client.complete_multipart_upload(
+                    Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            if upload_id is not None:
+                with contextlib.suppress(Exception):
+                    await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def open(self, key: str, byte_range: str | None = None) -> tuple[dict, AsyncIterator[bytes]]:
+        client = await self._get_client()
+        params = {"Bucket": settings.minio_bucket, "Key": key}
+        if byte_range:
+            params["Range"] = byte_range
+        try:
+            obj = await client.get_object(**params)
+        except ClientError as e:
+            if _error_code(e) == "InvalidRange":
+                raise InvalidRangeError(byte_range) from e
+            raise
+
+        async def body() -> AsyncIterator[bytes]:
+            async with obj["Body"] as stream:
+                async for chunk in stream.iter_chunks(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+
+        return obj, body()
+
+    async def delete(self, key: str) -> None:
+        client = await self._get_client()
+        await client.delete_object(Bucket=settings.minio_bucket, Key=key)
+
+    def _sign_sync(self, keys: list[str]) -> list[str]:
+        # Presigning is pure CPU (SigV4 HMACs, ~1 ms a URL), so it runs on a
+        # plain botocore client in the threadpool rather than on the event loop
+        if self._signer is None:
+            self._signer = botocore.session.get_session().create_client("s3", **_client_kwargs())
+        return [
+            self._signer.generate_presigned_url(
+                "get_object", Params={"Bucket": settings.minio_bucket, "Key": key}, ExpiresIn=DOWNLOAD_URL_EXPIRES,
+            )
+            for key in keys
+        ]
+
+    async def sign(self, keys: list[str]) -> list[str]:
+        return await run_in_threadpool(self._sign_sync, keys)
@@ -0,0 +1,124 @@
+"""Micro-benchmark: request throughput through the request-id/logging middleware, BaseHTTPMiddleware vs pure ASGI.
+
+Requests are sent straight into the ASGI app, with no server or socket, so
+the numbers isolate framework and middleware overhead. ``/health`` is the
+real route; the columns route returns a 100-column page like ``list_columns``
+does, without the database.
+
+Run from backend/:  python -m benchmarks.middleware [--requests N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import structlog
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.logging import LoggingMiddleware, logger
+from app.middleware.request_id import RequestIdMiddleware, request_id_ctx
+from app.responses import FastJSONResponse
+from app.routers import health
+from benchmarks.serialization import _columns_page
+
+
+# ─── Previous implementation ─────────────────────────────────────────────────
+
+class BaseHTTPRequestIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        rid = str(uuid.uuid4())[:8]
+        request_id_ctx.set(rid)
+        request.state.request_id = rid
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = rid
+        return response
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start = time.time()
+        response = await call_next(request)
+        logger.info(
+            "http_request", method=request.method, path=request.url.path, status=response.status_code,
+            duration_ms=round((time.time() - start) * 1000, 2), request_id=request_id_ctx.get(""),
+        )
+        return response
+
+
+STACKS = {
+    "no middleware": (),
+    "BaseHTTPMiddleware": (BaseHTTPLoggingMiddleware, BaseHTTPRequestIdMiddleware),
+    "pure ASGI": (LoggingMiddleware, RequestIdMiddleware),
+}
+
+
+def _app(middleware: tuple) -> FastAPI:
+    app = FastAPI()
+    app.include_router(health.router)
+    page = _columns_page(100)
+
+    @app.get("/api/v1/tables/{table_id}/columns")
+    async def list_columns(table_id: uuid.UUID):
+        return FastJSONResponse(page)
+
+    for cls in middleware:   # same order as app/main.py: the last added is outermost
+        app.add_middleware(cls)
+    return app
+
+
+# ─── Driver ──────────────────────────────────────────────────────────────────
+
+async def _request(app, path: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def _bench(app, path: str, requests: int, concurrency: int) -> float:
+    assert await _request(app, path) == 200
+    start = time.perf_counter()
+    for _ in range(requests // concurrency):
+        await asyncio.gather(*(_request(app, path) for _ in range(concurrency)))
+    return requests // concurrency * concurrency / (time.perf_counter() - start)
+
+
+async def _run(requests: int, concurrency: int) -> None:
+    apps = {name: _app(stack) for name, stack in STACKS.items()}
+    for path in ("/health", f"/api/v1/tables/{uuid.uuid4()}/columns"):
+        print(f"\nGET {path}  ({requests} requests, {concurrency} concurrent)")
+        baseline = None
+        for name, app in apps.items():
+            rps = await _bench(app, path, requests, concurrency)
+            baseline = baseline or rps
+            print(f"  {name:20} {rps:9,.0f} req/s  {1e6 / rps:7.1f} µs/req  x{rps / baseline:4.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    # Keep the access log's cost in the measurement, but not on the terminal
+    structlog.configure(
+        processors=[structlog.processors.TimeStamper(fmt="iso"), structlog.processors.JSONRenderer()],
+        logger_factory=structlog.PrintLoggerFactory(open(os.devnull, "w")),
+    )
+    asyncio.run(_run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
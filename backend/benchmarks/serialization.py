@@ -0,0 +1,121 @@
+"""Micro-benchmark: JSON response throughput of FastAPI's default path vs FastJSONResponse.
+
+Run from backend/:  python -m benchmarks.serialization [--iterations N]
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import _prepare_response_content, serialize_response
+from fastapi.utils import create_model_field
+
+from app.responses import FastJSONResponse
+from app.schemas.catalog import ColumnOut, LineageGraph, LineageNode, PaginatedColumns
+
+try:
+    from fastapi.responses import ORJSONResponse
+    import orjson  # noqa: F401
+except ImportError:
+    ORJSONResponse = None
+
+
+# ─── Payloads ────────────────────────────────────────────────────────────────
+
+def _columns_page(n: int = 500) -> PaginatedColumns:
+    now = datetime.now(timezone.utc)
+    table_id = uuid.uuid4()
+    items = [
+        ColumnOut(
+            id=uuid.uuid4(), table_id=table_id, name=f"column_{i:04d}", data_type="varchar(255)",
+            is_nullable=i % 3 != 0, is_primary_key=i == 0, title=f"Column {i}",
+            description="Free-text description of the column as entered by a data steward. " * 2,
+            tags=["pii", "finance"] if i % 5 == 0 else None, created_at=now, updated_at=now,
+        )
+        for i in range(n)
+    ]
+    return PaginatedColumns(total=n, page=1, size=n, items=items)
+
+
+def _lineage_graph(fanout: int = 6, levels: int = 3) -> LineageGraph:
+    def level(depth: int, prefix: str) -> list[LineageNode]:
+        if depth == levels:
+            return []
+        return [
+            LineageNode(
+                db_name="EDW", table_name=f"{prefix}_{i}", is_catalog_table=True,
+                table_id=uuid.uuid4(), edge_id=uuid.uuid4(), has_annotation=i % 2 == 0,
+                children=level(depth + 1, f"{prefix}_{i}"),
+            )
+            for i in range(fanout)
+        ]
+    return LineageGraph(upstream=level(0, "up"), downstream=level(0, "down"), current_db="EDW", current_table="FACT_SALES")
+
+
+# ─── Serialization paths ─────────────────────────────────────────────────────
+
+def _paths(model):
+    field = create_model_field(name="Response", type_=type(model), mode="serialization")
+
+    async def fastapi_default() -> bytes:
+        # What a route returning a model with response_model=... does today
+        content = _prepare_response_content(model, exclude_unset=False)
+        payload = await serialize_response(field=field, response_content=content)
+        return JSONResponse(payload).body
+
+    async def fast_default_class() -> bytes:
+        # Same response_model round trip, FastJSONResponse as the router's default class
+        content = _prepare_response_content(model, exclude_unset=False)
+        payload = await serialize_response(field=field, response_content=content)
+        return FastJSONResponse(payload).body
+
+    async def fast_direct() -> bytes:
+        # Route returns FastJSONResponse(model): no re-validation, one Rust encode
+        return FastJSONResponse(model).body
+
+    paths = {
+        "fastapi default (json.dumps)": fastapi_default,
+        "FastJSONResponse as default class": fast_default_class,
+        "FastJSONResponse(model) returned": fast_direct,
+    }
+    if ORJSONResponse is not None:
+        async def orjson_default_class() -> bytes:
+            content = _prepare_response_content(model, exclude_unset=False)
+            payload = await serialize_response(field=field, response_content=content)
+            return ORJSONResponse(payload).body
+        paths["ORJSONResponse as default class"] = orjson_default_class
+    return paths
+
+
+async def _bench(fn, iterations: int) -> tuple[float, bytes]:
+    body = await fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - start) / iterations, body
+
+
+async def _run(iterations: int) -> None:
+    for label, model in (("PaginatedColumns, 500 items", _columns_page()), ("LineageGraph, 6x3 both ways", _lineage_graph())):
+        print(f"\n{label}")
+        baseline = expected = None
+        for name, fn in _paths(model).items():
+            seconds, body = await _bench(fn, iterations)
+            baseline = baseline or seconds
+            expected = expected or json.loads(body)
+            assert json.loads(body) == expected, f"{name} produced a different document"
+            print(f"  {name:36} {len(body) / 1024:8.1f} KiB  {seconds * 1000:7.2f} ms  "
+                  f"{len(body) / seconds / 1e6:8.1f} MB/s  x{baseline / seconds:4.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(_run(parser.parse_args().iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -387,17 +387,9 @@ class TestPermissions:
             )
         assert resp.status_code == 403
 
-    async def test_viewer_cannot_patch(self, catalog_ids):
+    async def test_viewer_cannot_patch(self, catalog_ids, viewer_token):
         """Viewer role must get 403 on any PATCH."""
         async with httpx.AsyncClient(base_url=BASE_URL) as client:
-            login = await client.post("/auth/login", json={
-                "email": "viewer@demo.com",
-                "password": "viewer123",
-            })
-            if login.status_code != 200:
-                pytest.skip("viewer@demo.com not found — run create_demo_users.py")
-            viewer_token = login.json()["access_token"]
-
             resp = await client.patch(
                 f"/api/v1/tables/{catalog_ids['table_id']}",
                 json={"description": "viewer attempt"},
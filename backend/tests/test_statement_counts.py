@@ -0,0 +1,126 @@
+"""
+SQL statement-count regression tests for the list endpoints.
+
+Relationships (creators, attachments, links, users) must load with the page,
+not one query per row. Each test reads the ``X-DB-Statements`` header the API
+adds when started with ``SQL_STATEMENT_HEADER=true`` (off by default; see
+docs/SETUP.md) and asserts the count does not grow with the number of rows
+returned. Without the header the tests skip.
+"""
+import uuid
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+BASE_URL = "http://localhost:8001"
+
+# Auth is served from Redis, so a list costs its count, page and selectin queries
+MAX_LIST_STATEMENTS = 5
+
+PAGINATED_LISTS = [
+    "/api/v1/articles",
+    "/api/v1/queries",
+    "/api/v1/glossary",
+    "/api/v1/admin/audit",
+    "/api/v1/governance/approvals",
+]
+
+
+# ─── helpers ──────────────────────────────────────────────────────────────────
+
+async def _statements(client, url, headers, **params) -> int:
+    r = await client.get(url, params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    if "x-db-statements" not in r.headers:
+        pytest.skip("API not started with SQL_STATEMENT_HEADER=true")
+    return int(r.headers["x-db-statements"])
+
+
+@pytest.fixture(scope="module")
+async def two_of_each(auth_headers):
+    """At least two articles, queries, terms and approvals, so size=1 and size=50 differ."""
+    tag = uuid.uuid4().hex[:8]
+    created = []
+    async with httpx.AsyncClient(base_url=BASE_URL) as c:
+        for i in range(2):
+            for url, body in (
+                ("/api/v1/articles", {"title": f"stmt-count {tag} {i}", "body": "<p>x</p>"}),
+                ("/api/v1/queries", {"name": f"stmt-count {tag} {i}", "sql_text": "SELECT 1"}),
+                ("/api/v1/glossary", {"name": f"stmt-count {tag} {i}", "definition": "x"}),
+            ):
+                r = await c.post(url, json=body, headers=auth_headers)
+                assert r.status_code == 201, r.text
+                created.append(f"{url}/{r.json()['id']}")
+            await c.post("/api/v1/governance/approvals", headers=auth_headers, json={
+                "entity_type": "table", "entity_id": str(uuid.uuid4()), "action": "update",
+            })
+    yield
+    async with httpx.AsyncClient(base_url=BASE_URL) as c:
+        for url in created:
+            await c.delete(url, headers=auth_headers)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PAGINATED LISTS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestPaginatedLists:
+    @pytest.mark.parametrize("url", PAGINATED_LISTS)
+    async def test_constant_in_page_size(self, url, auth_headers, two_of_each):
+        async with httpx.AsyncClient(base_url=BASE_URL) as c:
+            await _statements(c, url, auth_headers, size=1)   # warm the user cache
+            one = await _statements(c, url, auth_headers, size=1)
+            many = await _statements(c, url, auth_headers, size=50)
+        assert one == many, f"{url}: {one} statements for 1 row, {many} for 50"
+        assert many <= MAX_LIST_STATEMENTS
+
+    async def test_webhooks_within_budget(self, auth_headers):
+        async with httpx.AsyncClient(base_url=BASE_URL) as c:
+            await _statements(c, "/api/v1/webhooks", auth_headers)
+            assert await _statements(c, "/api/v1/webhooks", auth_headers) <= MAX_LIST_STATEMENTS
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PER-ENTITY LISTS (comments, permissions, stewards)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestEntityLists:
+    async def test_comments(self, auth_headers):
+        entity = f"table/{uuid.uuid4()}"
+        url = f"/api/v1/comments/{entity}"
+        async with httpx.AsyncClient(base_url=BASE_URL) as c:
+            await c.post(url, json={"body": "first"}, headers=auth_headers)
+            await _statements(c, url, auth_headers)
+            one = await _statements(c, url, auth_headers)
+            for body in ("second", "third"):
+                await c.post(url, json={"body": body}, headers=auth_headers)
+            three = await _statements(c, url, auth_headers)
+            for comment in (await c.get(url, headers=auth_headers)).json():
+                await c.delete(f"/api/v1/comments/{comment['id']}", headers=auth_headers)
+        assert one == three
+
+    async def test_permissions_and_stewards(self, auth_headers):
+        entity_id = str(uuid.uuid4())
+        async with httpx.AsyncClient(base_url=BASE_URL) as c:
+            users = (await c.get("/api/v1/governance/users", headers=auth_headers)).json()[:3]
+            perm_url = f"/api/v1/governance/permissions/table/{entity_id}"
+            steward_url = f"/api/v1/governance/stewards/table/{entity_id}"
+
+            await c.post("/api/v1/governance/stewards", headers=auth_headers,
+                         json={"user_id": users[0]["id"], "entity_type": "table", "entity_id": entity_id})
+            await _statements(c, perm_url, auth_headers)
+            perms_one = await _statements(c, perm_url, auth_headers)
+            stewards_one = await _statements(c, steward_url, auth_headers)
+
+            for user in users[1:]:
+                await c.post("/api/v1/governance/stewards", headers=auth_headers,
+                             json={"user_id": user["id"], "entity_type": "table", "entity_id": entity_id})
+            perms_many = await _statements(c, perm_url, auth_headers)
+            stewards_many = await _statements(c, steward_url, auth_headers)
+
+            for user in users:
+                await c.delete(f"/api/v1/governance/stewards/table/{entity_id}/{user['id']}", headers=auth_headers)
+        assert perms_one == perms_many
+        assert stewards_one == stewards_many
@@ -0,0 +1,91 @@
+"""
+Storage layer tests against the local filesystem backend.
+
+These run in-process and need no Docker stack: ``LocalStorage`` implements
+the same interface, size limit and byte-range semantics as the S3 backend.
+"""
+import pytest
+
+from app import storage
+from app.storage import FileTooLargeError, InvalidRangeError, LocalStorage, S3Storage, StorageBackend
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    backend = LocalStorage(tmp_path)
+    monkeypatch.setattr(storage, "_storage", backend)
+    storage._url_cache.clear()
+    yield backend
+    storage._url_cache.clear()
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def _read(s3_key: str, byte_range: str | None = None) -> tuple[dict, bytes]:
+    obj, body = await storage.open_download(s3_key, byte_range)
+    return obj, b"".join([chunk async for chunk in body])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# UPLOAD / DOWNLOAD
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestLocalStorage:
+    async def test_round_trip(self, local_storage):
+        s3_key, size = await storage.upload_stream(_chunks(b"hello ", b"world"), "text/plain", "a.txt")
+        assert size == 11
+        assert s3_key.startswith("attachments/") and s3_key.endswith("/a.txt")
+        obj, data = await _read(s3_key)
+        assert data == b"hello world"
+        assert obj["ContentLength"] == 11 and "ContentRange" not in obj
+
+    @pytest.mark.parametrize("byte_range,expected,content_range", [
+        ("bytes=0-4", b"hello", "bytes 0-4/11"),
+        ("bytes=6-", b"world", "bytes 6-10/11"),
+        ("bytes=-5", b"world", "bytes 6-10/11"),
+        ("bytes=6-100", b"world", "bytes 6-10/11"),
+    ])
+    async def test_ranges(self, local_storage, byte_range, expected, content_range):
+        s3_key, _ = await storage.upload_stream(_chunks(b"hello world"), "text/plain", "r.txt")
+        obj, data = await _read(s3_key, byte_range)
+        assert data == expected
+        assert obj["ContentRange"] == content_range
+        assert obj["ContentLength"] == len(expected)
+
+    async def test_unsatisfiable_range(self, local_storage):
+        s3_key, _ = await storage.upload_stream(_chunks(b"hello"), "text/plain", "r.txt")
+        with pytest.raises(InvalidRangeError):
+            await storage.open_download(s3_key, "bytes=10-20")
+
+    async def test_too_large_stores_nothing(self, local_storage, monkeypatch):
+        monkeypatch.setattr(storage, "MAX_FILE_SIZE", 8)
+        with pytest.raises(FileTooLargeError):
+            await storage.upload_stream(_chunks(b"12345", b"67890"), "text/plain", "big.txt")
+        assert not [p for p in local_storage.root.rglob("*") if p.is_file()]
+
+    async def test_delete_drops_cached_url(self, local_storage):
+        s3_key, _ = await storage.upload_stream(_chunks(b"x"), "text/plain", "d.txt")
+        assert (await storage.download_url(s3_key)).startswith("file://")
+        assert s3_key in storage._url_cache
+        await storage.delete_file(s3_key)
+        assert s3_key not in storage._url_cache
+        with pytest.raises(FileNotFoundError):
+            await storage.open_download(s3_key)
+
+    async def test_rejects_keys_outside_root(self, local_storage):
+        with pytest.raises(ValueError):
+            await local_storage.delete("../outside")
+
+    async def test_backends_implement_the_whole_interface(self):
+        class Partial(StorageBackend):
+            async def put(self, key, chunks, content_type):
+                pass
+
+        with pytest.raises(TypeError, match="abstract"):
+            Partial()
+        assert LocalStorage.__abstractmethods__ == S3Storage.__abstractmethods__ == frozenset()
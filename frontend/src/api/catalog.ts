@@ -104,6 +104,42 @@ export interface Stats {
   queries: number;
 }
 
+// Sidebar tree (databases → schemas → tables in one request; the browser revalidates it via ETag)
+export interface TreeNode {
+  id: string;
+  name: string;
+  type: "database" | "schema" | "table";
+  object_type?: string;
+  db_type?: string;
+  child_count: number;
+  deleted?: boolean;
+  children?: TreeNode[];
+}
+
+export const getCatalogTree = (depth = 2, dbId?: string, include_deleted = false) =>
+  api.get<{ depth: number; items: TreeNode[] }>("/api/v1/tree", {
+    params: { depth, include_deleted, ...(dbId ? { db_id: dbId } : {}) },
+  }).then((r) => r.data);
+
+// Batch entity lookup (favorites, trending, notifications → names and breadcrumbs in one request)
+export interface EntityRef {
+  entity_type: string;
+  id: string;
+  name: string;
+}
+
+export interface EntitySummary extends EntityRef {
+  title: string | null;
+  description: string | null;
+  object_type: string | null;
+  data_type: string | null;
+  deleted: boolean;
+  breadcrumb: EntityRef[];
+}
+
+export const getEntitiesBatch = (keys: { entity_type: string; entity_id: string }[]) =>
+  api.post<{ results: Record<string, EntitySummary | null> }>("/api/v1/entities/batch", { keys }).then((r) => r.data.results);
+
 // Databases
 export const getDatabases = (page = 1, size = 20, q?: string) =>
   api.get<Paginated<DbConnection>>("/api/v1/databases", { params: { page, size, ...(q ? { q } : {}) } }).then((r) => r.data);
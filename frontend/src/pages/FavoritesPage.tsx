@@ -2,6 +2,7 @@ import { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 import { Heart, Database, Layers, Table2, FileCode, BookOpen, BookText } from "lucide-react";
 import { getMyFavorites, type Favorite } from "../api/social";
+import { getEntitiesBatch, type EntitySummary } from "../api/catalog";
 import Breadcrumb from "../components/Breadcrumb";
 import { timeAgo } from "../utils/formatters";
 
@@ -25,11 +26,19 @@ const LINKS: Record<string, (id: string) => string> = {
 
 export default function FavoritesPage() {
   const [favorites, setFavorites] = useState<Favorite[]>([]);
+  const [entities, setEntities] = useState<Record<string, EntitySummary | null>>({});
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState("all");
 
   useEffect(() => {
-    getMyFavorites().then(setFavorites).finally(() => setLoading(false));
+    getMyFavorites()
+      .then(async (favs) => {
+        setFavorites(favs);
+        if (favs.length) {
+          setEntities(await getEntitiesBatch(favs.map(({ entity_type, entity_id }) => ({ entity_type, entity_id }))));
+        }
+      })
+      .finally(() => setLoading(false));
   }, []);
 
   const types = [...new Set(favorites.map((f) => f.entity_type))];
@@ -63,12 +72,17 @@ export default function FavoritesPage() {
         {filtered.map((fav) => {
           const link = LINKS[fav.entity_type]?.(fav.entity_id);
           if (!link) return null;
+          const entity = entities[`${fav.entity_type}:${fav.entity_id}`];
           return (
             <Link key={fav.id} to={link} className="flex items-center gap-3 bg-white border rounded-lg p-4 hover:shadow-sm">
               <div>{ICONS[fav.entity_type] || <Heart size={16} className="text-gray-400" />}</div>
               <div className="min-w-0 flex-1">
-                <div className="text-sm font-medium">{fav.entity_id}</div>
-                <div className="text-xs text-gray-400">{fav.entity_type}</div>
+                <div className={`text-sm font-medium ${entity?.deleted ? "line-through text-gray-400" : ""}`}>
+                  {entity?.name ?? fav.entity_id}
+                </div>
+                <div className="text-xs text-gray-400 truncate">
+                  {entity?.breadcrumb.length ? entity.breadcrumb.map((b) => b.name).join(" / ") : fav.entity_type}
+                </div>
               </div>
               <span className="text-xs text-gray-400 shrink-0">{timeAgo(fav.created_at)}</span>
             </Link>
@@ -122,6 +122,7 @@ class CatalogUser(HttpUser):
     abstract = True
     wait_time = between(0.5, 2.5)    # think time between requests
     _token: str = ""
+    _tree_etag: str = ""
 
     def on_start(self):
         _catalog_ready.wait(timeout=30)
@@ -133,9 +134,10 @@ class CatalogUser(HttpUser):
     def _get(self, path, name=None, **kwargs):
         if not self._token:
             return None
+        headers = {**_auth_headers(self._token), **kwargs.pop("headers", {})}
         return self.client.get(
             path,
-            headers=_auth_headers(self._token),
+            headers=headers,
             name=name or path,
             **kwargs,
         )
@@ -168,6 +170,13 @@ class CatalogUser(HttpUser):
             self._get(f"{BASE}/schemas/{schema_id}/tables?size=20",
                       name="GET /schemas/:id/tables")
 
+    def read_tree(self):
+        # Sidebar load: one tree request, revalidated with the last ETag like a browser would
+        headers = {"If-None-Match": self._tree_etag} if self._tree_etag else {}
+        r = self._get(f"{BASE}/tree?depth=2", name="GET /tree", headers=headers)
+        if r is not None and r.status_code == 200:
+            self._tree_etag = r.headers.get("ETag", "")
+
     def read_table_context(self):
         pair = _pick(_catalog["table_ids"])
         if pair:
@@ -241,6 +250,10 @@ class ViewerUser(CatalogUser):
     def task_list_databases(self):
         self.read_databases()
 
+    @task(5)
+    def task_tree(self):
+        self.read_tree()
+
     @task(9)
     def task_list_schemas(self):
         self.read_schemas()
@@ -305,6 +318,10 @@ class StewardUser(CatalogUser):
     def task_list_databases(self):
         self.read_databases()
 
+    @task(4)
+    def task_tree(self):
+        self.read_tree()
+
     @task(7)
     def task_list_schemas(self):
         self.read_schemas()